@@ -0,0 +1,153 @@
+import argparse
+import importlib
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+
+# ============================================================
+# CACHE FORMAT BENCHMARK
+#   Saves and loads realistic cache files in every CACHE_FORMAT this machine
+#   supports, so the deployment can pick the fastest one:
+#     python bench_cache_formats.py --members 10000 --repeat 5
+#
+#   Files (same shapes gexp_puller writes):
+#     ign_cache       {uuid: ign}
+#     player_cache    {uuid: {"req": {...10 stats...}, "sb": {...}}}   (json player cache backend)
+#     last_seen       {uuid: ts}
+#   (whitelists and pseudo codes are always written as indented JSON, so they aren't benchmarked)
+#
+#   Per format and file: best-of-N save and load time, and size on disk.
+#   Then switch with CACHE_FORMAT=<name> (existing files migrate on their next save,
+#   or right away with gexp_puller.py --migrate-caches).
+# ============================================================
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+def _uuid(rng: random.Random) -> str:
+    return "%032x" % rng.getrandbits(128)
+
+def build_caches(members: int, seed: int = 1) -> Dict[str, Any]:
+    rng = random.Random(seed)
+    now = int(time.time())
+    uuids = [_uuid(rng) for _ in range(members)]
+
+    ign_cache = {u: "".join(rng.choice("abcdefghijklmnopqrstuvwxyz_0123456789") for _ in range(rng.randint(3, 16)))
+                 for u in uuids}
+    player_cache: Dict[str, Any] = {}
+    for u in uuids:
+        fetched_at = now - rng.randint(0, 7 * 86400)
+        player_cache[u] = {
+            "req": {
+                "ap": rng.randint(0, 30000),
+                "bw_wins": rng.randint(0, 20000),
+                "bw_fkdr": round(rng.uniform(0, 12), 4),
+                "bb_score": rng.randint(0, 90000),
+                "duels_wins": rng.randint(0, 40000),
+                "duels_wlr": round(rng.uniform(0, 8), 4),
+                "sw_wins": rng.randint(0, 8000),
+                "sw_kdr": round(rng.uniform(0, 5), 4),
+                "tnt_wins": rng.randint(0, 4000),
+                "uhc_score": rng.randint(0, 2000),
+                "fetched_at": fetched_at,
+            },
+            "sb": {"level": rng.randint(0, 400), "fetched_at": fetched_at},
+        }
+    last_seen = {u: now - rng.randint(0, 90 * 86400) for u in uuids}
+    return {"ign_cache": ign_cache, "player_cache": player_cache, "last_seen": last_seen}
+
+def _best_of(fn: Any, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+def bench_format(g: Any, fmt_name: str, caches: Dict[str, Any], tmp: str, repeat: int) -> Dict[str, Any]:
+    fmt = g.cache_format(fmt_name)
+    files: Dict[str, Any] = {}
+    for name, data in caches.items():
+        path = os.path.join(tmp, f"{name}.{fmt_name}")
+        save_s = _best_of(lambda: g._json_save(path, data, fmt_name), repeat)
+        load_s = _best_of(lambda: g._json_load(path, None, fmt_name), repeat)
+        if g._json_load(path, None, fmt_name) != data:
+            raise SystemExit(f"{fmt_name}: {name} did not round-trip")
+        files[name] = {"save_s": save_s, "load_s": load_s, "bytes": os.path.getsize(path)}
+        os.remove(path)
+    return {
+        "format": fmt_name,
+        "backend": type(fmt).__name__,
+        "files": files,
+        "save_s": sum(f["save_s"] for f in files.values()),
+        "load_s": sum(f["load_s"] for f in files.values()),
+        "bytes": sum(f["bytes"] for f in files.values()),
+    }
+
+def available_formats(g: Any) -> List[str]:
+    out = []
+    for name in g.CACHE_FORMATS:
+        # orjson silently becomes compact when missing; don't report it twice
+        if g.cache_format(name).name == name:
+            out.append(name)
+    return out
+
+def _print_table(results: List[Dict[str, Any]]) -> None:
+    print(f"{'format':<9} {'file':<13} {'save ms':>9} {'load ms':>9} {'size KB':>9}")
+    print("-" * 53)
+    for res in results:
+        for name, f in res["files"].items():
+            print(f"{res['format']:<9} {name:<13} {f['save_s'] * 1000:>9.1f} {f['load_s'] * 1000:>9.1f} {f['bytes'] / 1024:>9.0f}")
+        print(f"{res['format']:<9} {'TOTAL':<13} {res['save_s'] * 1000:>9.1f} {res['load_s'] * 1000:>9.1f} {res['bytes'] / 1024:>9.0f}")
+        print()
+
+# ============================================================
+# MAIN
+# ============================================================
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Benchmark cache file formats (CACHE_FORMAT) on realistic caches")
+    ap.add_argument("--members", type=int, default=10000, help="players per cache file")
+    ap.add_argument("--repeat", type=int, default=5, help="runs per measurement; the fastest is reported")
+    ap.add_argument("--formats", default="", help="comma-separated subset (default: every available one)")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--out", default="", help="also write the results as JSON here")
+    args = ap.parse_args()
+
+    sys.path.insert(0, BASE_DIR)
+    g = importlib.import_module("gexp_puller")
+
+    formats = [f.strip() for f in args.formats.split(",") if f.strip()] or available_formats(g)
+    caches = build_caches(max(args.members, 1), args.seed)
+    print(f"Benchmarking {', '.join(formats)} on {args.members} members (best of {max(args.repeat, 1)})...\n", flush=True)
+
+    results: List[Dict[str, Any]] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in formats:
+            results.append(bench_format(g, name, caches, tmp, max(args.repeat, 1)))
+
+    _print_table(results)
+    fastest = min(results, key=lambda r: r["save_s"] + r["load_s"])
+    smallest = min(results, key=lambda r: r["bytes"])
+    print(f"Fastest load+save: {fastest['format']} | smallest: {smallest['format']} (set CACHE_FORMAT=<name>)")
+
+    if args.out:
+        report = {
+            "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "members": args.members,
+            "repeat": args.repeat,
+            "results": results,
+        }
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote {args.out}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
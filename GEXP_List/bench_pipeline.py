@@ -0,0 +1,320 @@
+import argparse
+import contextlib
+import importlib
+import io
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# ============================================================
+# END-TO-END PIPELINE BENCHMARK
+#   Runs the real gexp_puller pipeline at several guild sizes and times each phase:
+#     guild       get_guild_by_name
+#     extract     extract_weekly_gexp (incl. bulk IGN resolution)
+#     reqs        apply_requirements_to_members
+#     wave1/2     recommend_kicks (min_days 0 / 8)
+#     leaderboard print_leaderboard (stdout discarded)
+#     csv         export_to_csv (temp file)
+#
+#   Per phase: wall time, CPU time, peak traced memory, API calls by endpoint.
+#   Results are written as JSON so two versions can be compared:
+#     python bench_pipeline.py --sizes 125,1000,5000 --out new.json --baseline old.json
+#
+#   Data sources:
+#     --source mock     (default) mock_api.py in a child process, synthetic guild per size
+#     --source replay   recorded fixtures (HTTP_MODE=replay), --guild must match the recording
+# ============================================================
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+PHASES = ["guild", "extract", "reqs", "wave1", "wave2", "leaderboard", "csv"]
+
+# scratch GEXP_DATA_DIR for the run; lives until the process exits
+_DATA_DIR: Optional[tempfile.TemporaryDirectory] = None
+
+def _parse_sizes(raw: str) -> List[int]:
+    out: List[int] = []
+    for part in (raw or "").split(","):
+        part = part.strip()
+        if part:
+            out.append(max(int(part), 1))
+    return out
+
+def _configure_env(args: argparse.Namespace) -> None:
+    # gexp_puller reads its config at import time, so this has to run first
+    global _DATA_DIR
+    _DATA_DIR = tempfile.TemporaryDirectory(prefix="gexp_bench_")
+    os.environ["GEXP_DATA_DIR"] = _DATA_DIR.name  # caches, whitelists, pseudo codes: never the real GEXP_List files
+    os.environ.setdefault("HYPIXEL_API_KEY", "bench")
+    if args.engine:
+        os.environ["FETCH_ENGINE"] = args.engine
+    if args.source == "replay":
+        os.environ["HTTP_MODE"] = "replay"
+        if args.fixtures:
+            os.environ["HTTP_FIXTURES_DIR"] = args.fixtures
+    else:
+        os.environ["HTTP_MODE"] = "live"
+    if not args.throttle:
+        # measure our own overhead, not the politeness delays
+        os.environ["HYPIXEL_MIN_INTERVAL_S"] = "0"
+        os.environ["MOJANG_MIN_INTERVAL_S"] = "0"
+        os.environ["HYPIXEL_ADAPTIVE_MIN_INTERVAL_S"] = "0"
+    os.environ["GUILD_CACHE_TTL_S"] = "0"
+    os.environ["PLAYER_CACHE_BACKEND"] = "memory"
+
+def _reset_caches(g: Any) -> None:
+    # cold run: forget everything loaded so far (anything saved lands in the scratch GEXP_DATA_DIR)
+    g.IGN_CACHE.clear()
+    g.IGN_MISSES.clear()
+    g.PLAYER_CACHE.clear()
+    g._GUILD_CACHE.update({"name": "", "fetched_at": 0, "guild": None})
+
+def _count_delta(before: Dict[str, int], after: Dict[str, int]) -> Dict[str, int]:
+    out: Dict[str, int] = {}
+    for k, v in after.items():
+        d = v - before.get(k, 0)
+        if d:
+            out[k] = d
+    return out
+
+class _PhaseTimer:
+    def __init__(self, g: Any, trace_memory: bool):
+        self.g = g
+        self.trace_memory = trace_memory
+        self.results: Dict[str, Dict[str, Any]] = {}
+
+    def run(self, name: str, fn: Callable[[], Any]) -> Any:
+        calls_before = self.g.http_call_counts()
+        if self.trace_memory:
+            tracemalloc.reset_peak()
+            mem_base = tracemalloc.get_traced_memory()[0]
+        cpu0 = time.process_time()
+        t0 = time.perf_counter()
+
+        out = fn()
+
+        wall = time.perf_counter() - t0
+        cpu = time.process_time() - cpu0
+        peak_kb: Optional[float] = None
+        if self.trace_memory:
+            peak_kb = round(max(tracemalloc.get_traced_memory()[1] - mem_base, 0) / 1024.0, 1)
+        calls = _count_delta(calls_before, self.g.http_call_counts())
+
+        self.results[name] = {
+            "wall_s": round(wall, 6),
+            "cpu_s": round(cpu, 6),
+            "peak_kb": peak_kb,
+            "api_calls": calls,
+            "api_calls_total": sum(calls.values()),
+        }
+        return out
+
+def _run_pipeline(g: Any, guild_name: str, timer: _PhaseTimer, csv_path: str) -> int:
+    with g.request_run():
+        guild = timer.run("guild", lambda: g.get_guild_by_name(guild_name))
+        members = timer.run("extract", lambda: g.extract_weekly_gexp(guild))
+        with contextlib.redirect_stdout(io.StringIO()):
+            timer.run("reqs", lambda: g.apply_requirements_to_members(members))
+        rec1 = timer.run("wave1", lambda: g.recommend_kicks(members, min_days_in_guild=0))
+        rec2 = timer.run("wave2", lambda: g.recommend_kicks(members, min_days_in_guild=8))
+        g.apply_kick_priority_into_members(members, rec1, rec2)
+        with open(os.devnull, "w", encoding="utf-8") as devnull, contextlib.redirect_stdout(devnull):
+            timer.run("leaderboard", lambda: g.print_leaderboard(guild.get("name", guild_name), members))
+            timer.run("csv", lambda: g.export_to_csv(members, csv_path=csv_path))
+    return len(members)
+
+def _start_mock(args: argparse.Namespace, size: int) -> Tuple[subprocess.Popen, str, str]:
+    """
+    Run mock_api.py in its own process so its CPU time and memory stay out of the numbers.
+    Returns (process, hypixel base url, mojang url).
+    """
+    cmd = [
+        sys.executable, "-u", os.path.join(BASE_DIR, "mock_api.py"),
+        "--port", "0", "--members", str(size), "--seed", str(args.seed),
+        "--player-kb", str(args.player_kb), "--skyblock-kb", str(args.skyblock_kb),
+        "--rate-limit", "0", "--latency-ms", str(args.latency_ms),
+    ]
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, text=True)
+    urls: Dict[str, str] = {}
+    assert proc.stdout is not None
+    for line in proc.stdout:
+        key, _, value = line.strip().partition("=")
+        if key in ("HYPIXEL_BASE_URL", "MOJANG_API_URL"):
+            urls[key] = value
+        if len(urls) == 2:
+            break
+    if len(urls) != 2:
+        proc.kill()
+        raise RuntimeError("mock_api.py did not start")
+    return proc, urls["HYPIXEL_BASE_URL"], urls["MOJANG_API_URL"]
+
+def _bench_size(g: Any, args: argparse.Namespace, size: int, csv_path: str) -> Dict[str, Any]:
+    proc = None
+    guild_name = args.guild
+    if args.source == "mock":
+        proc, g.BASE_URL, g.MOJANG_API = _start_mock(args, size)
+
+    try:
+        runs: List[Dict[str, Any]] = []
+        member_count = 0
+        for i in range(args.repeat):
+            if not (args.warm and i > 0):
+                _reset_caches(g)
+            timer = _PhaseTimer(g, trace_memory=not args.no_tracemalloc)
+            t0 = time.perf_counter()
+            member_count = _run_pipeline(g, guild_name, timer, csv_path)
+            total = time.perf_counter() - t0
+            runs.append({"phases": timer.results, "total_wall_s": round(total, 6)})
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait(timeout=10)
+
+    # report the fastest run per phase (least noise), keep every run for inspection
+    best: Dict[str, Dict[str, Any]] = {}
+    for name in PHASES:
+        samples = [r["phases"][name] for r in runs if name in r["phases"]]
+        if samples:
+            best[name] = min(samples, key=lambda s: s["wall_s"])
+    return {
+        "size": size,
+        "members": member_count,
+        "phases": best,
+        "total_wall_s": min(r["total_wall_s"] for r in runs),
+        "runs": runs,
+    }
+
+def _print_table(results: List[Dict[str, Any]]) -> None:
+    header = f"{'size':>7}  {'phase':<12} {'wall ms':>10} {'cpu ms':>10} {'peak KB':>10} {'api calls':>10}"
+    print(header)
+    print("-" * len(header))
+    for res in results:
+        for name in PHASES:
+            p = res["phases"].get(name)
+            if not p:
+                continue
+            peak = "-" if p["peak_kb"] is None else f"{p['peak_kb']:.0f}"
+            print(f"{res['size']:>7}  {name:<12} {p['wall_s'] * 1000:>10.1f} {p['cpu_s'] * 1000:>10.1f} "
+                  f"{peak:>10} {p['api_calls_total']:>10}")
+        print(f"{res['size']:>7}  {'TOTAL':<12} {res['total_wall_s'] * 1000:>10.1f}")
+        print()
+
+def _compare(results: List[Dict[str, Any]], baseline_path: str, tolerance: float) -> List[str]:
+    """
+    Compare wall times (and API call counts) against a previous results file.
+    Returns human-readable regression lines; phases faster than 5 ms are ignored as noise.
+    """
+    with open(baseline_path, "r", encoding="utf-8") as f:
+        base = json.load(f)
+    base_by_size = {r["size"]: r for r in base.get("results", [])}
+
+    regressions: List[str] = []
+    for res in results:
+        old = base_by_size.get(res["size"])
+        if not old:
+            continue
+        for name in PHASES:
+            new_p = res["phases"].get(name)
+            old_p = old.get("phases", {}).get(name)
+            if not new_p or not old_p:
+                continue
+            if new_p["api_calls_total"] > old_p.get("api_calls_total", 0):
+                regressions.append(
+                    f"size {res['size']} {name}: api calls {old_p.get('api_calls_total', 0)} -> {new_p['api_calls_total']}"
+                )
+            old_wall = float(old_p.get("wall_s", 0))
+            new_wall = float(new_p["wall_s"])
+            if max(old_wall, new_wall) < 0.005:
+                continue
+            if old_wall > 0 and new_wall > old_wall * (1.0 + tolerance):
+                regressions.append(
+                    f"size {res['size']} {name}: wall {old_wall * 1000:.1f}ms -> {new_wall * 1000:.1f}ms "
+                    f"(+{(new_wall / old_wall - 1.0) * 100:.0f}%)"
+                )
+    return regressions
+
+# ============================================================
+# MAIN
+# ============================================================
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Benchmark the gexp_puller pipeline phase by phase")
+    ap.add_argument("--sizes", default="125,1000", help="comma-separated guild sizes (mock source only)")
+    ap.add_argument("--source", choices=["mock", "replay"], default="mock")
+    ap.add_argument("--fixtures", default="", help="fixtures dir for --source replay")
+    ap.add_argument("--guild", default="Lucid", help="guild name to request")
+    ap.add_argument("--engine", choices=["auto", "async", "threads"], default="", help="override FETCH_ENGINE")
+    ap.add_argument("--repeat", type=int, default=1, help="runs per size; the fastest is reported")
+    ap.add_argument("--warm", action="store_true", help="keep in-memory caches between repeats")
+    ap.add_argument("--throttle", action="store_true", help="keep the normal request pacing")
+    ap.add_argument("--no-tracemalloc", action="store_true", help="skip peak-memory tracking (it slows Python code)")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--player-kb", type=int, default=40)
+    ap.add_argument("--skyblock-kb", type=int, default=8)
+    ap.add_argument("--latency-ms", type=float, default=0.0, help="mock server latency per response")
+    ap.add_argument("--out", default=os.path.join(BASE_DIR, "bench_results.json"))
+    ap.add_argument("--baseline", default="", help="previous results file to compare against")
+    ap.add_argument("--tolerance", type=float, default=0.15, help="allowed slowdown before flagging (0.15 = 15%%)")
+    args = ap.parse_args()
+    args.repeat = max(args.repeat, 1)
+
+    _configure_env(args)
+    sys.path.insert(0, BASE_DIR)
+    g = importlib.import_module("gexp_puller")
+
+    sizes = _parse_sizes(args.sizes) if args.source == "mock" else [0]
+    if not args.no_tracemalloc:
+        tracemalloc.start()
+
+    results: List[Dict[str, Any]] = []
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "bench.csv")
+        for size in sizes:
+            label = f"{size} members" if size else "replay"
+            print(f"Benchmarking {label}...", flush=True)
+            res = _bench_size(g, args, size, csv_path)
+            if not size:
+                res["size"] = res["members"]
+            results.append(res)
+
+    if tracemalloc.is_tracing():
+        tracemalloc.stop()
+
+    report = {
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "source": args.source,
+        "engine": g.FETCH_ENGINE,
+        "async_engine": g._use_async_engine(),
+        "throttled": bool(args.throttle),
+        "tracemalloc": not args.no_tracemalloc,
+        "repeat": args.repeat,
+        "warm": bool(args.warm),
+        "results": results,
+    }
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    print()
+    _print_table(results)
+    print(f"Wrote {args.out}")
+
+    if args.baseline:
+        regressions = _compare(results, args.baseline, args.tolerance)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) vs {args.baseline}:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"\nNo regressions vs {args.baseline}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,10 +1,40 @@
+import time
+_IMPORT_T0 = time.perf_counter()  # start of the import-time figure in the startup report
+
 import requests
+import argparse
+import asyncio
+import atexit
+import cProfile
+import io
+import pstats
+import sys
+import tracemalloc
+import contextvars
+import contextlib
 import json
+import marshal
 import csv
+import difflib
 import os
-from typing import Dict, List, Any, Optional, Tuple
+from typing import Callable, Dict, List, Any, Optional, Tuple
 from datetime import datetime, timezone, timedelta
-import time
+import random
+import hashlib
+import shutil
+import tempfile
+import heapq
+import itertools
+import mmap
+import operator
+import sqlite3
+import struct
+import threading
+import zlib
+from array import array
+from bisect import bisect_left, bisect_right
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
+from functools import partial
 
 # ============================================================
 # CONFIG
@@ -13,20 +43,84 @@ import time
 # Always save files next to this script (not where you run it from)
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 
+# HTTP record/replay: "live" (default), "record" (live + save fixtures), "replay" (fixtures only, no network)
+HTTP_MODE = os.getenv("HTTP_MODE", "live").strip().lower()
+
+# GEXP_DATA_DIR moves every cache / whitelist / output file elsewhere (benchmarks, replay runs).
+# Replay without one gets a per-run scratch dir, so fixture data never writes through to the live caches;
+# only its name is picked here: it is created on first use and removed at exit.
+_SCRATCH_DATA_DIR = HTTP_MODE == "replay" and not os.getenv("GEXP_DATA_DIR", "").strip()
+
+def _scratch_dir_name() -> str:
+    root = os.getenv("TMPDIR") or os.getenv("TEMP") or os.getenv("TMP") or tempfile.gettempdir()
+    return os.path.join(root, f"gexp_replay_{os.getpid()}_{random.getrandbits(32):08x}")
+
+DATA_DIR = os.path.abspath(
+    os.getenv("GEXP_DATA_DIR", "").strip() or (_scratch_dir_name() if _SCRATCH_DATA_DIR else BASE_DIR)
+)
+_SCRATCH_CONFIG = ("kick_whitelist.json", "requirement_whitelist.json", "pseudo_requirement.json")
+_DATA_DIR_READY = not _SCRATCH_DATA_DIR
+_DATA_DIR_LOCK = threading.Lock()
+
 def _p(filename: str) -> str:
-    return os.path.join(BASE_DIR, filename)
+    return os.path.join(DATA_DIR, filename)
+
+def _ensure_data_dir(path: str) -> None:
+    """
+    Create the replay scratch dir before the first read or write under it,
+    starting from copies of the hand-edited config (never the caches).
+    """
+    global _DATA_DIR_READY
+    if _DATA_DIR_READY or not os.path.abspath(path).startswith(DATA_DIR + os.sep):
+        return
+    with _DATA_DIR_LOCK:
+        if _DATA_DIR_READY:
+            return
+        os.makedirs(DATA_DIR, exist_ok=True)
+        for name in _SCRATCH_CONFIG:
+            src = os.path.join(BASE_DIR, name)
+            if os.path.exists(src):
+                shutil.copyfile(src, _p(name))
+        _DATA_DIR_READY = True
+
+def _remove_scratch_data_dir() -> None:
+    if _SCRATCH_DATA_DIR and _DATA_DIR_READY:
+        shutil.rmtree(DATA_DIR, ignore_errors=True)
+
+def _scratch_note() -> str:
+    # appended wherever an output path is printed
+    return " (replay scratch dir, removed at exit; set GEXP_DATA_DIR to keep it)" if _SCRATCH_DATA_DIR else ""
+
+if _SCRATCH_DATA_DIR:
+    atexit.register(_remove_scratch_data_dir)  # registered first so it runs after every other exit hook
 
 API_KEY = os.getenv("HYPIXEL_API_KEY", "").strip() or "API-KEY"
-BASE_URL = "https://api.hypixel.net/v2"
-MOJANG_API = "https://sessionserver.mojang.com/session/minecraft/profile"
+# Overridable so the script can point at a local stand-in (see mock_api.py)
+BASE_URL = os.getenv("HYPIXEL_BASE_URL", "").strip().rstrip("/") or "https://api.hypixel.net/v2"
+MOJANG_API = os.getenv("MOJANG_API_URL", "").strip().rstrip("/") or "https://sessionserver.mojang.com/session/minecraft/profile"
 
 CACHE_FILE = _p("ign_cache.json")
+IGN_MISSES_FILE = _p("ign_misses.json")  # failed Mojang lookups (negative cache)
 PLAYER_CACHE_FILE = _p("player_cache.json")
+PLAYER_CACHE_DB_FILE = os.getenv("PLAYER_CACHE_DB", "").strip() or _p("player_cache.sqlite3")
+PLAYER_CACHE_BIN_FILE = os.getenv("PLAYER_CACHE_BIN", "").strip() or _p("player_cache.bin")
+PLAYER_CACHE_BACKEND = os.getenv("PLAYER_CACHE_BACKEND", "sqlite").strip().lower()  # sqlite | json | mmap | memory
+if HTTP_MODE == "replay":
+    PLAYER_CACHE_BACKEND = "memory"  # replay runs start cold and leave nothing behind
+RAW_ARCHIVE_FILE = os.getenv("RAW_ARCHIVE_FILE", "").strip() or _p("raw_archive.sqlite3")
+LAST_SEEN_FILE = _p("last_seen.json")  # uuid -> last time seen in the guild (drives cache eviction)
 PSEUDO_REQS_FILE = _p("pseudo_requirement.json")
 PSEUDO_REQS_FILE_OLD = _p("pseudo_requirements.json")
 WHITELIST_FILE = _p("kick_whitelist.json")
 REQ_WHITELIST_FILE = _p("requirement_whitelist.json")  # ✅ new: excludes from requirement % totals
 
+HTTP_FIXTURES_DIR = os.getenv("HTTP_FIXTURES_DIR", "").strip() or os.path.join(BASE_DIR, "fixtures")
+REPLAY_LATENCY_MS = float(os.getenv("REPLAY_LATENCY_MS", "0"))
+REPLAY_JITTER_MS = float(os.getenv("REPLAY_JITTER_MS", "0"))
+REPLAY_429_RATE = float(os.getenv("REPLAY_429_RATE", "0"))        # 0..1 chance of an injected 429
+REPLAY_RETRY_AFTER_S = os.getenv("REPLAY_RETRY_AFTER_S", "1").strip()
+REPLAY_SEED = int(os.getenv("REPLAY_SEED", "0"))
+
 
 
 # Toggles
@@ -38,17 +132,78 @@ ENABLE_SKYBLOCK_LEVEL = os.getenv("ENABLE_SKYBLOCK_LEVEL", "1").strip() != "0"
 PLAYER_CACHE_TTL_HOURS = int(os.getenv("PLAYER_CACHE_TTL_HOURS", "24"))
 SKYBLOCK_CACHE_TTL_HOURS = int(os.getenv("SKYBLOCK_CACHE_TTL_HOURS", "24"))
 
+# Threshold-aware TTLs: members near a requirement / BW bonus boundary expire sooner, far ones at the cap
+# (ADAPTIVE_TTL=0 restores the flat TTLs above)
+ADAPTIVE_TTL = os.getenv("ADAPTIVE_TTL", "1").strip() != "0"
+ADAPTIVE_TTL_MIN_HOURS = float(os.getenv("ADAPTIVE_TTL_MIN_HOURS", "6"))
+# cap; 0 = each cache's flat TTL above, so nothing is kept longer than PLAYER_/SKYBLOCK_CACHE_TTL_HOURS unless asked
+ADAPTIVE_TTL_MAX_HOURS = float(os.getenv("ADAPTIVE_TTL_MAX_HOURS", "0"))
+ADAPTIVE_TTL_FAR = float(os.getenv("ADAPTIVE_TTL_FAR", "0.25"))       # relative distance that earns the max TTL
+ADAPTIVE_TTL_JITTER = float(os.getenv("ADAPTIVE_TTL_JITTER", "0.15"))  # +/- fraction, spreads expiries apart
+
+# Stale-while-revalidate: past the TTL, answer from cache at once and refetch in the background
+CACHE_STALE_WHILE_REVALIDATE = os.getenv("CACHE_STALE_WHILE_REVALIDATE", "0").strip() != "0"
+CACHE_STALE_MAX_HOURS = int(os.getenv("CACHE_STALE_MAX_HOURS", "168"))  # older than this is fetched inline
+SWR_REFRESH_WORKERS = max(int(os.getenv("SWR_REFRESH_WORKERS", "2")), 1)
+IGN_NEGATIVE_TTL_S = int(os.getenv("IGN_NEGATIVE_TTL_S", "3600"))  # retry failed IGN lookups after this
+
 # Rate-limit safety (soft throttle, seconds)
 HYPIXEL_MIN_INTERVAL_S = float(os.getenv("HYPIXEL_MIN_INTERVAL_S", "0.20"))
 MOJANG_MIN_INTERVAL_S = float(os.getenv("MOJANG_MIN_INTERVAL_S", "0.05"))
-
-# Priority penalty for meeting 0 requirements (applies when combined req count == 0)
-REQ_ZERO_PENALTY = -3  
-
-# ✅ PSEUDO REQUIREMENT PRIORITY BONUSES
-PSEUDO_PRIORITY_BONUSES: Dict[str, int] = {
-    "LB": 10,
-}
+HYPIXEL_BURST = max(int(os.getenv("HYPIXEL_BURST", "1")), 1)
+MOJANG_BURST = max(int(os.getenv("MOJANG_BURST", "1")), 1)
+
+# Header-driven Hypixel limiter (RateLimit-Remaining / RateLimit-Reset)
+HYPIXEL_ADAPTIVE_RATE_LIMIT = os.getenv("HYPIXEL_ADAPTIVE_RATE_LIMIT", "1").strip() != "0"
+HYPIXEL_ADAPTIVE_MIN_INTERVAL_S = float(os.getenv("HYPIXEL_ADAPTIVE_MIN_INTERVAL_S", "0.02"))
+HYPIXEL_QUOTA_RESERVE = max(int(os.getenv("HYPIXEL_QUOTA_RESERVE", "2")), 0)
+
+# Requirement scan worker pool (1 = old serial behaviour)
+REQ_SCAN_WORKERS = max(int(os.getenv("REQ_SCAN_WORKERS", "8")), 1)
+
+# Bulk IGN resolution worker pool (threads engine only)
+IGN_RESOLVE_WORKERS = max(int(os.getenv("IGN_RESOLVE_WORKERS", "8")), 1)
+
+# Fetch engine for bulk lookups: "threads", "async", or "auto" (async if aiohttp is installed)
+FETCH_ENGINE = os.getenv("FETCH_ENGINE", "auto").strip().lower()
+ASYNC_MAX_IN_FLIGHT = max(int(os.getenv("ASYNC_MAX_IN_FLIGHT", "200")), 1)
+
+# Dump API metrics here at exit (.prom = Prometheus text, .jsonl = append one line per run, else JSON)
+METRICS_FILE = os.getenv("GEXP_METRICS_FILE", "").strip()
+
+# Cache saves append changed keys to <file>.journal; the snapshot is rewritten once the journal passes this size
+CACHE_JOURNAL = os.getenv("CACHE_JOURNAL", "1").strip() != "0"
+# Snapshot format for the machine-only caches (IGN, IGN misses, last_seen, json player cache):
+# json (indent=2) | compact | orjson | binary (marshal). Whitelists and pseudo codes always stay indented JSON.
+# Any format is detected on load; a file in another format is rewritten on its next save.
+CACHE_FORMAT = os.getenv("CACHE_FORMAT", "json").strip().lower()
+JOURNAL_COMPACT_BYTES = max(int(os.getenv("JOURNAL_COMPACT_BYTES", str(256 * 1024))), 0)
+
+# Keep zlib-compressed raw /player and SkyBlock member payloads so extractors can be re-run offline (--reextract)
+RAW_ARCHIVE = os.getenv("RAW_ARCHIVE", "0").strip() != "0" and HTTP_MODE != "replay"
+RAW_ARCHIVE_KEEP = max(int(os.getenv("RAW_ARCHIVE_KEEP", "3")), 1)  # snapshots kept per uuid and kind
+
+# Cache eviction (load + save): drop players not seen in the guild for CACHE_MAX_AGE_DAYS, then
+# the least recently seen beyond CACHE_MAX_ENTRIES; whitelisted / pseudo-coded uuids are always kept (0 = no limit)
+CACHE_EVICT = os.getenv("CACHE_EVICT", "1").strip() != "0"
+CACHE_MAX_ENTRIES = max(int(os.getenv("CACHE_MAX_ENTRIES", "5000")), 0)
+CACHE_MAX_AGE_DAYS = max(float(os.getenv("CACHE_MAX_AGE_DAYS", "90")), 0.0)
+
+# Warm-up scheduler (--warm): refresh cache entries ahead of expiry, spread over the day
+WARM_DAILY_BUDGET = max(int(os.getenv("WARM_DAILY_BUDGET", "2000")), 1)    # /player + /skyblock calls per day
+WARM_INTERVAL_MIN = max(float(os.getenv("WARM_INTERVAL_MIN", "30")), 1.0)
+WARM_LOOKAHEAD_HOURS = max(float(os.getenv("WARM_LOOKAHEAD_HOURS", "6")), 0.0)  # also refresh entries expiring this soon
+
+# Kick scoring: "numpy" (vectorized, optional dependency), "python", or "auto" (numpy when installed)
+KICK_SCORE_ENGINE = os.getenv("KICK_SCORE_ENGINE", "auto").strip().lower()
+
+# Kick priority policy (bands, rank protection, zero-reqs penalty, pseudo and BW wins bonuses):
+# kick_rules.json, compiled into lookup tables; edits are picked up on the next scoring run
+KICK_RULES_FILE = os.getenv("KICK_RULES_FILE", "").strip() or os.path.join(BASE_DIR, "kick_rules.json")
+KICK_RULES_RELOAD = os.getenv("KICK_RULES_RELOAD", "1").strip() != "0"
+# Members as the kick waves saw them (after requirements), saved by each list action for --simulate
+MEMBER_SNAPSHOT = os.getenv("MEMBER_SNAPSHOT", "1").strip() != "0"
+MEMBER_SNAPSHOT_FILE = os.getenv("MEMBER_SNAPSHOT_FILE", "").strip() or _p("member_snapshot.json")
 
 # ============================================================
 # ANSI COLORS
@@ -99,21 +254,152 @@ def _ratio(n: float, d: float) -> float:
         return float(n) if n > 0 else 0.0
     return float(n) / d
 
-def _json_load(path: str, default: Any) -> Any:
+class _JsonFormat:
+    """stdlib json with indent=2: the original, diff-friendly layout."""
+
+    name = "json"
+    layout = "json"   # what a file written by this format looks like (see _snapshot_layout)
+
+    def dumps(self, data: Any) -> bytes:
+        return json.dumps(data, indent=2).encode("utf-8")
+
+    def loads(self, raw: bytes) -> Any:
+        return json.loads(raw.decode("utf-8"))
+
+class _CompactJsonFormat(_JsonFormat):
+    name = "compact"
+    layout = "compact"
+
+    def dumps(self, data: Any) -> bytes:
+        return json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+class _OrjsonFormat(_JsonFormat):
+    # compact JSON through orjson (optional dependency)
+    name = "orjson"
+    layout = "compact"
+
+    def __init__(self, orjson: Any):
+        self._orjson = orjson
+
+    def dumps(self, data: Any) -> bytes:
+        return self._orjson.dumps(data)
+
+    def loads(self, raw: bytes) -> Any:
+        return self._orjson.loads(raw)
+
+class _MarshalFormat:
+    """
+    marshal with a small header (magic + marshal version).
+    Plain dicts/lists/str/numbers only, and loading never runs code (unlike pickle).
+    """
+
+    name = "binary"
+    layout = "binary"
+    MAGIC = b"GXPM"
+
+    def dumps(self, data: Any) -> bytes:
+        return self.MAGIC + bytes([marshal.version]) + marshal.dumps(data)
+
+    def loads(self, raw: bytes) -> Any:
+        if not raw.startswith(self.MAGIC):
+            raise ValueError("not a marshal cache file")
+        version = raw[len(self.MAGIC)] if len(raw) > len(self.MAGIC) else -1
+        if version != marshal.version:
+            # marshal isn't portable across versions: refuse rather than start from an empty cache
+            raise ValueError(
+                f"marshal cache written with marshal version {version}, this Python uses {marshal.version}; "
+                f"load it with the Python that wrote it, or delete it to rebuild"
+            )
+        return marshal.loads(raw[len(self.MAGIC) + 1:])
+
+CACHE_FORMATS = ("json", "compact", "orjson", "binary")
+_FORMATS: Dict[str, Any] = {}
+
+def cache_format(name: Optional[str] = None) -> Any:
+    """
+    Serializer by name (default CACHE_FORMAT); orjson falls back to compact when it isn't installed.
+    """
+    name = (name or CACHE_FORMAT).strip().lower()
+    fmt = _FORMATS.get(name)
+    if fmt is not None:
+        return fmt
+    if name == "orjson":
+        try:
+            import orjson  # optional: faster JSON encode/decode
+            fmt = _OrjsonFormat(orjson)
+        except ImportError:
+            print(f"{YELLOW}CACHE_FORMAT=orjson but orjson is not installed; using compact JSON.{RESET}")
+            fmt = _CompactJsonFormat()
+    elif name == "compact":
+        fmt = _CompactJsonFormat()
+    elif name == "binary":
+        fmt = _MarshalFormat()
+    else:
+        if name != "json":
+            print(f"{YELLOW}Unknown CACHE_FORMAT '{name}' (expected one of: {', '.join(CACHE_FORMATS)}); using json.{RESET}")
+        fmt = _JsonFormat()
+    _FORMATS[name] = fmt
+    return fmt
+
+def _snapshot_layout(raw: bytes) -> str:
+    # "binary", "json" (indented) or "compact"; tiny files ("{}", "[]") count as either JSON layout
+    if raw.startswith(_MarshalFormat.MAGIC):
+        return "binary"
+    if len(raw.strip()) <= 2:
+        return ""
+    return "json" if raw[1:2] in (b"\n", b"\r") else "compact"
+
+def _decode_snapshot(raw: bytes, text_fmt: Optional[str] = None) -> Any:
+    if raw.startswith(_MarshalFormat.MAGIC):
+        return cache_format("binary").loads(raw)
+    fmt = cache_format(text_fmt)
+    if fmt.layout != "binary":
+        try:
+            return fmt.loads(raw)
+        except Exception:
+            pass  # e.g. orjson is stricter about NaN / Infinity
+    return json.loads(raw.decode("utf-8"))
+
+def _json_load(path: str, default: Any, text_fmt: Optional[str] = None) -> Any:
+    """
+    Load a cache/config file in any CACHE_FORMAT (detected from its first bytes);
+    text_fmt picks the JSON decoder (default: CACHE_FORMAT's).
+    """
     if not os.path.exists(path):
         return default
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            return json.load(f)
+        with open(path, "rb") as f:
+            raw = f.read()
+    except OSError:
+        return default
+    if raw.startswith(_MarshalFormat.MAGIC):
+        try:
+            return cache_format("binary").loads(raw)
+        except ValueError as e:
+            # the next save would replace it with an empty cache, so this one is fatal
+            raise ValueError(f"{path}: {e}") from e
+    try:
+        return _decode_snapshot(raw, text_fmt)
     except Exception:
         return default
 
-def _json_save(path: str, data: Any) -> None:
+def _json_save(path: str, data: Any, fmt: str = "json") -> None:
+    # fmt="json" keeps human-facing files (metrics, fixtures, exports) readable; caches pass CACHE_FORMAT
+    _ensure_data_dir(path)
     tmp_path = path + ".tmp"
-    with open(tmp_path, "w", encoding="utf-8") as f:
-        json.dump(data, f, indent=2)
+    with open(tmp_path, "wb") as f:
+        f.write(cache_format(fmt).dumps(data))
     os.replace(tmp_path, path)
 
+def _file_needs_migration(path: str, fmt: Optional[str] = None) -> bool:
+    try:
+        with open(path, "rb") as f:
+            head = f.read(8)
+    except OSError:
+        return False
+    layout = _snapshot_layout(head)
+    return bool(layout) and layout != cache_format(fmt).layout
+
 def _normalize_uuid(u: str) -> str:
     """
     Canonical UUID key for caches/files:
@@ -122,15 +408,293 @@ def _normalize_uuid(u: str) -> str:
       - keep only 0-9a-f
       - max 32 chars
     """
+    if type(u) is str and len(u) == 32 and not u.strip("0123456789abcdef"):
+        return u  # already canonical (the common case)
     u = (u or "").strip().lower().replace("-", "")
     u = "".join(ch for ch in u if ch in "0123456789abcdef")
     return u[:32]
 
+# ============================================================
+# CACHE JOURNAL (append-only writes + compaction)
+#   <file>.journal holds one JSON op per line on top of the <file> snapshot:
+#     {"op": "set"|"del"|"ladd"|"lrem", "k": [key, ...], "v": value}
+#   saves append only the ops recorded since the last save; once the journal
+#   passes JOURNAL_COMPACT_BYTES it is folded back into the snapshot on a
+#   background thread. Replaying an op twice is harmless, so a crash between
+#   writing the snapshot and trimming the journal loses nothing.
+# ============================================================
+def _journal_apply(data: Dict[str, Any], entry: Dict[str, Any]) -> None:
+    op = entry.get("op")
+    keys = entry.get("k") or []
+    if not isinstance(keys, list) or not keys:
+        return
+    parent: Any = data
+    for k in keys[:-1]:
+        nxt = parent.get(k)
+        if not isinstance(nxt, dict):
+            if op in ("del", "lrem"):
+                return
+            nxt = {}
+            parent[k] = nxt
+        parent = nxt
+    last = keys[-1]
+    value = entry.get("v")
+    if op == "set":
+        parent[last] = value
+    elif op == "del":
+        parent.pop(last, None)
+    elif op == "ladd":
+        lst = parent.get(last)
+        if not isinstance(lst, list):
+            lst = []
+            parent[last] = lst
+        if value not in lst:
+            lst.append(value)
+    elif op == "lrem":
+        lst = parent.get(last)
+        if isinstance(lst, list):
+            parent[last] = [x for x in lst if x != value]
+
+class _Journal:
+    """
+    Write-ahead journal for one JSON snapshot file.
+      - record(op, keys, value): buffer a change (call right after mutating the data)
+      - replay(data): apply the journal on load
+      - commit(data): append buffered ops; compact in the background when it gets big
+    With CACHE_JOURNAL=0, commit() just rewrites the snapshot like before.
+    fmt is the snapshot format: "json" for hand-edited config, CACHE_FORMAT for machine-only caches.
+    snapshot_only: small hand-edited config (whitelists, pseudo codes) is rewritten on every change
+    instead, so the tracked file always matches and hand edits aren't undone by a replayed journal.
+    """
+
+    def __init__(self, snapshot_path: str, fmt: str = "json", snapshot_only: bool = False):
+        self.snapshot_path = snapshot_path
+        self.fmt = fmt
+        self.snapshot_only = snapshot_only
+        self.path = snapshot_path + ".journal"
+        self._pending: List[str] = []
+        self._lock = threading.Lock()
+        self._compacting = False
+        self._thread: Optional[threading.Thread] = None
+        self.rewrite = False  # set when the snapshot isn't in self.fmt yet: the next commit compacts
+
+    def record(self, op: str, keys: List[Any], value: Any = None) -> None:
+        line = json.dumps({"op": op, "k": list(keys), "v": value}, separators=(",", ":"))
+        with self._lock:
+            self._pending.append(line)
+
+    def replay(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        if not isinstance(data, dict) or not os.path.exists(self.path):
+            return data
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        continue  # torn last line from a crash mid-append
+                    if isinstance(entry, dict):
+                        _journal_apply(data, entry)
+        except OSError:
+            pass
+        return data
+
+    def commit(self, data: Dict[str, Any]) -> int:
+        data = _unwrap(data)
+        if self.snapshot_only:
+            with self._lock:
+                n, self._pending = len(self._pending), []
+            # untouched config stays byte-identical; a journal left by an older build is folded in
+            if n or self.rewrite or os.path.exists(self.path):
+                _json_save(self.snapshot_path, data, self.fmt)
+                self.rewrite = False
+                try:
+                    os.remove(self.path)
+                except OSError:
+                    pass
+            return n
+        if not CACHE_JOURNAL:
+            with self._lock:
+                self._pending.clear()
+            _json_save(self.snapshot_path, data, self.fmt)
+            self.rewrite = False
+            return 0
+
+        with self._lock:
+            lines, self._pending = self._pending, []
+            if lines:
+                _ensure_data_dir(self.path)
+                with open(self.path, "a", encoding="utf-8") as f:
+                    f.write("\n".join(lines) + "\n")
+                    f.flush()
+                    os.fsync(f.fileno())
+            size = os.path.getsize(self.path) if os.path.exists(self.path) else 0
+            if (size > JOURNAL_COMPACT_BYTES or self.rewrite) and not self._compacting:
+                # serialize now, on the thread that owns the data; only the file work goes to the background
+                self._compacting = True
+                self.rewrite = False
+                blob = cache_format(self.fmt).dumps(data)
+                self._thread = threading.Thread(
+                    target=self._compact, args=(blob, size), name=f"compact-{os.path.basename(self.snapshot_path)}"
+                )
+                self._thread.start()
+        return len(lines)
+
+    def _compact(self, blob: bytes, folded_bytes: int) -> None:
+        try:
+            tmp_path = self.snapshot_path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(blob)
+            os.replace(tmp_path, self.snapshot_path)
+
+            # keep whatever was appended while the snapshot was being written
+            with self._lock:
+                if not os.path.exists(self.path):
+                    return
+                with open(self.path, "r", encoding="utf-8") as f:
+                    f.seek(folded_bytes)
+                    tail = f.read()
+                tmp_path = self.path + ".tmp"
+                with open(tmp_path, "w", encoding="utf-8") as f:
+                    f.write(tail)
+                os.replace(tmp_path, self.path)
+        except OSError as e:
+            print(f"{YELLOW}Journal compaction failed for {os.path.basename(self.snapshot_path)}: {e}{RESET}")
+        finally:
+            with self._lock:
+                self._compacting = False
+
+    def wait(self) -> None:
+        t = self._thread
+        if t is not None:
+            t.join()
+
+def _journaled_load(path: str, default: Any, journal: _Journal) -> Any:
+    _ensure_data_dir(path)
+    data = _json_load(path, default)
+    if _file_needs_migration(path, journal.fmt):
+        journal.rewrite = True
+    return journal.replay(data) if isinstance(data, dict) else data
+
+# ============================================================
+# LAZY STATE
+#   caches, whitelists and HTTP sessions load on first use, so importing
+#   the module (or a short menu action) costs no disk I/O up front
+# ============================================================
+class _Startup:
+    """
+    Startup timings for the --profile report: import, each lazy load, the first list action.
+    """
+
+    def __init__(self) -> None:
+        self.import_s = 0.0
+        self.loads: Dict[str, float] = {}
+        self.first_action_s: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def loaded(self, name: str, seconds: float) -> None:
+        with self._lock:
+            self.loads[name] = self.loads.get(name, 0.0) + seconds
+
+    def action_done(self, seconds: float) -> None:
+        if self.first_action_s is None:
+            self.first_action_s = seconds
+
+    def summary(self) -> str:
+        parts = [f"import {self.import_s * 1000:.0f}ms"]
+        if self.loads:
+            loads = ", ".join(f"{k} {v * 1000:.1f}ms" for k, v in self.loads.items())
+            parts.append(f"lazy loads ({loads}; nested loads count in both)")
+        if self.first_action_s is not None:
+            parts.append(f"first action {self.first_action_s:.2f}s")
+        return " | ".join(parts)
+
+_STARTUP = _Startup()
+
+class _Lazy:
+    """
+    Accessor for module state that is built on first use.
+      - item access, `in`, iteration, len() and attributes are forwarded to the value
+      - .value builds it (once, thread-safe); .loaded says whether that has happened
+    """
+
+    __slots__ = ("name", "_loader", "_value", "_loaded", "_lock")
+
+    def __init__(self, name: str, loader: Any):
+        self.name = name
+        self._loader = loader
+        self._value: Any = None
+        self._loaded = False
+        self._lock = threading.RLock()
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    @property
+    def value(self) -> Any:
+        if not self._loaded:
+            with self._lock:
+                if not self._loaded:
+                    t0 = time.perf_counter()
+                    self._value = self._loader()
+                    self._loaded = True
+                    _STARTUP.loaded(self.name, time.perf_counter() - t0)
+        return self._value
+
+    def __getattr__(self, item: str) -> Any:
+        return getattr(self.value, item)
+
+    def __getitem__(self, key: Any) -> Any:
+        return self.value[key]
+
+    def __setitem__(self, key: Any, v: Any) -> None:
+        self.value[key] = v
+
+    def __delitem__(self, key: Any) -> None:
+        del self.value[key]
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self.value
+
+    def __iter__(self):
+        return iter(self.value)
+
+    def __len__(self) -> int:
+        return len(self.value)
+
+    def __bool__(self) -> bool:
+        return bool(self.value)
+
+    def __repr__(self) -> str:
+        return repr(self.value) if self._loaded else f"<lazy {self.name} (not loaded)>"
+
+def _unwrap(x: Any) -> Any:
+    return x.value if isinstance(x, _Lazy) else x
+
+def _is_loaded(x: Any) -> bool:
+    # saves skip state nobody touched this run (there is nothing new to write)
+    return not isinstance(x, _Lazy) or x.loaded
+
+def _load_aiohttp() -> Any:
+    try:
+        import aiohttp  # optional: non-blocking HTTP for the async fetch engine
+    except ImportError:
+        return None
+    return aiohttp
+
+aiohttp = _Lazy("aiohttp", _load_aiohttp)  # slow to import; only the async engine needs it
+
 # ============================================================
 # KICK WHITELIST (permanent)
 # ============================================================
+_KICK_WHITELIST_JOURNAL = _Journal(WHITELIST_FILE, snapshot_only=True)
+
 def load_kick_whitelist() -> Dict[str, Any]:
-    data = _json_load(WHITELIST_FILE, {"uuids": []})
+    data = _journaled_load(WHITELIST_FILE, {"uuids": []}, _KICK_WHITELIST_JOURNAL)
     if not isinstance(data, dict):
         data = {"uuids": []}
     uuids = data.get("uuids", [])
@@ -148,9 +712,10 @@ def load_kick_whitelist() -> Dict[str, Any]:
     return data
 
 def save_kick_whitelist(data: Dict[str, Any]) -> None:
-    _json_save(WHITELIST_FILE, data)
+    if _is_loaded(data):
+        _KICK_WHITELIST_JOURNAL.commit(data)
 
-KICK_WHITELIST = load_kick_whitelist()
+KICK_WHITELIST = _Lazy("kick_whitelist", load_kick_whitelist)
 
 def is_whitelisted_member(m: Dict[str, Any]) -> bool:
     uuid = _normalize_uuid(str(m.get("uuid", "")))
@@ -165,6 +730,7 @@ def _whitelist_add_uuid(uuid: str) -> bool:
     KICK_WHITELIST.setdefault("uuids", [])
     if uuid not in KICK_WHITELIST["uuids"]:
         KICK_WHITELIST["uuids"].append(uuid)
+        _KICK_WHITELIST_JOURNAL.record("ladd", ["uuids"], uuid)
         save_kick_whitelist(KICK_WHITELIST)
         return True
     return False
@@ -176,6 +742,7 @@ def _whitelist_remove_uuid(uuid: str) -> bool:
     uuids = KICK_WHITELIST.get("uuids", []) or []
     if uuid in uuids:
         KICK_WHITELIST["uuids"] = [u for u in uuids if u != uuid]
+        _KICK_WHITELIST_JOURNAL.record("lrem", ["uuids"], uuid)
         save_kick_whitelist(KICK_WHITELIST)
         return True
     return False
@@ -184,8 +751,10 @@ def _whitelist_remove_uuid(uuid: str) -> bool:
 # REQUIREMENT CHECK WHITELIST (permanent)
 #   - members here are excluded from requirement summary % totals
 # ============================================================
+_REQ_WHITELIST_JOURNAL = _Journal(REQ_WHITELIST_FILE, snapshot_only=True)
+
 def load_req_whitelist() -> Dict[str, Any]:
-    data = _json_load(REQ_WHITELIST_FILE, {"uuids": []})
+    data = _journaled_load(REQ_WHITELIST_FILE, {"uuids": []}, _REQ_WHITELIST_JOURNAL)
     if not isinstance(data, dict):
         data = {"uuids": []}
     uuids = data.get("uuids", [])
@@ -203,9 +772,10 @@ def load_req_whitelist() -> Dict[str, Any]:
     return data
 
 def save_req_whitelist(data: Dict[str, Any]) -> None:
-    _json_save(REQ_WHITELIST_FILE, data)
+    if _is_loaded(data):
+        _REQ_WHITELIST_JOURNAL.commit(data)
 
-REQ_WHITELIST = load_req_whitelist()
+REQ_WHITELIST = _Lazy("req_whitelist", load_req_whitelist)
 
 def is_req_whitelisted_member(m: Dict[str, Any]) -> bool:
     uuid = _normalize_uuid(str(m.get("uuid", "")))
@@ -220,6 +790,7 @@ def _req_whitelist_add_uuid(uuid: str) -> bool:
     REQ_WHITELIST.setdefault("uuids", [])
     if uuid not in REQ_WHITELIST["uuids"]:
         REQ_WHITELIST["uuids"].append(uuid)
+        _REQ_WHITELIST_JOURNAL.record("ladd", ["uuids"], uuid)
         save_req_whitelist(REQ_WHITELIST)
         return True
     return False
@@ -231,6 +802,7 @@ def _req_whitelist_remove_uuid(uuid: str) -> bool:
     uuids = REQ_WHITELIST.get("uuids", []) or []
     if uuid in uuids:
         REQ_WHITELIST["uuids"] = [u for u in uuids if u != uuid]
+        _REQ_WHITELIST_JOURNAL.record("lrem", ["uuids"], uuid)
         save_req_whitelist(REQ_WHITELIST)
         return True
     return False
@@ -238,8 +810,11 @@ def _req_whitelist_remove_uuid(uuid: str) -> bool:
 # ============================================================
 # IGN CACHE
 # ============================================================
+_IGN_JOURNAL = _Journal(CACHE_FILE, CACHE_FORMAT)
+_IGN_MISSES_JOURNAL = _Journal(IGN_MISSES_FILE, CACHE_FORMAT)
+
 def load_ign_cache() -> Dict[str, str]:
-    data = _json_load(CACHE_FILE, {})
+    data = _journaled_load(CACHE_FILE, {}, _IGN_JOURNAL)
     if not isinstance(data, dict):
         return {}
     # normalize keys to canonical uuid (no dashes)
@@ -250,34 +825,543 @@ def load_ign_cache() -> Dict[str, str]:
             out[nk] = str(v)
     return out
 
+def load_ign_misses() -> Dict[str, int]:
+    data = _journaled_load(IGN_MISSES_FILE, {}, _IGN_MISSES_JOURNAL)
+    if not isinstance(data, dict):
+        return {}
+    out: Dict[str, int] = {}
+    for k, v in data.items():
+        nk = _normalize_uuid(str(k))
+        if nk:
+            out[nk] = _safe_int(v, 0)
+    return out
+
+def _split_ign_placeholders(cache: Dict[str, str], misses: Dict[str, int]) -> None:
+    """
+    Older runs cached the uuid[:8] fallback as if it were a real name.
+    Move those into the negative cache as already-expired misses so they get retried.
+    """
+    for uuid, ign in list(cache.items()):
+        if ign == uuid[:8]:
+            cache.pop(uuid, None)
+            _IGN_JOURNAL.record("del", [uuid])
+            if uuid not in misses:
+                misses[uuid] = 0
+                _IGN_MISSES_JOURNAL.record("set", [uuid], 0)
+
 def save_ign_cache(cache: Dict[str, str]) -> None:
-    _json_save(CACHE_FILE, cache)
+    if not _is_loaded(cache):
+        return
+    evict_caches(player=False)
+    _IGN_JOURNAL.commit(cache)
+    _IGN_MISSES_JOURNAL.commit(IGN_MISSES)
+    save_last_seen()
 
-IGN_CACHE = load_ign_cache()
+def _load_ign_state() -> Dict[str, str]:
+    cache = load_ign_cache()
+    misses = IGN_MISSES.value
+    _split_ign_placeholders(cache, misses)
+    _evict_ign(cache, misses)
+    return cache
+
+IGN_CACHE = _Lazy("ign_cache", _load_ign_state)
+IGN_MISSES = _Lazy("ign_misses", load_ign_misses)
 
 # ============================================================
 # PLAYER CACHE (extracted stats)
+#   uuid -> {"req": {...}, "sb": {...}}; PLAYER_CACHE_BACKEND picks where it lives:
+#     sqlite  (default) one row per uuid, read on demand, only changed fields written back
+#     json    the old whole-file player_cache.json
+#     mmap    fixed-width binary records in player_cache.bin (no parsing at startup)
+#     memory  nothing persisted (benchmarks / tests)
 # ============================================================
-def load_player_cache() -> Dict[str, Any]:
-    data = _json_load(PLAYER_CACHE_FILE, {})
+PLAYER_CACHE_FIELDS = ("req", "sb")
+
+# req blob layout for the binary store (struct codes: i = int32, d = float64, q = int64)
+REQ_RECORD_FIELDS = (
+    ("ap", "i"), ("bw_wins", "i"), ("bw_fkdr", "d"), ("bb_score", "i"),
+    ("duels_wins", "i"), ("duels_wlr", "d"), ("sw_wins", "i"), ("sw_kdr", "d"),
+    ("tnt_wins", "i"), ("uhc_score", "i"), ("fetched_at", "q"),
+)
+_MMAP_VERSION = 1
+_INT_LIMITS = {"i": (-2 ** 31, 2 ** 31 - 1), "q": (-2 ** 63, 2 ** 63 - 1)}
+
+def _clamp_int(v: Any, fmt: str) -> int:
+    lo, hi = _INT_LIMITS[fmt]
+    return min(max(_safe_int(v, 0), lo), hi)
+
+class _PlayerCache:
+    """
+    In-memory player cache; also the base for the persistent backends.
+      - get(uuid) -> row dict or None
+      - set_field(uuid, "req"|"sb", blob) marks just that field dirty
+      - flush() persists dirty fields (no-op here), returns how many were written
+    """
+
+    def __init__(self) -> None:
+        self._rows: Dict[str, Optional[Dict[str, Any]]] = {}
+        self._dirty: Dict[str, set] = {}
+        self._lock = threading.RLock()
+
+    def _load_row(self, uuid: str) -> Optional[Dict[str, Any]]:
+        return None
+
+    def get(self, uuid: str, default: Any = None) -> Any:
+        with self._lock:
+            if uuid not in self._rows:
+                self._rows[uuid] = self._load_row(uuid)
+            row = self._rows[uuid]
+        return row if row is not None else default
+
+    def set_field(self, uuid: str, field: str, blob: Dict[str, Any]) -> None:
+        with self._lock:
+            if uuid not in self._rows:
+                self._rows[uuid] = self._load_row(uuid)
+            row = self._rows[uuid]
+            if row is None:
+                row = {}
+                self._rows[uuid] = row
+            row[field] = blob
+            self._dirty.setdefault(uuid, set()).add(field)
+
+    def __contains__(self, uuid: str) -> bool:
+        return self.get(uuid) is not None
+
+    def __len__(self) -> int:
+        with self._lock:
+            return sum(1 for v in self._rows.values() if v is not None)
+
+    def clear(self) -> None:
+        # forget the in-memory view and pending writes (persisted rows are untouched)
+        with self._lock:
+            self._rows.clear()
+            self._dirty.clear()
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            return {k: v for k, v in self._rows.items() if v is not None}
+
+    def keys(self) -> List[str]:
+        with self._lock:
+            return [k for k, v in self._rows.items() if v is not None]
+
+    def evict(self, uuids: List[str]) -> int:
+        """
+        Drop rows (and their pending writes); returns how many were present.
+        """
+        n = 0
+        with self._lock:
+            for uuid in uuids:
+                if self._rows.pop(uuid, None) is not None:
+                    n += 1
+                self._dirty.pop(uuid, None)
+        return n
+
+    def merge(self, data: Dict[str, Any]) -> int:
+        """
+        Fold a {uuid: {"req": ..., "sb": ...}} mapping in; older fields never replace newer ones.
+        """
+        n = 0
+        for k, v in (data or {}).items():
+            uuid = _normalize_uuid(str(k))
+            if not uuid or not isinstance(v, dict):
+                continue
+            current = self.get(uuid) or {}
+            for field in PLAYER_CACHE_FIELDS:
+                blob = v.get(field)
+                if not isinstance(blob, dict):
+                    continue
+                old = current.get(field) or {}
+                if _safe_int(blob.get("fetched_at", 0), 0) >= _safe_int(old.get("fetched_at", 0), 0):
+                    self.set_field(uuid, field, blob)
+                    n += 1
+        return n
+
+    def flush(self) -> int:
+        with self._lock:
+            n = sum(len(f) for f in self._dirty.values())
+            self._dirty.clear()
+        return n
+
+class _JsonPlayerCache(_PlayerCache):
+    # whole-file backend: snapshot + journal loaded at startup, saves append only the dirty fields
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = path
+        self.journal = _Journal(path, CACHE_FORMAT)
+        data = _journaled_load(path, {}, self.journal)
+        if isinstance(data, dict):
+            for k, v in data.items():
+                nk = _normalize_uuid(str(k))
+                if nk and isinstance(v, dict):
+                    self._rows[nk] = v
+
+    def flush(self) -> int:
+        with self._lock:
+            if not self._dirty:
+                return 0
+            n = 0
+            for uuid, fields in self._dirty.items():
+                row = self._rows.get(uuid) or {}
+                for field in fields:
+                    self.journal.record("set", [uuid, field], row.get(field))
+                    n += 1
+            self._dirty.clear()
+            self.journal.commit(self.to_dict())
+        return n
+
+    def evict(self, uuids: List[str]) -> int:
+        with self._lock:
+            n = super().evict(uuids)
+            if n:
+                for uuid in uuids:
+                    self.journal.record("del", [uuid])
+                self.journal.commit(self.to_dict())
+        return n
+
+class _SqlitePlayerCache(_PlayerCache):
+    """
+    One row per uuid, fetched by primary key on first use.
+      - WAL + busy timeout so a cron run and an interactive session can share the file
+      - flush() upserts only dirty fields, in one transaction, and never replaces
+        a field another process fetched more recently
+      - the first open imports player_cache.json (once)
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS player_cache (
+            uuid TEXT PRIMARY KEY,
+            req TEXT,
+            req_fetched_at INTEGER NOT NULL DEFAULT 0,
+            sb TEXT,
+            sb_fetched_at INTEGER NOT NULL DEFAULT 0,
+            updated_at INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT);
+    """
+
+    def __init__(self, path: str, import_json: Optional[str] = None):
+        super().__init__()
+        self.path = path
+        self._db = sqlite3.connect(path, timeout=30, check_same_thread=False, isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(self.SCHEMA)
+        if import_json:
+            self._import_json_once(import_json)
+
+    def _import_json_once(self, json_path: str) -> None:
+        done = self._db.execute("SELECT value FROM meta WHERE key = 'imported_json'").fetchone()
+        if done or not os.path.exists(json_path):
+            return
+        data = _json_load(json_path, {})
+        if isinstance(data, dict) and data:
+            n = self.merge(data)
+            self.flush()
+            print(f"{DIM}{GRAY}Imported {n} cached player fields from {os.path.basename(json_path)} into {os.path.basename(self.path)}{RESET}")
+        self._db.execute("INSERT OR REPLACE INTO meta(key, value) VALUES('imported_json', ?)", (str(_now_ts()),))
+
+    def _load_row(self, uuid: str) -> Optional[Dict[str, Any]]:
+        # caller holds the lock
+        r = self._db.execute("SELECT req, sb FROM player_cache WHERE uuid = ?", (uuid,)).fetchone()
+        if r is None:
+            return None
+        row: Dict[str, Any] = {}
+        for field, raw in zip(PLAYER_CACHE_FIELDS, r):
+            if raw:
+                try:
+                    row[field] = json.loads(raw)
+                except Exception:
+                    pass
+        return row or None
+
+    def flush(self) -> int:
+        with self._lock:
+            if not self._dirty:
+                return 0
+            now = _now_ts()
+            batches: Dict[str, List[Tuple[Any, ...]]] = {f: [] for f in PLAYER_CACHE_FIELDS}
+            for uuid, fields in self._dirty.items():
+                row = self._rows.get(uuid) or {}
+                for field in fields:
+                    blob = row.get(field)
+                    if isinstance(blob, dict):
+                        fetched_at = _safe_int(blob.get("fetched_at", 0), 0)
+                        batches[field].append((uuid, json.dumps(blob, separators=(",", ":")), fetched_at, now))
+
+            n = 0
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                for field, rows in batches.items():
+                    if not rows:
+                        continue
+                    # field names come from PLAYER_CACHE_FIELDS, never from input
+                    self._db.executemany(
+                        f"INSERT INTO player_cache(uuid, {field}, {field}_fetched_at, updated_at) VALUES(?, ?, ?, ?) "
+                        f"ON CONFLICT(uuid) DO UPDATE SET {field} = excluded.{field}, "
+                        f"{field}_fetched_at = excluded.{field}_fetched_at, updated_at = excluded.updated_at "
+                        f"WHERE excluded.{field}_fetched_at >= player_cache.{field}_fetched_at",
+                        rows,
+                    )
+                    n += len(rows)
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+            self._dirty.clear()
+        return n
+
+    def to_dict(self) -> Dict[str, Any]:
+        # everything in the file plus anything not flushed yet
+        with self._lock:
+            out: Dict[str, Any] = {}
+            for uuid, req, sb in self._db.execute("SELECT uuid, req, sb FROM player_cache ORDER BY uuid"):
+                row: Dict[str, Any] = {}
+                if req:
+                    row["req"] = json.loads(req)
+                if sb:
+                    row["sb"] = json.loads(sb)
+                out[uuid] = row
+            for uuid, row in self._rows.items():
+                if row is not None:
+                    out[uuid] = row
+            return out
+
+    def __len__(self) -> int:
+        with self._lock:
+            return int(self._db.execute("SELECT COUNT(*) FROM player_cache").fetchone()[0])
+
+    def keys(self) -> List[str]:
+        with self._lock:
+            out = {r[0] for r in self._db.execute("SELECT uuid FROM player_cache")}
+            out.update(k for k, v in self._rows.items() if v is not None)
+            return sorted(out)
+
+    def evict(self, uuids: List[str]) -> int:
+        with self._lock:
+            super().evict(uuids)
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                n = self._db.executemany("DELETE FROM player_cache WHERE uuid = ?", [(u,) for u in uuids]).rowcount
+                self._db.execute("COMMIT")
+            except Exception:
+                self._db.execute("ROLLBACK")
+                raise
+        return max(int(n), 0)
+
+class _MmapPlayerCache(_PlayerCache):
+    """
+    Fixed-width binary records in a memory-mapped file (player_cache.bin).
+      - header: magic, version, record size, record count
+      - record: uuid (16 raw bytes), presence flags, the ten req stats + fetched_at,
+        SkyBlock level + fetched_at
+      - the uuid -> slot index is rebuilt at open by reading only the uuid column;
+        rows are decoded on demand, so memory stays at one small index entry per player
+      - set_field() writes the record in place; flush() msyncs
+    Single writer: a cron job and an interactive session should share the sqlite backend instead.
+    New req fields need REQ_RECORD_FIELDS + _MMAP_VERSION bumped (old files are then re-imported).
+    """
+
+    _MAGIC = b"GXPS"
+    _HEADER = struct.Struct("<4sHHI4x")   # magic, version, record size, count
+    _RECORD = struct.Struct("<16sB" + "".join(fmt for _, fmt in REQ_RECORD_FIELDS) + "iq")
+    _HAS_REQ = 1
+    _HAS_SB = 2
+
+    def __init__(self, path: str, import_json: Optional[str] = None):
+        super().__init__()
+        self.path = path
+        self._index: Dict[str, int] = {}
+        fresh = not self._open()
+        if fresh and import_json and os.path.exists(import_json):
+            data = _json_load(import_json, {})
+            if isinstance(data, dict) and data:
+                n = self.merge(data)
+                self.flush()
+                print(f"{DIM}{GRAY}Imported {n} cached player fields from {os.path.basename(import_json)} into {os.path.basename(path)}{RESET}")
+
+    def _open(self) -> bool:
+        # returns False when a new (empty) file had to be created
+        existing = False
+        if os.path.exists(self.path) and os.path.getsize(self.path) >= self._HEADER.size:
+            with open(self.path, "rb") as f:
+                magic, version, rec_size, _ = self._HEADER.unpack(f.read(self._HEADER.size))
+            existing = magic == self._MAGIC and version == _MMAP_VERSION and rec_size == self._RECORD.size
+            if not existing:
+                print(f"{YELLOW}{os.path.basename(self.path)} has an old or unknown layout; starting a new one.{RESET}")
+
+        if not existing:
+            with open(self.path, "wb") as f:
+                f.write(self._HEADER.pack(self._MAGIC, _MMAP_VERSION, self._RECORD.size, 0))
+                f.truncate(self._HEADER.size + 64 * self._RECORD.size)
+
+        self._file = open(self.path, "r+b")
+        self._mm = mmap.mmap(self._file.fileno(), 0)
+        self._count = self._HEADER.unpack_from(self._mm, 0)[3]
+        # uuid column only: one unpack pass over the used records
+        uuid_col = struct.Struct(f"<16s{self._RECORD.size - 16}x")
+        used = self._mm[self._HEADER.size:self._HEADER.size + self._count * self._RECORD.size]
+        self._index = {raw.hex(): slot for slot, (raw,) in enumerate(uuid_col.iter_unpack(used))}
+        return existing
+
+    def _capacity(self) -> int:
+        return (len(self._mm) - self._HEADER.size) // self._RECORD.size
+
+    def _grow(self) -> None:
+        # caller holds the lock; double the file and re-map
+        new_size = self._HEADER.size + max(self._capacity() * 2, 64) * self._RECORD.size
+        self._mm.flush()
+        self._mm.close()
+        self._file.truncate(new_size)
+        self._mm = mmap.mmap(self._file.fileno(), 0)
+
+    def _decode(self, slot: int) -> Optional[Dict[str, Any]]:
+        vals = self._RECORD.unpack_from(self._mm, self._HEADER.size + slot * self._RECORD.size)
+        flags = vals[1]
+        row: Dict[str, Any] = {}
+        if flags & self._HAS_REQ:
+            row["req"] = {name: v for (name, _), v in zip(REQ_RECORD_FIELDS, vals[2:2 + len(REQ_RECORD_FIELDS)])}
+        if flags & self._HAS_SB:
+            row["sb"] = {"level": vals[-2], "fetched_at": vals[-1]}
+        return row or None
+
+    def get(self, uuid: str, default: Any = None) -> Any:
+        with self._lock:
+            slot = self._index.get(uuid)
+            row = self._decode(slot) if slot is not None else None
+        return row if row is not None else default
+
+    def set_field(self, uuid: str, field: str, blob: Dict[str, Any]) -> None:
+        if len(uuid) != 32:
+            return  # the record stores raw 16-byte UUIDs
+        with self._lock:
+            slot = self._index.get(uuid)
+            if slot is None:
+                if self._count >= self._capacity():
+                    self._grow()
+                slot = self._count
+                self._count += 1
+                self._index[uuid] = slot
+                vals: List[Any] = [bytes.fromhex(uuid), 0] + [0] * len(REQ_RECORD_FIELDS) + [0, 0]
+            else:
+                vals = list(self._RECORD.unpack_from(self._mm, self._HEADER.size + slot * self._RECORD.size))
+
+            if field == "req":
+                vals[1] |= self._HAS_REQ
+                for i, (name, fmt) in enumerate(REQ_RECORD_FIELDS):
+                    v = blob.get(name, 0)
+                    vals[2 + i] = _safe_float(v) if fmt == "d" else _clamp_int(v, fmt)
+            elif field == "sb":
+                vals[1] |= self._HAS_SB
+                vals[-2] = _clamp_int(blob.get("level", 0), "i")
+                vals[-1] = _clamp_int(blob.get("fetched_at", 0), "q")
+            else:
+                return
+
+            self._RECORD.pack_into(self._mm, self._HEADER.size + slot * self._RECORD.size, *vals)
+            self._HEADER.pack_into(self._mm, 0, self._MAGIC, _MMAP_VERSION, self._RECORD.size, self._count)
+            self._dirty.setdefault(uuid, set()).add(field)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._count
+
+    def clear(self) -> None:
+        with self._lock:
+            self._dirty.clear()
+
+    def keys(self) -> List[str]:
+        with self._lock:
+            return list(self._index)
+
+    def evict(self, uuids: List[str]) -> int:
+        # swap-remove: the last record moves into the freed slot, so the file stays dense
+        n = 0
+        size = self._RECORD.size
+        with self._lock:
+            for uuid in uuids:
+                slot = self._index.pop(uuid, None)
+                self._dirty.pop(uuid, None)
+                if slot is None:
+                    continue
+                last = self._count - 1
+                if slot != last:
+                    src = self._HEADER.size + last * size
+                    self._mm[self._HEADER.size + slot * size:self._HEADER.size + (slot + 1) * size] = self._mm[src:src + size]
+                    self._index[self._mm[src:src + 16].hex()] = slot
+                end = self._HEADER.size + last * size
+                self._mm[end:end + size] = bytes(size)
+                self._count = last
+                n += 1
+            if n:
+                self._HEADER.pack_into(self._mm, 0, self._MAGIC, _MMAP_VERSION, self._RECORD.size, self._count)
+                self._mm.flush()
+        return n
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            out: Dict[str, Any] = {}
+            for uuid, slot in self._index.items():
+                row = self._decode(slot)
+                if row is not None:
+                    out[uuid] = row
+            return out
+
+    def flush(self) -> int:
+        with self._lock:
+            n = sum(len(f) for f in self._dirty.values())
+            if n:
+                self._mm.flush()
+            self._dirty.clear()
+        return n
+
+def load_player_cache() -> _PlayerCache:
+    backend = PLAYER_CACHE_BACKEND
+    if backend == "memory":
+        return _PlayerCache()
+    if backend == "json":
+        return _JsonPlayerCache(PLAYER_CACHE_FILE)
+    if backend == "mmap":
+        return _MmapPlayerCache(PLAYER_CACHE_BIN_FILE, import_json=PLAYER_CACHE_FILE)
+    try:
+        return _SqlitePlayerCache(PLAYER_CACHE_DB_FILE, import_json=PLAYER_CACHE_FILE)
+    except sqlite3.Error as e:
+        print(f"{YELLOW}SQLite player cache unavailable ({e}); falling back to {os.path.basename(PLAYER_CACHE_FILE)}.{RESET}")
+        return _JsonPlayerCache(PLAYER_CACHE_FILE)
+
+def save_player_cache(cache: _PlayerCache) -> None:
+    if not _is_loaded(cache):
+        return
+    if cache is PLAYER_CACHE:
+        evict_caches(ign=False)
+        save_last_seen()
+    cache.flush()
+
+def export_player_cache_json(cache: _PlayerCache, path: str) -> int:
+    data = cache.to_dict()
+    _json_save(path, data)
+    return len(data)
+
+def import_player_cache_json(cache: _PlayerCache, path: str) -> int:
+    data = _json_load(path, {})
     if not isinstance(data, dict):
-        return {}
-    # normalize keys to canonical uuid (no dashes)
-    out: Dict[str, Any] = {}
-    for k, v in data.items():
-        nk = _normalize_uuid(str(k))
-        if nk:
-            out[nk] = v
-    return out
+        return 0
+    n = cache.merge(data)
+    cache.flush()
+    return n
 
-def save_player_cache(cache: Dict[str, Any]) -> None:
-    _json_save(PLAYER_CACHE_FILE, cache)
+def _load_player_state() -> _PlayerCache:
+    cache = load_player_cache()
+    _evict_player(cache)
+    return cache
 
-PLAYER_CACHE = load_player_cache()
+PLAYER_CACHE = _Lazy("player_cache", _load_player_state)
 
 # ============================================================
 # PSEUDO REQUIREMENTS (manual)
 # ============================================================
+_PSEUDO_JOURNAL = _Journal(PSEUDO_REQS_FILE, snapshot_only=True)
+
 def load_pseudo_reqs() -> Dict[str, Any]:
     # ✅ migrate old filename -> new filename (so you don’t lose existing roles)
     if not os.path.exists(PSEUDO_REQS_FILE) and os.path.exists(PSEUDO_REQS_FILE_OLD):
@@ -295,7 +1379,7 @@ def load_pseudo_reqs() -> Dict[str, Any]:
         except Exception:
             pass
 
-    data = _json_load(PSEUDO_REQS_FILE, {"defs": {}, "members": {}})
+    data = _journaled_load(PSEUDO_REQS_FILE, {"defs": {}, "members": {}}, _PSEUDO_JOURNAL)
     if not isinstance(data, dict):
         return {"defs": {}, "members": {}}
     data.setdefault("defs", {})
@@ -315,6 +1399,9 @@ def load_pseudo_reqs() -> Dict[str, Any]:
     return data
 
 def save_pseudo_reqs(data: Dict[str, Any]) -> None:
+    if not _is_loaded(data):
+        return
+    data = _unwrap(data)
     # ensure normalized UUID keys
     if isinstance(data, dict) and isinstance(data.get("members"), dict):
         norm_members: Dict[str, Any] = {}
@@ -323,9 +1410,9 @@ def save_pseudo_reqs(data: Dict[str, Any]) -> None:
             if nk:
                 norm_members[nk] = v
         data["members"] = norm_members
-    _json_save(PSEUDO_REQS_FILE, data)
+    _PSEUDO_JOURNAL.commit(data)
 
-PSEUDO_REQS = load_pseudo_reqs()
+PSEUDO_REQS = _Lazy("pseudo_reqs", load_pseudo_reqs)
 
 def _normalize_code(code: str) -> str:
     return "".join(ch for ch in code.strip().upper() if ch.isalnum() or ch in ("_", "-"))[:12]
@@ -356,6 +1443,7 @@ def set_member_pseudo_codes(uuid: str, codes: List[str]) -> None:
         return
     PSEUDO_REQS.setdefault("members", {})
     PSEUDO_REQS["members"][uuid] = codes
+    _PSEUDO_JOURNAL.record("set", ["members", uuid], codes)
     save_pseudo_reqs(PSEUDO_REQS)
 
 def add_or_update_pseudo_def(code: str, short: str, desc: str) -> str:
@@ -367,6 +1455,7 @@ def add_or_update_pseudo_def(code: str, short: str, desc: str) -> str:
         "short": str(short).strip()[:24],
         "desc": str(desc).strip()[:80],
     }
+    _PSEUDO_JOURNAL.record("set", ["defs", code], PSEUDO_REQS["defs"][code])
     save_pseudo_reqs(PSEUDO_REQS)
     return code
 
@@ -376,161 +1465,1136 @@ def delete_pseudo_def(code: str) -> None:
         return
     PSEUDO_REQS.setdefault("defs", {})
     PSEUDO_REQS["defs"].pop(code, None)
+    _PSEUDO_JOURNAL.record("del", ["defs", code])
     members = PSEUDO_REQS.get("members", {})
     for uuid, codes in list(members.items()):
         if isinstance(codes, list):
             new_codes = [c for c in codes if _normalize_code(str(c)) != code]
+            if new_codes != codes:
+                _PSEUDO_JOURNAL.record("set", ["members", uuid], new_codes)
             members[uuid] = new_codes
     save_pseudo_reqs(PSEUDO_REQS)
 
-def _pseudo_priority_bonus_for_codes(codes: List[str]) -> int:
+def _pseudo_priority_bonus_for_codes(codes: List[str], rules: Optional["KickRules"] = None) -> int:
     """
-    Sums any configured bonuses for pseudo codes.
-    ✅ Guarantees LB always contributes +10 if present.
+    Sums the kick_rules.json bonuses for pseudo codes.
+    ✅ pseudo_min_bonuses floors still apply (LB always contributes at least +10 by default).
     """
+    rules = rules or kick_rules()
     norm = [_normalize_code(str(c)) for c in (codes or [])]
-    norm = [c for c in norm if c]
-
-    total = 0
-    for cc in norm:
-        total += int(PSEUDO_PRIORITY_BONUSES.get(cc, 0))
+    return int(sum(rules.pseudo_bonus(cc) for cc in norm if cc))
 
-    if "LB" in norm:
-        configured = int(PSEUDO_PRIORITY_BONUSES.get("LB", 0))
-        guaranteed = max(configured, 10)
-        if configured < guaranteed:
-            total += (guaranteed - configured)
-
-    return int(total)
-
-def _pseudo_bonus_detail(codes: List[str]) -> str:
+def _pseudo_bonus_detail(codes: List[str], rules: Optional["KickRules"] = None) -> str:
+    rules = rules or kick_rules()
     parts = []
     norm = [_normalize_code(str(c)) for c in (codes or [])]
     norm = [c for c in norm if c]
 
     for cc in norm:
-        bonus = int(PSEUDO_PRIORITY_BONUSES.get(cc, 0))
-        if cc == "LB":
-            bonus = max(bonus, 10)
+        bonus = rules.pseudo_bonus(cc)
         if bonus:
             parts.append(f"{cc} +{bonus}")
     return ", ".join(parts)
 
 # ============================================================
-# HTTP SESSIONS + SOFT THROTTLE
+# CACHE EVICTION (CACHE_EVICT=1)
+#   LRU by last guild appearance, applied when a cache is first loaded and on every save;
+#   uuids on either whitelist, with pseudo codes, or seen this run are never evicted.
+#   Load-time eviction only touches memory: last-seen stamps hit disk with the IGN / player cache saves.
 # ============================================================
-mojang_session = requests.Session()
-mojang_session.verify = True
-mojang_session.headers.update({"User-Agent": "Mozilla/5.0"})
+_LAST_SEEN_JOURNAL = _Journal(LAST_SEEN_FILE, CACHE_FORMAT)
+_LAST_SEEN_RESOLUTION_S = 3600  # don't journal a member again within the hour
+_SEEN_THIS_RUN: set = set()
 
-hypixel_session = requests.Session()
-hypixel_session.verify = True
-hypixel_session.headers.update({"User-Agent": "Mozilla/5.0"})
+def load_last_seen() -> Dict[str, int]:
+    data = _journaled_load(LAST_SEEN_FILE, {}, _LAST_SEEN_JOURNAL)
+    if not isinstance(data, dict):
+        return {}
+    out: Dict[str, int] = {}
+    for k, v in data.items():
+        nk = _normalize_uuid(str(k))
+        if nk:
+            out[nk] = _safe_int(v, 0)
+    return out
 
-_LAST_HYPIXEL_CALL_AT = 0.0
-_LAST_MOJANG_CALL_AT = 0.0
+LAST_SEEN = _Lazy("last_seen", load_last_seen)
 
-def _throttle_hypixel(min_interval: float = HYPIXEL_MIN_INTERVAL_S) -> None:
-    global _LAST_HYPIXEL_CALL_AT
-    now = time.time()
-    wait = (_LAST_HYPIXEL_CALL_AT + float(min_interval)) - now
-    if wait > 0:
-        time.sleep(wait)
-    _LAST_HYPIXEL_CALL_AT = time.time()
+def save_last_seen() -> None:
+    if _is_loaded(LAST_SEEN):
+        _LAST_SEEN_JOURNAL.commit(LAST_SEEN)
 
-def _throttle_mojang(min_interval: float = MOJANG_MIN_INTERVAL_S) -> None:
-    global _LAST_MOJANG_CALL_AT
-    now = time.time()
-    wait = (_LAST_MOJANG_CALL_AT + float(min_interval)) - now
-    if wait > 0:
-        time.sleep(wait)
-    _LAST_MOJANG_CALL_AT = time.time()
+def _stamp_last_seen(uuid: str, now: int) -> None:
+    if now - LAST_SEEN.get(uuid, 0) >= _LAST_SEEN_RESOLUTION_S:
+        LAST_SEEN[uuid] = now
+        _LAST_SEEN_JOURNAL.record("set", [uuid], now)
 
-# ============================================================
-# API HELPERS
-# ============================================================
-# ============================================================
-# API HELPERS (Hypixel wrapper w/ 429 backoff)
-# ============================================================
+def touch_last_seen(uuids: List[str]) -> None:
+    now = _now_ts()
+    for u in uuids:
+        u = _normalize_uuid(u)
+        if u:
+            _SEEN_THIS_RUN.add(u)
+            _stamp_last_seen(u, now)
+
+def _eviction_protected() -> set:
+    keep = set(KICK_WHITELIST.get("uuids", []) or [])
+    keep.update(REQ_WHITELIST.get("uuids", []) or [])
+    keep.update(u for u, codes in (PSEUDO_REQS.get("members") or {}).items() if codes)
+    keep.update(_SEEN_THIS_RUN)
+    return keep
+
+def _eviction_victims(keys: List[str], protected: set, now: int) -> List[str]:
+    """
+    Keys past CACHE_MAX_AGE_DAYS since last seen, then the least recently seen over CACHE_MAX_ENTRIES.
+    Keys never seen before (caches older than this tracking) are stamped now and get a full age window.
+    """
+    cutoff = now - CACHE_MAX_AGE_DAYS * 86400
+    victims: List[str] = []
+    live: List[Tuple[int, str]] = []
+    for k in keys:
+        if k in protected:
+            continue
+        seen = LAST_SEEN.get(k)
+        if seen is None:
+            _stamp_last_seen(k, now)
+            seen = now
+        if CACHE_MAX_AGE_DAYS > 0 and seen < cutoff:
+            victims.append(k)
+        else:
+            live.append((seen, k))
 
-def _retry_after_seconds(resp: requests.Response) -> float:
+    over = len(keys) - len(victims) - CACHE_MAX_ENTRIES
+    if CACHE_MAX_ENTRIES > 0 and over > 0:
+        live.sort()
+        victims.extend(k for _, k in live[:over])
+    return victims
+
+def _evict_ign(cache: Dict[str, str], misses: Dict[str, int]) -> Dict[str, int]:
+    if not CACHE_EVICT:
+        return {}
+    now = _now_ts()
+    protected = _eviction_protected()
+    out: Dict[str, int] = {}
+    for key, store, journal in (("ign", cache, _IGN_JOURNAL), ("ign_misses", misses, _IGN_MISSES_JOURNAL)):
+        victims = _eviction_victims(list(store), protected, now)
+        for u in victims:
+            store.pop(u, None)
+            journal.record("del", [u])
+        out[key] = len(victims)
+    _report_eviction(out)
+    return out
+
+def _evict_player(cache: _PlayerCache) -> Dict[str, int]:
+    if not CACHE_EVICT:
+        return {}
+    out = {"player": cache.evict(_eviction_victims(cache.keys(), _eviction_protected(), _now_ts()))}
+    _report_eviction(out)
+    return out
+
+def _report_eviction(out: Dict[str, int]) -> None:
+    # forget last-seen stamps nobody needs any more
+    if CACHE_MAX_AGE_DAYS > 0:
+        cutoff = _now_ts() - CACHE_MAX_AGE_DAYS * 86400
+        protected = _eviction_protected()
+        for u in [u for u, t in LAST_SEEN.items() if t < cutoff and u not in protected]:
+            LAST_SEEN.pop(u, None)
+            _LAST_SEEN_JOURNAL.record("del", [u])
+
+    if any(out.values()):
+        parts = ", ".join(f"{n} {k.replace('_', '-')}" for k, n in out.items() if n)
+        print(f"{DIM}{GRAY}Cache eviction: {parts} entries (unseen > {CACHE_MAX_AGE_DAYS:g}d or over {CACHE_MAX_ENTRIES}){RESET}")
+
+def evict_caches(player: bool = True, ign: bool = True) -> Dict[str, int]:
     """
-    Best-effort: respect Retry-After if present, else fall back to 1s.
+    Save-time eviction; only for caches that were actually loaded this run.
     """
-    ra = resp.headers.get("Retry-After")
-    if ra:
-        try:
-            return max(float(ra), 0.5)
-        except Exception:
-            pass
-    return 1.0
+    out: Dict[str, int] = {}
+    if ign and _is_loaded(IGN_CACHE):
+        out.update(_evict_ign(_unwrap(IGN_CACHE), _unwrap(IGN_MISSES)))
+    if player and _is_loaded(PLAYER_CACHE):
+        out.update(_evict_player(_unwrap(PLAYER_CACHE)))
+    return out
 
-def _hypixel_get(path: str, params: Dict[str, Any], timeout: int = 15, max_attempts: int = 6) -> Dict[str, Any]:
+def migrate_cache_files() -> List[str]:
     """
-    Centralized Hypixel GET with:
-      - soft throttle between requests
-      - 429 handling (Retry-After if provided)
-      - exponential backoff on transient errors
+    Rewrite every machine-only snapshot cache in CACHE_FORMAT now, folding its journal in
+    (otherwise each file migrates on its next save). Whitelists and pseudo codes stay JSON;
+    SQLite / mmap player caches are left alone.
     """
-    url = f"{BASE_URL}{path}"
-    params = dict(params or {})
-    params["key"] = API_KEY
+    pairs: List[Tuple[_Journal, Any]] = [
+        (_IGN_JOURNAL, IGN_CACHE),
+        (_IGN_MISSES_JOURNAL, IGN_MISSES),
+        (_LAST_SEEN_JOURNAL, LAST_SEEN),
+    ]
+    cache = _unwrap(PLAYER_CACHE)
+    if isinstance(cache, _JsonPlayerCache):
+        pairs.append((cache.journal, cache.to_dict()))
 
-    backoff = 1.0
-    last_exc: Optional[Exception] = None
+    done: List[str] = []
+    for journal, data in pairs:
+        if not os.path.exists(journal.snapshot_path) and not os.path.exists(journal.path):
+            continue
+        journal.rewrite = True
+        journal.commit(data)
+        journal.wait()
+        done.append(os.path.basename(journal.snapshot_path))
+    return done
 
-    for attempt in range(1, max_attempts + 1):
-        try:
-            _throttle_hypixel()
+# ============================================================
+# PROFILING (opt-in: GEXP_PROFILE=1 or --profile)
+# ============================================================
+PROFILE_STAGES = ("guild", "igns", "reqs", "scoring", "render", "save")
 
-            r = hypixel_session.get(url, params=params, timeout=timeout)
+class _TimedStream:
+    # stdout proxy that adds up time spent writing to the terminal
+    def __init__(self, stream: Any, profiler: "_Profiler"):
+        self._stream = stream
+        self._profiler = profiler
 
-            # 429: Too Many Requests
-            if r.status_code == 429:
-                wait = _retry_after_seconds(r)
-                # add gentle exponential growth so repeated 429s back off harder
-                wait = max(wait, backoff)
-                print(f"{YELLOW}{DIM}Hypixel 429 (rate limited). Waiting {wait:.1f}s then retrying...{RESET}")
-                time.sleep(wait)
-                backoff = min(backoff * 1.8, 30.0)
-                continue
+    def write(self, s: str) -> int:
+        t0 = time.perf_counter()
+        try:
+            return self._stream.write(s)
+        finally:
+            self._profiler.add("output_s", time.perf_counter() - t0)
 
-            # other 5xx / transient issues: backoff retry
-            if 500 <= r.status_code <= 599:
-                print(f"{YELLOW}{DIM}Hypixel {r.status_code}. Retrying in {backoff:.1f}s...{RESET}")
-                time.sleep(backoff)
-                backoff = min(backoff * 1.8, 30.0)
-                continue
+    def flush(self) -> None:
+        t0 = time.perf_counter()
+        try:
+            self._stream.flush()
+        finally:
+            self._profiler.add("output_s", time.perf_counter() - t0)
 
-            r.raise_for_status()
-            return (r.json() or {})
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._stream, name)
 
-        except requests.RequestException as e:
-            last_exc = e
-            # network hiccup, timeout, etc.
-            print(f"{YELLOW}{DIM}Hypixel request error ({attempt}/{max_attempts}). Retrying in {backoff:.1f}s...{RESET}")
-            time.sleep(backoff)
-            backoff = min(backoff * 1.8, 30.0)
+class _Profiler:
+    """
+    Per-stage timers for one session, printed at exit.
+      - stage(name): wall + CPU time and call count (CPU is process-wide, so worker threads count)
+      - add(counter, amount): causes that cut across stages (throttle sleeps, retries, JSON, output)
+      - capture "stage:cprofile" / "stage:tracemalloc" for a closer look at one stage
+        (cProfile only sees the calling thread: the async engine runs there, the thread pool does not)
+    Disabled, stage() is a no-op context and add() returns immediately.
+    """
 
-    # If we got here, give a clean error
-    raise RuntimeError(f"Hypixel request failed after {max_attempts} attempts. Last error: {last_exc}")
+    def __init__(self) -> None:
+        self.enabled = False
+        self.capture_stage = ""
+        self.capture_mode = ""
+        self.stages: Dict[str, List[float]] = {}  # name -> [calls, wall_s, cpu_s]
+        self.counters: Dict[str, float] = {}
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+        self._depth: Dict[str, int] = {}
+        self._cprofile: Any = None
+        self._tm_before: Any = None
+        self._tm_growth = 0
+        self._tm_top: List[Any] = []
+        self._tm_started = False
+
+    def configure(self, enabled: bool, capture: str = "") -> None:
+        if not enabled:
+            return
+        stage, _, mode = (capture or "").strip().lower().partition(":")
+        if stage and stage not in PROFILE_STAGES:
+            print(f"{YELLOW}Unknown profile stage '{stage}' (expected one of: {', '.join(PROFILE_STAGES)}).{RESET}")
+        elif stage:
+            self.capture_stage = stage
+            self.capture_mode = mode if mode in ("cprofile", "tracemalloc") else "cprofile"
+        if self.enabled:
+            return
+        self.enabled = True
+        self.started = time.perf_counter()
+        sys.stdout = _TimedStream(sys.stdout, self)
+        atexit.register(self.report)
 
-# small TTL cache to avoid hammering /guild if user flips menus quickly
-_GUILD_CACHE: Dict[str, Any] = {"name": "", "fetched_at": 0, "guild": None}
-GUILD_CACHE_TTL_S = float(os.getenv("GUILD_CACHE_TTL_S", "10"))
+    def add(self, counter: str, amount: float = 1.0) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[counter] = self.counters.get(counter, 0.0) + amount
 
-def get_guild_by_name(guild_name: str) -> Dict[str, Any]:
-    guild_name = (guild_name or "").strip()
-    now = time.time()
+    @contextlib.contextmanager
+    def stage(self, name: str):
+        if not self.enabled:
+            yield
+            return
 
-    if (
-        _GUILD_CACHE.get("guild")
-        and _GUILD_CACHE.get("name") == guild_name
-        and (now - float(_GUILD_CACHE.get("fetched_at", 0))) < GUILD_CACHE_TTL_S
-    ):
-        return _GUILD_CACHE["guild"]
+        outermost = self._depth.get(name, 0) == 0
+        self._depth[name] = self._depth.get(name, 0) + 1
+        capturing = outermost and name == self.capture_stage
+        if capturing:
+            self._capture_start()
+        wall0 = time.perf_counter()
+        cpu0 = time.process_time()
+        try:
+            yield
+        finally:
+            wall = time.perf_counter() - wall0
+            cpu = time.process_time() - cpu0
+            if capturing:
+                self._capture_stop()
+            self._depth[name] -= 1
+            if outermost:
+                with self._lock:
+                    row = self.stages.setdefault(name, [0, 0.0, 0.0])
+                    row[0] += 1
+                    row[1] += wall
+                    row[2] += cpu
+
+    def _capture_start(self) -> None:
+        if self.capture_mode == "tracemalloc":
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._tm_started = True
+            self._tm_before = tracemalloc.take_snapshot()
+        else:
+            if self._cprofile is None:
+                self._cprofile = cProfile.Profile()
+            self._cprofile.enable()
+
+    def _capture_stop(self) -> None:
+        if self.capture_mode == "tracemalloc":
+            diffs = tracemalloc.take_snapshot().compare_to(self._tm_before, "lineno")
+            growth = sum(d.size_diff for d in diffs)
+            # keep the call that allocated the most (later calls are often cache hits)
+            if growth >= self._tm_growth:
+                self._tm_growth = growth
+                self._tm_top = diffs[:12]
+            self._tm_before = None
+            if self._tm_started:
+                tracemalloc.stop()
+                self._tm_started = False
+        else:
+            self._cprofile.disable()
 
-    data = _hypixel_get("/guild", params={"name": guild_name}, timeout=15, max_attempts=6)
+    def report(self) -> None:
+        if not self.enabled or not (self.stages or self.counters):
+            return
+        total = max(time.perf_counter() - self.started, 1e-9)
+        out = sys.__stdout__ or sys.stdout
+        c = self.counters
+
+        lines = [f"{BOLD}PROFILE{RESET} {DIM}{GRAY}(session {total:.2f}s, menus and prompts included){RESET}"]
+        lines.append(f"  {'stage':<8} {'calls':>6} {'wall s':>9} {'cpu s':>9} {'% session':>10}")
+        for name in PROFILE_STAGES:
+            row = self.stages.get(name)
+            if not row:
+                continue
+            calls, wall, cpu = row
+            lines.append(f"  {name:<8} {int(calls):>6} {wall:>9.3f} {cpu:>9.3f} {wall / total * 100:>9.1f}%")
+        lines.append(
+            f"  throttle sleep {c.get('throttle_sleep_s', 0.0):.2f}s"
+            f" | retries {int(c.get('retries', 0))} (429s {int(c.get('http_429', 0))}, backoff {c.get('backoff_sleep_s', 0.0):.2f}s)"
+            f" | JSON parse {c.get('json_parse_s', 0.0):.2f}s"
+            f" | terminal output {c.get('output_s', 0.0):.2f}s"
+        )
+        lines.append(f"  {DIM}{GRAY}sleep/parse totals are summed over concurrent workers and can exceed wall time{RESET}")
+        lines.append(f"  startup: {_STARTUP.summary()}")
+
+        if self._cprofile is not None:
+            prof_path = _p(f"profile_{self.capture_stage}.prof")
+            _ensure_data_dir(prof_path)
+            self._cprofile.dump_stats(prof_path)
+            buf = io.StringIO()
+            pstats.Stats(self._cprofile, stream=buf).sort_stats("cumulative").print_stats(15)
+            lines.append(f"  cProfile of '{self.capture_stage}' (top 15 by cumulative time, full dump: {prof_path}):")
+            lines.extend("    " + ln for ln in buf.getvalue().strip().splitlines() if ln.strip())
+        if self._tm_top:
+            lines.append(f"  tracemalloc growth during '{self.capture_stage}' (heaviest call, top lines):")
+            lines.extend(f"    {stat}" for stat in self._tm_top)
+
+        out.write("\n".join(lines) + "\n")
+        out.flush()
+
+_PROFILER = _Profiler()
+def _json_body(r: Any) -> Any:
+    # r.json() with the parse time booked to the profiler
+    if not _PROFILER.enabled:
+        return r.json()
+    t0 = time.perf_counter()
+    try:
+        return r.json()
+    finally:
+        _PROFILER.add("json_parse_s", time.perf_counter() - t0)
+
+def _note_retry(label: str, backoff_s: float = 0.0, status: int = 0) -> None:
+    _METRICS.retry(label)
+    _PROFILER.add("retries")
+    if status == 429:
+        _PROFILER.add("http_429")
+    if backoff_s > 0:
+        _PROFILER.add("backoff_sleep_s", backoff_s)
+
+# ============================================================
+# METRICS (per-endpoint counts, latency, retries, throttle, bytes)
+#   queryable via metrics_snapshot(); main() dumps them at exit when GEXP_METRICS_FILE / --metrics-file is set:
+#     *.prom   Prometheus text format (e.g. for node_exporter's textfile collector)
+#     *.jsonl  one JSON line appended per run (API pressure over time)
+#     other    pretty JSON snapshot
+# ============================================================
+LATENCY_BUCKETS_S = (0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+_LATENCY_SAMPLE_CAP = 20000  # per endpoint; reservoir-sampled beyond this
+
+def _endpoint_label(kind: str, url: str) -> str:
+    if kind == "mojang":
+        return "mojang:/profile"
+    path = url[len(BASE_URL):] if url.startswith(BASE_URL) else url
+    return f"hypixel:{path}"
+
+def _percentile(sorted_vals: List[float], q: float) -> Optional[float]:
+    if not sorted_vals:
+        return None
+    idx = min(int(round(q * (len(sorted_vals) - 1))), len(sorted_vals) - 1)
+    return round(sorted_vals[idx], 6)
+
+class _Metrics:
+    """
+    Process-wide API metrics, keyed by endpoint label ("hypixel:/player", "mojang:/profile").
+      - observe(): one GET (latency, status or None for a transport error, body size)
+      - retry(): one retry at a call site
+      - throttle(): seconds a caller slept in an API's token bucket
+      - lookup(): outcome of a cached lookup (player blob, SkyBlock level, IGN)
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+        self.endpoints: Dict[str, Dict[str, Any]] = {}
+        self.throttle_s: Dict[str, float] = {}
+        self.throttle_waits: Dict[str, int] = {}
+        self.lookups: Dict[str, Dict[str, int]] = {}
+        self._rng = random.Random(0)
+
+    def _ep(self, label: str) -> Dict[str, Any]:
+        # caller holds the lock
+        ep = self.endpoints.get(label)
+        if ep is None:
+            ep = {
+                "requests": 0, "errors": 0, "retries": 0, "http_429": 0,
+                "status": {}, "bytes": 0, "latency_sum_s": 0.0,
+                "buckets": [0] * (len(LATENCY_BUCKETS_S) + 1), "samples": [],
+            }
+            self.endpoints[label] = ep
+        return ep
+
+    def observe(self, label: str, latency_s: float, status: Optional[int], nbytes: int = 0) -> None:
+        with self._lock:
+            ep = self._ep(label)
+            ep["requests"] += 1
+            ep["latency_sum_s"] += latency_s
+            if status is None:
+                ep["errors"] += 1
+            else:
+                key = str(status)
+                ep["status"][key] = ep["status"].get(key, 0) + 1
+                if status == 429:
+                    ep["http_429"] += 1
+            ep["bytes"] += int(nbytes or 0)
+
+            i = 0
+            while i < len(LATENCY_BUCKETS_S) and latency_s > LATENCY_BUCKETS_S[i]:
+                i += 1
+            ep["buckets"][i] += 1
+
+            samples = ep["samples"]
+            if len(samples) < _LATENCY_SAMPLE_CAP:
+                samples.append(latency_s)
+            else:
+                j = self._rng.randrange(ep["requests"])
+                if j < _LATENCY_SAMPLE_CAP:
+                    samples[j] = latency_s
+
+    def retry(self, label: str) -> None:
+        with self._lock:
+            self._ep(label)["retries"] += 1
+
+    def throttle(self, api: str, seconds: float) -> None:
+        with self._lock:
+            self.throttle_s[api] = self.throttle_s.get(api, 0.0) + seconds
+            self.throttle_waits[api] = self.throttle_waits.get(api, 0) + 1
+
+    def lookup(self, name: str, outcome: str, n: int = 1) -> None:
+        with self._lock:
+            d = self.lookups.setdefault(name, {})
+            d[outcome] = d.get(outcome, 0) + n
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            endpoints: Dict[str, Any] = {}
+            for label, ep in self.endpoints.items():
+                lat = sorted(ep["samples"])
+                endpoints[label] = {
+                    "requests": ep["requests"],
+                    "errors": ep["errors"],
+                    "retries": ep["retries"],
+                    "http_429": ep["http_429"],
+                    "status": dict(ep["status"]),
+                    "bytes": ep["bytes"],
+                    "latency_s": {
+                        "mean": round(ep["latency_sum_s"] / ep["requests"], 6) if ep["requests"] else None,
+                        "p50": _percentile(lat, 0.50),
+                        "p95": _percentile(lat, 0.95),
+                        "p99": _percentile(lat, 0.99),
+                        "max": round(lat[-1], 6) if lat else None,
+                    },
+                    "latency_buckets": dict(zip([str(b) for b in LATENCY_BUCKETS_S] + ["+Inf"], ep["buckets"])),
+                }
+            return {
+                "started_at": int(self.started_at),
+                "taken_at": int(time.time()),
+                "endpoints": endpoints,
+                "throttle": {
+                    api: {"sleep_s": round(s, 3), "waits": self.throttle_waits.get(api, 0)}
+                    for api, s in self.throttle_s.items()
+                },
+                "lookups": {k: dict(v) for k, v in self.lookups.items()},
+            }
+
+    def to_prometheus(self) -> str:
+        snap = self.snapshot()
+        with self._lock:
+            raw = {label: (list(ep["buckets"]), ep["latency_sum_s"]) for label, ep in self.endpoints.items()}
+
+        def lbl(label: str) -> str:
+            api, _, path = label.partition(":")
+            return f'api="{api}",endpoint="{path}"'
+
+        out: List[str] = []
+
+        def family(name: str, kind: str, help_text: str) -> None:
+            out.append(f"# HELP {name} {help_text}")
+            out.append(f"# TYPE {name} {kind}")
+
+        family("gexp_http_requests_total", "counter", "HTTP GETs by endpoint and status (status=\"error\" = no response)")
+        for label, ep in snap["endpoints"].items():
+            for status, n in sorted(ep["status"].items()):
+                out.append(f'gexp_http_requests_total{{{lbl(label)},status="{status}"}} {n}')
+            if ep["errors"]:
+                out.append(f'gexp_http_requests_total{{{lbl(label)},status="error"}} {ep["errors"]}')
+
+        family("gexp_http_retries_total", "counter", "Retries issued by the fetch loops")
+        for label, ep in snap["endpoints"].items():
+            out.append(f"gexp_http_retries_total{{{lbl(label)}}} {ep['retries']}")
+
+        family("gexp_http_429_total", "counter", "429 Too Many Requests responses")
+        for label, ep in snap["endpoints"].items():
+            out.append(f"gexp_http_429_total{{{lbl(label)}}} {ep['http_429']}")
+
+        family("gexp_http_response_bytes_total", "counter", "Response body bytes")
+        for label, ep in snap["endpoints"].items():
+            out.append(f"gexp_http_response_bytes_total{{{lbl(label)}}} {ep['bytes']}")
+
+        family("gexp_http_request_duration_seconds", "histogram", "GET latency")
+        for label, (buckets, total_s) in raw.items():
+            cum = 0
+            for le, n in zip([str(b) for b in LATENCY_BUCKETS_S] + ["+Inf"], buckets):
+                cum += n
+                out.append(f'gexp_http_request_duration_seconds_bucket{{{lbl(label)},le="{le}"}} {cum}')
+            out.append(f"gexp_http_request_duration_seconds_sum{{{lbl(label)}}} {total_s:.6f}")
+            out.append(f"gexp_http_request_duration_seconds_count{{{lbl(label)}}} {cum}")
+
+        family("gexp_throttle_sleep_seconds_total", "counter", "Time spent waiting in the client-side rate limiter")
+        for api, t in snap["throttle"].items():
+            out.append(f'gexp_throttle_sleep_seconds_total{{api="{api}"}} {t["sleep_s"]}')
+
+        family("gexp_lookups_total", "counter", "Cached lookups by outcome")
+        for name, outcomes in snap["lookups"].items():
+            for outcome, n in sorted(outcomes.items()):
+                out.append(f'gexp_lookups_total{{lookup="{name}",outcome="{outcome}"}} {n}')
+
+        family("gexp_run_timestamp_seconds", "gauge", "When these metrics were written")
+        out.append(f"gexp_run_timestamp_seconds {snap['taken_at']}")
+        return "\n".join(out) + "\n"
+
+    def dump(self, path: str) -> None:
+        if path.endswith(".prom"):
+            tmp_path = path + ".tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(self.to_prometheus())
+            os.replace(tmp_path, path)
+        elif path.endswith(".jsonl"):
+            with open(path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(self.snapshot(), separators=(",", ":")) + "\n")
+        else:
+            _json_save(path, self.snapshot())
+
+_METRICS = _Metrics()
+
+def metrics_snapshot() -> Dict[str, Any]:
+    return _METRICS.snapshot()
+
+def http_call_counts() -> Dict[str, int]:
+    return {label: ep["requests"] for label, ep in _METRICS.snapshot()["endpoints"].items()}
+
+def _dump_metrics_at_exit() -> None:
+    if not METRICS_FILE:
+        return
+    try:
+        _METRICS.dump(METRICS_FILE)
+    except Exception as e:
+        print(f"{YELLOW}Could not write metrics to {METRICS_FILE}: {e}{RESET}")
+
+# ============================================================
+# HTTP SESSIONS + SOFT THROTTLE
+# ============================================================
+def _new_session() -> requests.Session:
+    session = requests.Session()
+    session.verify = True
+    session.headers.update({"User-Agent": "Mozilla/5.0"})
+    return session
+
+mojang_session = _Lazy("mojang_session", _new_session)
+hypixel_session = _Lazy("hypixel_session", _new_session)
+
+class _HttpResponse:
+    """
+    Minimal requests.Response look-alike (aiohttp results, replayed fixtures),
+    so every caller can treat responses the same way.
+    """
+
+    def __init__(self, status_code: int, headers: Dict[str, str], content: bytes):
+        self.status_code = int(status_code)
+        self.headers = requests.structures.CaseInsensitiveDict(headers or {})
+        self.content = content or b""
+
+    def json(self) -> Any:
+        text = self.content.decode("utf-8", "replace") or "null"
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError as e:
+            # same type requests raises: a RequestException, so the fetch loops retry it like any bad response
+            raise requests.exceptions.JSONDecodeError(e.msg, e.doc, e.pos) from e
+
+    def raise_for_status(self) -> None:
+        if 400 <= self.status_code <= 599:
+            raise requests.HTTPError(f"{self.status_code} Error", response=None)
+
+# ============================================================
+# RECORD / REPLAY (offline, deterministic runs)
+#   fixtures/<kind>/<sha1>.json, keyed by endpoint + params (API key never stored)
+# ============================================================
+_FIXTURE_HEADERS = ("Content-Type", "Retry-After", "RateLimit-Limit", "RateLimit-Remaining", "RateLimit-Reset")
+
+class _FixtureStore:
+    def __init__(self, root: str):
+        self.root = root
+        self.stats = {"saved": 0, "served": 0, "missing": 0, "injected_429": 0}
+        self._rng = random.Random(REPLAY_SEED)
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _endpoint(kind: str, url: str) -> str:
+        base = BASE_URL if kind == "hypixel" else MOJANG_API
+        return url[len(base):] if url.startswith(base) else url
+
+    def _path(self, kind: str, url: str, params: Optional[Dict[str, Any]]) -> Tuple[str, Dict[str, Any]]:
+        req = {
+            "kind": kind,
+            "endpoint": self._endpoint(kind, url),
+            "params": {str(k): str(v) for k, v in sorted((params or {}).items()) if str(k) != "key"},
+        }
+        digest = hashlib.sha1(json.dumps(req, sort_keys=True).encode("utf-8")).hexdigest()
+        return os.path.join(self.root, kind, f"{digest}.json"), req
+
+    def save(self, kind: str, url: str, params: Optional[Dict[str, Any]], resp: Any) -> None:
+        path, req = self._path(kind, url, params)
+        headers = {h: resp.headers[h] for h in _FIXTURE_HEADERS if h in resp.headers}
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        _json_save(path, {
+            "request": req,
+            "status": int(resp.status_code),
+            "headers": headers,
+            "body": (resp.content or b"").decode("utf-8", errors="replace"),
+            "recorded_at": _now_ts(),
+        })
+        with self._lock:
+            self.stats["saved"] += 1
+
+    def delay_s(self) -> float:
+        with self._lock:
+            jitter = self._rng.uniform(0, REPLAY_JITTER_MS) if REPLAY_JITTER_MS > 0 else 0.0
+        return max(REPLAY_LATENCY_MS + jitter, 0.0) / 1000.0
+
+    def serve(self, kind: str, url: str, params: Optional[Dict[str, Any]]) -> _HttpResponse:
+        with self._lock:
+            inject = REPLAY_429_RATE > 0 and self._rng.random() < REPLAY_429_RATE
+            if inject:
+                self.stats["injected_429"] += 1
+        if inject:
+            return _HttpResponse(429, {"Retry-After": REPLAY_RETRY_AFTER_S}, b'{"success": false, "cause": "Injected 429"}')
+
+        path, _ = self._path(kind, url, params)
+        data = _json_load(path, None)
+        if not isinstance(data, dict):
+            with self._lock:
+                self.stats["missing"] += 1
+            # unknown player/guild, the way the live APIs answer it (no retry storm)
+            if kind == "mojang":
+                return _HttpResponse(204, {}, b"")
+            return _HttpResponse(200, {"Content-Type": "application/json"}, b'{"success": false, "cause": "No recorded fixture"}')
+
+        with self._lock:
+            self.stats["served"] += 1
+        return _HttpResponse(
+            _safe_int(data.get("status", 200), 200),
+            data.get("headers") or {},
+            str(data.get("body", "")).encode("utf-8"),
+        )
+
+_FIXTURES = _FixtureStore(HTTP_FIXTURES_DIR)
+
+def _http_get(kind: str, url: str, params: Optional[Dict[str, Any]] = None, timeout: float = 15) -> Any:
+    """
+    The one place a blocking GET leaves the process (kind is "hypixel" or "mojang").
+    Honours HTTP_MODE: replay serves fixtures, record saves every live response.
+    """
+    label = _endpoint_label(kind, url)
+    t0 = time.perf_counter()
+    try:
+        if HTTP_MODE == "replay":
+            delay = _FIXTURES.delay_s()
+            if delay > 0:
+                time.sleep(delay)
+            r = _FIXTURES.serve(kind, url, params)
+        else:
+            session = hypixel_session if kind == "hypixel" else mojang_session
+            r = session.get(url, params=params, timeout=timeout)
+            if HTTP_MODE == "record":
+                _FIXTURES.save(kind, url, params, r)
+    except Exception:
+        _METRICS.observe(label, time.perf_counter() - t0, None)
+        raise
+    _METRICS.observe(label, time.perf_counter() - t0, r.status_code, len(r.content or b""))
+    return r
+
+class _TokenBucket:
+    """
+    Thread-safe token bucket shared by every worker that talks to one API.
+      - refills at `rate` tokens/second up to `capacity`
+      - acquire() reserves a token and sleeps (outside the lock) until it is due
+      - acquire_async() does the same with asyncio.sleep, sharing the same budget
+    """
+
+    def __init__(self, min_interval: float, capacity: int = 1, name: str = ""):
+        self.name = name
+        self.rate = (1.0 / float(min_interval)) if float(min_interval) > 0 else 0.0
+        self.capacity = float(max(int(capacity), 1))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _take_token(self, rate: float) -> float:
+        # caller holds the lock
+        if rate <= 0:
+            return 0.0
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * rate)
+        self._updated = now
+        self._tokens -= 1.0
+        return (-self._tokens / rate) if self._tokens < 0 else 0.0
+
+    def _reserve(self) -> Tuple[float, bool]:
+        """
+        Returns (wait_seconds, granted). A granted reservation is already paid for;
+        an ungranted one means "sleep, then ask again".
+        """
+        if self.rate <= 0:
+            return 0.0, True
+        with self._lock:
+            return self._take_token(self.rate), True
+
+    def acquire(self) -> float:
+        total = 0.0
+        while True:
+            wait, granted = self._reserve()
+            if wait > 0:
+                time.sleep(wait)
+                total += wait
+            if granted:
+                if total:
+                    _PROFILER.add("throttle_sleep_s", total)
+                    _METRICS.throttle(self.name, total)
+                return total
+
+    async def acquire_async(self) -> float:
+        total = 0.0
+        while True:
+            wait, granted = self._reserve()
+            if wait > 0:
+                await asyncio.sleep(wait)
+                total += wait
+            if granted:
+                if total:
+                    _PROFILER.add("throttle_sleep_s", total)
+                    _METRICS.throttle(self.name, total)
+                return total
+
+class _AdaptiveRateLimiter(_TokenBucket):
+    """
+    Token bucket that also follows Hypixel's RateLimit-* response headers.
+      - before any headers are seen: plain bucket at HYPIXEL_MIN_INTERVAL_S
+      - while quota is left: paced only by the (much faster) adaptive interval
+      - at the reserve: every caller waits exactly until the reported reset
+      - a 429 blocks everyone until its Retry-After, not just the caller that got it
+    """
+
+    def __init__(self, min_interval: float, capacity: int = 1, name: str = "",
+                 fast_interval: float = HYPIXEL_ADAPTIVE_MIN_INTERVAL_S,
+                 reserve: int = HYPIXEL_QUOTA_RESERVE):
+        super().__init__(min_interval, capacity, name)
+        self.fast_rate = (1.0 / float(fast_interval)) if float(fast_interval) > 0 else 0.0
+        self.reserve = max(int(reserve), 0)
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None
+        self.reset_at = 0.0        # monotonic
+        self.reset_at_wall = 0.0   # epoch seconds, for reporting
+        self.observed_at = 0.0     # epoch seconds of last header read
+        self.blocked_until = 0.0   # monotonic, set by 429s
+        self._in_flight = 0        # granted but not yet answered
+
+    def _reserve(self) -> Tuple[float, bool]:
+        with self._lock:
+            now = time.monotonic()
+
+            if self.blocked_until > now:
+                return self.blocked_until - now, False
+
+            if self.reset_at and now >= self.reset_at:
+                # window rolled over; stragglers from the old window may still land in this one
+                self.remaining = max((self.limit or 0) - self._in_flight, 0)
+                self.reset_at = 0.0
+
+            if self.remaining is not None and self.remaining <= self.reserve and self.reset_at > now:
+                return self.reset_at - now, False
+
+            rate = self.fast_rate if self.remaining is not None else self.rate
+            wait = self._take_token(rate)
+            if self.remaining is not None:
+                self.remaining -= 1
+            self._in_flight += 1
+            return wait, True
+
+    def observe(self, headers: Any) -> None:
+        """
+        Settle one granted request and re-sync from its RateLimit-Limit / -Remaining / -Reset
+        headers (pass None when the request never got a response).
+        Requests still in flight are not in the server's count yet, so they are subtracted;
+        responses can land out of order, so within one window we keep the lower count.
+        """
+        with self._lock:
+            self._in_flight = max(self._in_flight - 1, 0)
+        if not headers:
+            return
+        remaining = headers.get("RateLimit-Remaining")
+        reset = headers.get("RateLimit-Reset")
+        if remaining is None or reset is None:
+            return
+        try:
+            remaining_i = int(float(remaining))
+            reset_s = max(float(reset), 0.0)
+        except Exception:
+            return
+        limit = headers.get("RateLimit-Limit")
+
+        with self._lock:
+            now = time.monotonic()
+            server_left = max(remaining_i - self._in_flight, 0)
+            new_reset_at = now + reset_s
+            same_window = self.reset_at > now and abs(new_reset_at - self.reset_at) < 1.5
+            if same_window and self.remaining is not None:
+                self.remaining = min(self.remaining, server_left)
+            else:
+                self.remaining = server_left
+                self.reset_at = new_reset_at
+            if limit is not None:
+                self.limit = _safe_int(limit, self.limit or 0) or self.limit
+            elif self.limit is None or remaining_i > self.limit:
+                self.limit = remaining_i
+            self.reset_at_wall = time.time() + max(self.reset_at - now, 0.0)
+            self.observed_at = time.time()
+
+    def block_for(self, seconds: float) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self.blocked_until = max(self.blocked_until, now + max(float(seconds), 0.0))
+            self.remaining = 0 if self.remaining is not None else None
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            now = time.monotonic()
+            return {
+                "limit": self.limit,
+                "remaining": self.remaining,
+                "reset_in_s": round(max(self.reset_at - now, 0.0), 2) if self.reset_at else None,
+                "reset_at": int(self.reset_at_wall) if self.reset_at_wall else None,
+                "observed_at": int(self.observed_at) if self.observed_at else None,
+                "blocked_for_s": round(max(self.blocked_until - now, 0.0), 2),
+            }
+
+_HYPIXEL_BUCKET: _TokenBucket = (
+    _AdaptiveRateLimiter(HYPIXEL_MIN_INTERVAL_S, HYPIXEL_BURST, "hypixel")
+    if HYPIXEL_ADAPTIVE_RATE_LIMIT
+    else _TokenBucket(HYPIXEL_MIN_INTERVAL_S, HYPIXEL_BURST, "hypixel")
+)
+_MOJANG_BUCKET = _TokenBucket(MOJANG_MIN_INTERVAL_S, MOJANG_BURST, "mojang")
+
+def _throttle_hypixel() -> None:
+    _HYPIXEL_BUCKET.acquire()
+
+def _throttle_mojang() -> None:
+    _MOJANG_BUCKET.acquire()
+
+def _hypixel_observe(resp: Any) -> None:
+    if isinstance(_HYPIXEL_BUCKET, _AdaptiveRateLimiter):
+        _HYPIXEL_BUCKET.observe(getattr(resp, "headers", None))
+
+def _hypixel_send(url: str, params: Dict[str, Any], timeout: float) -> requests.Response:
+    """
+    Raw Hypixel GET that always reports back to the limiter (even on network errors).
+    Call _throttle_hypixel() first.
+    """
+    try:
+        r = _http_get("hypixel", url, params=params, timeout=timeout)
+    except Exception:
+        _hypixel_observe(None)
+        raise
+    _hypixel_observe(r)
+    return r
+
+def hypixel_rate_limit_status() -> Dict[str, Any]:
+    """
+    Last observed Hypixel quota (limit / remaining / reset) for reporting.
+    Values are None until the first response with RateLimit-* headers.
+    """
+    if isinstance(_HYPIXEL_BUCKET, _AdaptiveRateLimiter):
+        return _HYPIXEL_BUCKET.snapshot()
+    return {"limit": None, "remaining": None, "reset_in_s": None, "reset_at": None, "observed_at": None, "blocked_for_s": 0.0}
+
+def _hypixel_block_for(seconds: float) -> bool:
+    """
+    Tell the shared limiter about a 429 so every worker pauses.
+    Returns False when the caller must sleep itself (non-adaptive limiter).
+    """
+    if isinstance(_HYPIXEL_BUCKET, _AdaptiveRateLimiter):
+        _HYPIXEL_BUCKET.block_for(seconds)
+        return True
+    return False
+
+# ============================================================
+# REQUEST PIPELINE (in-flight merge + per-run memo)
+# ============================================================
+class _RequestPipeline:
+    """
+    Every Hypixel lookup funnels through one of these.
+      - shared(key, fn): identical calls already in flight wait for the first one
+      - memo(key, fn): same, and inside request_run() the result is kept until the run ends,
+        so each (endpoint, uuid) is fetched and parsed at most once per run
+    The *_async variants do the same for the asyncio engine.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inflight: Dict[Any, Future] = {}
+        self._inflight_async: Dict[Any, "asyncio.Future[Any]"] = {}
+        self._memo: Dict[Any, Any] = {}
+        self._runs = 0
+
+    def begin_run(self) -> None:
+        with self._lock:
+            self._runs += 1
+
+    def end_run(self) -> None:
+        with self._lock:
+            self._runs = max(self._runs - 1, 0)
+            if self._runs == 0:
+                self._memo.clear()
+
+    def _lookup(self, key: Any, use_memo: bool) -> Tuple[bool, Any]:
+        # caller holds the lock
+        if use_memo and self._runs > 0 and key in self._memo:
+            return True, self._memo[key]
+        return False, None
+
+    def _remember(self, key: Any, value: Any, use_memo: bool) -> None:
+        if use_memo:
+            with self._lock:
+                if self._runs > 0:
+                    self._memo[key] = value
+
+    def shared(self, key: Any, fn: Any, use_memo: bool = False) -> Any:
+        with self._lock:
+            hit, value = self._lookup(key, use_memo)
+            if hit:
+                return value
+            fut = self._inflight.get(key)
+            owner = fut is None
+            if owner:
+                fut = Future()
+                self._inflight[key] = fut
+        if not owner:
+            return fut.result()
+
+        try:
+            value = fn()
+        except BaseException as e:
+            fut.set_exception(e)
+            raise
+        else:
+            self._remember(key, value, use_memo)
+            fut.set_result(value)
+            return value
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    def memo(self, key: Any, fn: Any) -> Any:
+        return self.shared(key, fn, use_memo=True)
+
+    async def shared_async(self, key: Any, fn: Any, use_memo: bool = False) -> Any:
+        with self._lock:
+            hit, value = self._lookup(key, use_memo)
+            if hit:
+                return value
+            fut = self._inflight_async.get(key)
+            owner = fut is None
+            if owner:
+                fut = asyncio.get_running_loop().create_future()
+                self._inflight_async[key] = fut
+        if not owner:
+            return await asyncio.shield(fut)
+
+        try:
+            value = await fn()
+        except BaseException as e:
+            fut.set_exception(e)
+            fut.exception()  # mark retrieved when nobody else was waiting
+            raise
+        else:
+            self._remember(key, value, use_memo)
+            fut.set_result(value)
+            return value
+        finally:
+            with self._lock:
+                self._inflight_async.pop(key, None)
+
+    async def memo_async(self, key: Any, fn: Any) -> Any:
+        return await self.shared_async(key, fn, use_memo=True)
+
+_PIPELINE = _RequestPipeline()
+
+@contextlib.contextmanager
+def request_run():
+    """
+    Scope for one menu action: inside it each (endpoint, uuid) is fetched at most once.
+    """
+    _PIPELINE.begin_run()
+    try:
+        yield
+    finally:
+        _PIPELINE.end_run()
+
+def _request_key(path: str, params: Optional[Dict[str, Any]]) -> Tuple[str, Tuple[Tuple[str, str], ...]]:
+    return path, tuple(sorted((str(k), str(v)) for k, v in (params or {}).items()))
+
+# ============================================================
+# API HELPERS (Hypixel wrapper w/ 429 backoff)
+# ============================================================
+
+def _retry_after_seconds(resp: requests.Response) -> float:
+    """
+    Best-effort: respect Retry-After if present, else fall back to 1s.
+    """
+    ra = resp.headers.get("Retry-After")
+    if ra:
+        try:
+            return max(float(ra), 0.5)
+        except Exception:
+            pass
+    return 1.0
+
+def _hypixel_get(path: str, params: Dict[str, Any], timeout: int = 15, max_attempts: int = 6) -> Dict[str, Any]:
+    """
+    Centralized Hypixel GET with:
+      - identical concurrent requests merged into one
+      - soft throttle between requests
+      - 429 handling (Retry-After if provided)
+      - exponential backoff on transient errors
+    """
+    return _PIPELINE.shared(
+        _request_key(path, params),
+        lambda: _hypixel_fetch(path, params, timeout=timeout, max_attempts=max_attempts),
+    )
+
+def _hypixel_fetch(path: str, params: Dict[str, Any], timeout: int = 15, max_attempts: int = 6) -> Dict[str, Any]:
+    url = f"{BASE_URL}{path}"
+    label = _endpoint_label("hypixel", url)
+    params = dict(params or {})
+    params["key"] = API_KEY
+
+    backoff = 1.0
+    last_exc: Optional[Exception] = None
+
+    for attempt in range(1, max_attempts + 1):
+        try:
+            _throttle_hypixel()
+
+            r = _hypixel_send(url, params=params, timeout=timeout)
+
+            # 429: Too Many Requests
+            if r.status_code == 429:
+                wait = _retry_after_seconds(r)
+                # add gentle exponential growth so repeated 429s back off harder
+                wait = max(wait, backoff)
+                print(f"{YELLOW}{DIM}Hypixel 429 (rate limited). Waiting {wait:.1f}s then retrying...{RESET}")
+                # shared limiter makes the next acquire wait (for every worker)
+                if not _hypixel_block_for(wait):
+                    time.sleep(wait)
+                    _note_retry(label, wait, 429)
+                else:
+                    _note_retry(label, status=429)
+                backoff = min(backoff * 1.8, 30.0)
+                continue
+
+            # other 5xx / transient issues: backoff retry
+            if 500 <= r.status_code <= 599:
+                print(f"{YELLOW}{DIM}Hypixel {r.status_code}. Retrying in {backoff:.1f}s...{RESET}")
+                time.sleep(backoff)
+                _note_retry(label, backoff, r.status_code)
+                backoff = min(backoff * 1.8, 30.0)
+                continue
+
+            r.raise_for_status()
+            return (_json_body(r) or {})
+
+        except requests.RequestException as e:
+            last_exc = e
+            # network hiccup, timeout, etc.
+            print(f"{YELLOW}{DIM}Hypixel request error ({attempt}/{max_attempts}). Retrying in {backoff:.1f}s...{RESET}")
+            time.sleep(backoff)
+            _note_retry(label, backoff)
+            backoff = min(backoff * 1.8, 30.0)
+
+    # If we got here, give a clean error
+    raise RuntimeError(f"Hypixel request failed after {max_attempts} attempts. Last error: {last_exc}")
+
+# small TTL cache to avoid hammering /guild if user flips menus quickly
+_GUILD_CACHE: Dict[str, Any] = {"name": "", "fetched_at": 0, "guild": None}
+GUILD_CACHE_TTL_S = float(os.getenv("GUILD_CACHE_TTL_S", "10"))
+
+def get_guild_by_name(guild_name: str) -> Dict[str, Any]:
+    guild_name = (guild_name or "").strip()
+    now = time.time()
+
+    if (
+        _GUILD_CACHE.get("guild")
+        and _GUILD_CACHE.get("name") == guild_name
+        and (now - float(_GUILD_CACHE.get("fetched_at", 0))) < GUILD_CACHE_TTL_S
+    ):
+        return _GUILD_CACHE["guild"]
+
+    data = _hypixel_get("/guild", params={"name": guild_name}, timeout=15, max_attempts=6)
 
     if not data.get("success") or not data.get("guild"):
         # Hypixel sometimes returns success:false with a cause
@@ -545,32 +2609,93 @@ def get_guild_by_name(guild_name: str) -> Dict[str, Any]:
     _GUILD_CACHE["guild"] = data["guild"]
     return data["guild"]
 
-def uuid_to_ign(uuid: str) -> str:
-    uuid = _normalize_uuid(uuid)
-    if not uuid:
-        return "unknown"
-
+def _ign_cached(uuid: str) -> Optional[str]:
+    """
+    Name from IGN_CACHE, or the uuid[:8] placeholder while a recent miss is still fresh.
+    None means "go ask Mojang".
+    """
     if uuid in IGN_CACHE:
         return IGN_CACHE[uuid]
+    failed_at = IGN_MISSES.get(uuid)
+    if failed_at is not None and (_now_ts() - failed_at) < IGN_NEGATIVE_TTL_S:
+        return uuid[:8]
+    return None
+
+def _store_ign(uuid: str, ign: Optional[str]) -> str:
+    # ✅ failures go to the negative cache (short TTL), never into IGN_CACHE
+    if not ign:
+        _METRICS.lookup("ign", "failed")
+        failed_at = _now_ts()
+        IGN_MISSES[uuid] = failed_at
+        _IGN_MISSES_JOURNAL.record("set", [uuid], failed_at)
+        return uuid[:8]
+    _METRICS.lookup("ign", "ok")
+    if IGN_CACHE.get(uuid) != ign:
+        IGN_CACHE[uuid] = ign
+        _IGN_JOURNAL.record("set", [uuid], ign)
+    if IGN_MISSES.pop(uuid, None) is not None:
+        _IGN_MISSES_JOURNAL.record("del", [uuid])
+    return ign
 
+def _fetch_ign(uuid: str) -> str:
     ign = None
     for _ in range(3):
         try:
             _throttle_mojang()
             # Mojang sessionserver expects the UUID without dashes
-            response = mojang_session.get(f"{MOJANG_API}/{uuid}", timeout=7)
+            response = _http_get("mojang", f"{MOJANG_API}/{uuid}", timeout=7)
             if response.status_code == 200:
-                ign = (response.json() or {}).get("name")
+                ign = (_json_body(response) or {}).get("name")
                 if ign:
                     break
+            elif response.status_code in (204, 404):
+                break  # no such profile; retrying won't change that
+            elif response.status_code == 429:
+                wait = _retry_after_seconds(response)
+                time.sleep(wait)
+                _note_retry("mojang:/profile", wait, 429)
         except Exception:
             time.sleep(1)
+            _note_retry("mojang:/profile", 1.0)
 
-    if not ign:
-        ign = uuid[:8]
+    return _store_ign(uuid, ign)
 
-    IGN_CACHE[uuid] = ign
-    return ign
+def uuid_to_ign(uuid: str) -> str:
+    uuid = _normalize_uuid(uuid)
+    if not uuid:
+        return "unknown"
+
+    cached = _ign_cached(uuid)
+    if cached is not None:
+        return cached
+
+    return _PIPELINE.shared(("mojang", uuid), lambda: _fetch_ign(uuid))
+
+def resolve_igns(uuids: List[str]) -> Dict[str, str]:
+    """
+    Bulk uuid -> IGN.
+      - cached names and fresh misses are answered locally
+      - everything else is looked up concurrently (async engine or IGN_RESOLVE_WORKERS threads),
+        paced by the shared Mojang bucket
+    """
+    norm: List[str] = []
+    seen = set()
+    for u in uuids:
+        nu = _normalize_uuid(u or "")
+        if nu and nu not in seen:
+            seen.add(nu)
+            norm.append(nu)
+
+    missing = [u for u in norm if _ign_cached(u) is None]
+    if len(norm) > len(missing):
+        _METRICS.lookup("ign", "cache_hit", len(norm) - len(missing))
+    if len(missing) > 1 and _use_async_engine():
+        run_async(resolve_igns_async(missing))
+    elif len(missing) > 1 and IGN_RESOLVE_WORKERS > 1:
+        with ThreadPoolExecutor(max_workers=min(IGN_RESOLVE_WORKERS, len(missing))) as pool:
+            list(pool.map(uuid_to_ign, missing))
+
+    return {u: uuid_to_ign(u) for u in norm}
 
 def _get_game_stats(player_obj: Dict[str, Any], *keys: str) -> Dict[str, Any]:
     stats = player_obj.get("stats", {}) or {}
@@ -679,50 +2804,28 @@ def _extract_uhc_score(player_obj: Dict[str, Any]) -> int:
 def _extract_achievement_points(player_obj: Dict[str, Any]) -> int:
     return _safe_int(player_obj.get("achievementPoints", 0), 0)
 
-def get_player_requirements_blob(uuid: str) -> Dict[str, Any]:
-    uuid = _normalize_uuid(uuid)
-    if not uuid:
-        return {
-            "ap": 0,
-            "bw_wins": 0, "bw_fkdr": 0.0,
-            "bb_score": 0,
-            "duels_wins": 0, "duels_wlr": 0.0,
-            "sw_wins": 0, "sw_kdr": 0.0,
-            "tnt_wins": 0,
-            "uhc_score": 0,
-            "fetched_at": 0
-        }
+def _empty_req_blob() -> Dict[str, Any]:
+    return {
+        "ap": 0,
+        "bw_wins": 0, "bw_fkdr": 0.0,
+        "bb_score": 0,
+        "duels_wins": 0, "duels_wlr": 0.0,
+        "sw_wins": 0, "sw_kdr": 0.0,
+        "tnt_wins": 0,
+        "uhc_score": 0,
+        "fetched_at": 0
+    }
 
-    now = _now_ts()
+def _cached_req_blob(uuid: str, now: int) -> Optional[Dict[str, Any]]:
     cached = PLAYER_CACHE.get(uuid)
     if isinstance(cached, dict):
         req = cached.get("req")
         fetched_at = _safe_int((req or {}).get("fetched_at", 0), 0)
-        if isinstance(req, dict) and fetched_at > 0 and (now - fetched_at) < PLAYER_CACHE_TTL_HOURS * 3600:
+        if isinstance(req, dict) and fetched_at > 0 and (now - fetched_at) < req_ttl_s(uuid, req):
             return req
+    return None
 
-    _throttle_hypixel()
-    player_obj: Dict[str, Any] = {}
-    success = False
-
-    for attempt in range(3):
-        try:
-            r = hypixel_session.get(
-                f"{BASE_URL}/player",
-                params={"key": API_KEY, "uuid": uuid},
-                timeout=15
-            )
-            r.raise_for_status()
-            data = r.json() or {}
-            if not data.get("success"):
-                success = False
-                break
-            player_obj = data.get("player") or {}
-            success = True
-            break
-        except Exception:
-            time.sleep(0.6 * (attempt + 1))
-
+def _build_req_blob(player_obj: Dict[str, Any], success: bool, now: int) -> Dict[str, Any]:
     ap = _extract_achievement_points(player_obj)
     bw_wins = _extract_bedwars_wins_from_player(player_obj)
     bw_fkdr = _extract_bedwars_fkdr(player_obj)
@@ -736,7 +2839,7 @@ def get_player_requirements_blob(uuid: str) -> Dict[str, Any]:
     tnt_wins = _extract_tnt_wins(player_obj)
     uhc_score = _extract_uhc_score(player_obj)
 
-    req_blob = {
+    return {
         "ap": int(ap),
         "bw_wins": int(bw_wins),
         "bw_fkdr": float(bw_fkdr),
@@ -751,71 +2854,105 @@ def get_player_requirements_blob(uuid: str) -> Dict[str, Any]:
         "fetched_at": int(now) if success else 0,
     }
 
+def _store_req_blob(uuid: str, req_blob: Dict[str, Any]) -> None:
+    PLAYER_CACHE.set_field(uuid, "req", req_blob)
+
+def _fetch_req_blob(uuid: str, now: int) -> Dict[str, Any]:
+    player_obj: Dict[str, Any] = {}
+    success = False
+    try:
+        data = _hypixel_get("/player", params={"uuid": uuid}, timeout=15, max_attempts=3)
+        if data.get("success"):
+            player_obj = data.get("player") or {}
+            success = True
+    except (RuntimeError, ValueError):
+        success = False  # one unusable response costs this player, not the run
+
     if success:
-        base = PLAYER_CACHE.get(uuid)
-        if not isinstance(base, dict):
-            base = {}
-        base["req"] = req_blob
-        PLAYER_CACHE[uuid] = base
+        _RAW_ARCHIVE.put_player(uuid, now, player_obj)
 
+    _METRICS.lookup("player", "ok" if success else "failed")
+    req_blob = _build_req_blob(player_obj, success, now)
+    if success:
+        _store_req_blob(uuid, req_blob)
     return req_blob
 
-def get_skyblock_level(uuid: str) -> int:
+def get_player_requirements_blob(uuid: str) -> Dict[str, Any]:
     uuid = _normalize_uuid(uuid)
-    if not uuid or not ENABLE_SKYBLOCK_LEVEL or not ENABLE_REQUIREMENT_CHECKS:
-        return 0
+    if not uuid:
+        return _empty_req_blob()
 
     now = _now_ts()
+    cached = _cached_req_blob(uuid, now)
+    if cached is not None:
+        _METRICS.lookup("player", "cache_hit")
+        return cached
+    stale = _stale_req_blob(uuid, now)
+    if stale is not None:
+        return stale
+
+    return _PIPELINE.memo(("player", uuid), lambda: _fetch_req_blob(uuid, now))
+
+def _cached_skyblock_level(uuid: str, now: int) -> Optional[int]:
     cached = PLAYER_CACHE.get(uuid)
     if isinstance(cached, dict):
         sb = cached.get("sb")
         fetched_at = _safe_int((sb or {}).get("fetched_at", 0), 0)
-        if isinstance(sb, dict) and fetched_at > 0 and (now - fetched_at) < SKYBLOCK_CACHE_TTL_HOURS * 3600:
+        if isinstance(sb, dict) and fetched_at > 0 and (now - fetched_at) < sb_ttl_s(uuid, sb):
             return _safe_int(sb.get("level", 0), 0)
-
+    return None
+
+def _skyblock_level_from_profiles(uuid: str, profiles: List[Any]) -> int:
+    best_xp = 0
+    for p in profiles:
+        members = (p or {}).get("members") or {}
+        # profiles members keys are usually uuid-without-dashes
+        me = members.get(uuid) or members.get(uuid.replace("-", "")) or {}
+        leveling = (me or {}).get("leveling") or {}
+        xp = _safe_int(leveling.get("experience", 0), 0)
+        if xp > best_xp:
+            best_xp = xp
+
+    # NOTE: this is an approximation; keeping your existing behavior.
+    return int(best_xp // 100)
+
+def _store_skyblock_level(uuid: str, level: int, now: int) -> None:
+    PLAYER_CACHE.set_field(uuid, "sb", {"level": int(level), "fetched_at": int(now)})
+
+def _fetch_skyblock_level(uuid: str, now: int) -> int:
     level = 0
     success = False
-    for attempt in range(3):
-        try:
-            _throttle_hypixel()
-            r = hypixel_session.get(
-                f"{BASE_URL}/skyblock/profiles",
-                params={"key": API_KEY, "uuid": uuid},
-                timeout=20
-            )
-            r.raise_for_status()
-            data = r.json() or {}
-            if not data.get("success"):
-                success = False
-                break
-
+    try:
+        data = _hypixel_get("/skyblock/profiles", params={"uuid": uuid}, timeout=20, max_attempts=3)
+        if data.get("success"):
             profiles = data.get("profiles") or []
-            best_xp = 0
-            for p in profiles:
-                members = (p or {}).get("members") or {}
-                # profiles members keys are usually uuid-without-dashes
-                me = members.get(uuid) or members.get(uuid.replace("-", "")) or {}
-                leveling = (me or {}).get("leveling") or {}
-                xp = _safe_int(leveling.get("experience", 0), 0)
-                if xp > best_xp:
-                    best_xp = xp
-
-            # NOTE: this is an approximation; keeping your existing behavior.
-            level = int(best_xp // 100)
+            level = _skyblock_level_from_profiles(uuid, profiles)
+            _RAW_ARCHIVE.put_skyblock(uuid, now, profiles)
             success = True
-            break
-        except Exception:
-            time.sleep(0.8 * (attempt + 1))
+    except (RuntimeError, ValueError):
+        success = False  # one unusable response costs this player, not the run
 
+    _METRICS.lookup("skyblock", "ok" if success else "failed")
     if success:
-        base = PLAYER_CACHE.get(uuid)
-        if not isinstance(base, dict):
-            base = {}
-        base["sb"] = {"level": int(level), "fetched_at": int(now)}
-        PLAYER_CACHE[uuid] = base
-
+        _store_skyblock_level(uuid, level, now)
     return int(level)
 
+def get_skyblock_level(uuid: str) -> int:
+    uuid = _normalize_uuid(uuid)
+    if not uuid or not ENABLE_SKYBLOCK_LEVEL or not ENABLE_REQUIREMENT_CHECKS:
+        return 0
+
+    now = _now_ts()
+    cached = _cached_skyblock_level(uuid, now)
+    if cached is not None:
+        _METRICS.lookup("skyblock", "cache_hit")
+        return cached
+    stale = _stale_skyblock_level(uuid, now)
+    if stale is not None:
+        return stale
+
+    return _PIPELINE.memo(("skyblock", uuid), lambda: _fetch_skyblock_level(uuid, now))
+
 def get_bedwars_wins(uuid: str) -> int:
     uuid = _normalize_uuid(uuid)
     if not uuid or not ENABLE_BEDWARS_WINS:
@@ -823,6 +2960,484 @@ def get_bedwars_wins(uuid: str) -> int:
     req = get_player_requirements_blob(uuid)
     return _safe_int(req.get("bw_wins", 0), 0)
 
+# ============================================================
+# RAW PAYLOAD ARCHIVE (RAW_ARCHIVE=1)
+#   successful /player and SkyBlock member payloads, zlib-compressed and keyed
+#   by (uuid, kind, fetched_at); --reextract rebuilds the req / sb blobs from
+#   the newest snapshot without touching the API
+# ============================================================
+class _RawArchive:
+    """
+    SQLite table of compressed raw payloads.
+      - put_*() is a no-op unless RAW_ARCHIVE is on; the file is opened on first use
+      - only the newest RAW_ARCHIVE_KEEP snapshots per (uuid, kind) are kept
+      - SkyBlock profiles are trimmed to this member's entry (co-op members are dropped)
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS raw_payloads (
+            uuid TEXT NOT NULL,
+            kind TEXT NOT NULL,
+            fetched_at INTEGER NOT NULL,
+            payload BLOB NOT NULL,
+            PRIMARY KEY (uuid, kind, fetched_at)
+        );
+    """
+
+    def __init__(self, path: str, enabled: bool):
+        self.path = path
+        self.enabled = enabled
+        self._db: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+
+    def _conn(self) -> sqlite3.Connection:
+        # caller holds the lock
+        if self._db is None:
+            self._db = sqlite3.connect(self.path, timeout=30, check_same_thread=False, isolation_level=None)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.executescript(self.SCHEMA)
+        return self._db
+
+    def _put(self, uuid: str, kind: str, fetched_at: int, payload: Any) -> None:
+        if not self.enabled:
+            return
+        raw = zlib.compress(json.dumps(payload, separators=(",", ":")).encode("utf-8"), 6)
+        try:
+            with self._lock:
+                db = self._conn()
+                db.execute("BEGIN IMMEDIATE")
+                try:
+                    db.execute(
+                        "INSERT OR REPLACE INTO raw_payloads(uuid, kind, fetched_at, payload) VALUES(?, ?, ?, ?)",
+                        (uuid, kind, int(fetched_at), raw),
+                    )
+                    db.execute(
+                        "DELETE FROM raw_payloads WHERE uuid = ? AND kind = ? AND fetched_at NOT IN "
+                        "(SELECT fetched_at FROM raw_payloads WHERE uuid = ? AND kind = ? ORDER BY fetched_at DESC LIMIT ?)",
+                        (uuid, kind, uuid, kind, RAW_ARCHIVE_KEEP),
+                    )
+                    db.execute("COMMIT")
+                except Exception:
+                    db.execute("ROLLBACK")
+                    raise
+        except sqlite3.Error as e:
+            # the archive is a convenience; never fail a lookup over it
+            print(f"{YELLOW}Raw archive write failed for {uuid} ({e}).{RESET}")
+
+    def put_player(self, uuid: str, fetched_at: int, player_obj: Dict[str, Any]) -> None:
+        self._put(uuid, "player", fetched_at, player_obj)
+
+    def put_skyblock(self, uuid: str, fetched_at: int, profiles: List[Any]) -> None:
+        if not self.enabled:
+            return
+        trimmed: List[Dict[str, Any]] = []
+        for p in profiles:
+            members = (p or {}).get("members") or {}
+            key = uuid if uuid in members else uuid.replace("-", "")
+            if key not in members:
+                continue
+            trimmed.append({
+                "profile_id": (p or {}).get("profile_id"),
+                "cute_name": (p or {}).get("cute_name"),
+                "selected": (p or {}).get("selected"),
+                "members": {key: members[key]},
+            })
+        self._put(uuid, "skyblock", fetched_at, trimmed)
+
+    def latest(self, kind: str) -> List[Tuple[str, int, Any]]:
+        """Newest (uuid, fetched_at, payload) per uuid for one kind."""
+        if not os.path.exists(self.path):
+            return []
+        out: List[Tuple[str, int, Any]] = []
+        with self._lock:
+            rows = self._conn().execute(
+                "SELECT uuid, MAX(fetched_at), payload FROM raw_payloads WHERE kind = ? GROUP BY uuid ORDER BY uuid",
+                (kind,),
+            ).fetchall()
+        for uuid, fetched_at, raw in rows:
+            try:
+                out.append((uuid, int(fetched_at), json.loads(zlib.decompress(raw).decode("utf-8"))))
+            except Exception:
+                continue
+        return out
+
+    def stats(self) -> Dict[str, int]:
+        if not os.path.exists(self.path):
+            return {}
+        with self._lock:
+            rows = self._conn().execute(
+                "SELECT kind, COUNT(*), SUM(LENGTH(payload)) FROM raw_payloads GROUP BY kind"
+            ).fetchall()
+        out: Dict[str, int] = {}
+        for kind, n, size in rows:
+            out[f"{kind}_snapshots"] = int(n)
+            out[f"{kind}_bytes"] = int(size or 0)
+        return out
+
+_RAW_ARCHIVE = _RawArchive(RAW_ARCHIVE_FILE, RAW_ARCHIVE)
+
+def reextract_from_archive() -> Tuple[int, int]:
+    """
+    Rebuild cached req / sb blobs from the newest archived payloads.
+      - the blob keeps the payload's fetch time, so TTLs behave as if it had just been fetched then
+      - returns (req blobs rebuilt, SkyBlock levels rebuilt)
+    """
+    n_req = 0
+    for uuid, fetched_at, player_obj in _RAW_ARCHIVE.latest("player"):
+        if isinstance(player_obj, dict):
+            _store_req_blob(uuid, _build_req_blob(player_obj, True, fetched_at))
+            n_req += 1
+
+    n_sb = 0
+    for uuid, fetched_at, profiles in _RAW_ARCHIVE.latest("skyblock"):
+        if isinstance(profiles, list):
+            _store_skyblock_level(uuid, _skyblock_level_from_profiles(uuid, profiles), fetched_at)
+            n_sb += 1
+
+    save_player_cache(PLAYER_CACHE)
+    return n_req, n_sb
+
+# ============================================================
+# STALE-WHILE-REVALIDATE (CACHE_STALE_WHILE_REVALIDATE=1)
+#   expired player / SkyBlock entries are served at once (and flagged on the
+#   member as "stale"); the refetch runs on a small background pool
+# ============================================================
+class _BackgroundRefresher:
+    """
+    Refreshes expired cache entries off the request path.
+      - submit(kind, uuid, fn): queue fn once per (kind, uuid) until it finishes
+      - begin_pass() / served_stale(uuid): which members were answered from stale data
+        during the current requirement pass
+      - stop(): drop queued refreshes, wait for the running ones (before the final save)
+    Refreshes use the normal fetch helpers, so they share the token buckets and the in-flight merge.
+    """
+
+    def __init__(self, workers: int):
+        self.workers = max(int(workers), 1)
+        self._lock = threading.Lock()
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._queued: set = set()
+        self._stale: set = set()
+
+    def submit(self, kind: str, uuid: str, fn: Any) -> None:
+        key = (kind, uuid)
+        with self._lock:
+            self._stale.add(uuid)
+            if key in self._queued:
+                return
+            self._queued.add(key)
+            if self._pool is None:
+                self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="swr")
+            pool = self._pool
+        pool.submit(self._run, key, fn)
+
+    def _run(self, key: Tuple[str, str], fn: Any) -> None:
+        try:
+            fn()
+        except Exception:
+            pass  # the stale entry stays; the next pass queues it again
+        finally:
+            with self._lock:
+                self._queued.discard(key)
+
+    def begin_pass(self) -> None:
+        with self._lock:
+            self._stale.clear()
+
+    def served_stale(self, uuid: str) -> bool:
+        with self._lock:
+            return uuid in self._stale
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._queued)
+
+    def stop(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+_REFRESHER = _BackgroundRefresher(SWR_REFRESH_WORKERS)
+
+def _stale_fetched_at_ok(blob: Any, now: int) -> bool:
+    fetched_at = _safe_int((blob or {}).get("fetched_at", 0), 0) if isinstance(blob, dict) else 0
+    return fetched_at > 0 and (now - fetched_at) < CACHE_STALE_MAX_HOURS * 3600
+
+def _stale_req_blob(uuid: str, now: int) -> Optional[Dict[str, Any]]:
+    if not CACHE_STALE_WHILE_REVALIDATE:
+        return None
+    req = (PLAYER_CACHE.get(uuid) or {}).get("req")
+    if not _stale_fetched_at_ok(req, now):
+        return None
+    _METRICS.lookup("player", "stale")
+    _REFRESHER.submit("player", uuid, lambda: _fetch_req_blob(uuid, _now_ts()))
+    return req
+
+def _stale_skyblock_level(uuid: str, now: int) -> Optional[int]:
+    if not CACHE_STALE_WHILE_REVALIDATE:
+        return None
+    sb = (PLAYER_CACHE.get(uuid) or {}).get("sb")
+    if not _stale_fetched_at_ok(sb, now):
+        return None
+    _METRICS.lookup("skyblock", "stale")
+    _REFRESHER.submit("skyblock", uuid, lambda: _fetch_skyblock_level(uuid, _now_ts()))
+    return _safe_int(sb.get("level", 0), 0)
+
+# ============================================================
+# ASYNC FETCH ENGINE
+#   - same caches, parsers and token buckets as the sync helpers above
+#   - uses aiohttp when installed; otherwise the blocking sessions run on
+#     the loop's default executor (bounded, not a thread per request)
+# ============================================================
+_ASYNC_HTTP: "contextvars.ContextVar[Dict[str, Any]]" = contextvars.ContextVar("_ASYNC_HTTP", default={})
+
+async def _async_http_get(kind: str, url: str, params: Optional[Dict[str, Any]] = None, timeout: float = 15) -> Any:
+    """
+    One GET for the async engine. kind is "hypixel" or "mojang".
+    Network errors are re-raised as requests exceptions so callers only handle one family.
+    """
+    client = _ASYNC_HTTP.get().get(kind)
+    if HTTP_MODE != "replay" and client is None:
+        # no aiohttp: the blocking transport runs on the executor (and records its own metrics)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, partial(_http_get, kind, url, params=params, timeout=timeout))
+
+    label = _endpoint_label(kind, url)
+    t0 = time.perf_counter()
+    try:
+        if HTTP_MODE == "replay":
+            delay = _FIXTURES.delay_s()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            resp = _FIXTURES.serve(kind, url, params)
+        else:
+            async with client.get(url, params=params, timeout=aiohttp.ClientTimeout(total=timeout)) as r:
+                body = await r.read()
+                resp = _HttpResponse(r.status, dict(r.headers), body)
+            if HTTP_MODE == "record":
+                _FIXTURES.save(kind, url, params, resp)
+    except asyncio.TimeoutError as e:
+        _METRICS.observe(label, time.perf_counter() - t0, None)
+        raise requests.Timeout(str(e)) from e
+    except aiohttp.ClientError as e:
+        _METRICS.observe(label, time.perf_counter() - t0, None)
+        raise requests.ConnectionError(str(e)) from e
+    except Exception:
+        _METRICS.observe(label, time.perf_counter() - t0, None)
+        raise
+    _METRICS.observe(label, time.perf_counter() - t0, resp.status_code, len(resp.content or b""))
+    return resp
+
+async def _hypixel_send_async(url: str, params: Dict[str, Any], timeout: float) -> Any:
+    try:
+        r = await _async_http_get("hypixel", url, params=params, timeout=timeout)
+    except Exception:
+        _hypixel_observe(None)
+        raise
+    _hypixel_observe(r)
+    return r
+
+async def _with_async_http(coro: Any) -> Any:
+    if _unwrap(aiohttp) is None:
+        return await coro
+
+    connector_limit = max(ASYNC_MAX_IN_FLIGHT, 1)
+    async with aiohttp.ClientSession(
+        headers={"User-Agent": "Mozilla/5.0"},
+        connector=aiohttp.TCPConnector(limit=connector_limit),
+    ) as hyp, aiohttp.ClientSession(
+        headers={"User-Agent": "Mozilla/5.0"},
+        connector=aiohttp.TCPConnector(limit=connector_limit),
+    ) as moj:
+        token = _ASYNC_HTTP.set({"hypixel": hyp, "mojang": moj})
+        try:
+            return await coro
+        finally:
+            _ASYNC_HTTP.reset(token)
+
+def run_async(coro: Any) -> Any:
+    """
+    Sync entry point for the async engine: runs `coro` to completion
+    with HTTP sessions opened for this one event loop.
+    """
+    return asyncio.run(_with_async_http(coro))
+
+def _use_async_engine() -> bool:
+    if FETCH_ENGINE == "async":
+        return True
+    if FETCH_ENGINE == "auto":
+        return _unwrap(aiohttp) is not None
+    return False
+
+async def _hypixel_get_async(path: str, params: Dict[str, Any], timeout: int = 15, max_attempts: int = 6) -> Dict[str, Any]:
+    """
+    Async twin of _hypixel_get (same merge, throttle, 429 and backoff rules).
+    """
+    return await _PIPELINE.shared_async(
+        _request_key(path, params),
+        lambda: _hypixel_fetch_async(path, params, timeout=timeout, max_attempts=max_attempts),
+    )
+
+async def _hypixel_fetch_async(path: str, params: Dict[str, Any], timeout: int = 15, max_attempts: int = 6) -> Dict[str, Any]:
+    url = f"{BASE_URL}{path}"
+    label = _endpoint_label("hypixel", url)
+    params = dict(params or {})
+    params["key"] = API_KEY
+
+    backoff = 1.0
+    last_exc: Optional[Exception] = None
+
+    for attempt in range(1, max_attempts + 1):
+        try:
+            await _HYPIXEL_BUCKET.acquire_async()
+
+            r = await _hypixel_send_async(url, params=params, timeout=timeout)
+
+            if r.status_code == 429:
+                wait = max(_retry_after_seconds(r), backoff)
+                print(f"{YELLOW}{DIM}Hypixel 429 (rate limited). Waiting {wait:.1f}s then retrying...{RESET}")
+                if not _hypixel_block_for(wait):
+                    await asyncio.sleep(wait)
+                    _note_retry(label, wait, 429)
+                else:
+                    _note_retry(label, status=429)
+                backoff = min(backoff * 1.8, 30.0)
+                continue
+
+            if 500 <= r.status_code <= 599:
+                print(f"{YELLOW}{DIM}Hypixel {r.status_code}. Retrying in {backoff:.1f}s...{RESET}")
+                await asyncio.sleep(backoff)
+                _note_retry(label, backoff, r.status_code)
+                backoff = min(backoff * 1.8, 30.0)
+                continue
+
+            r.raise_for_status()
+            return (_json_body(r) or {})
+
+        except requests.RequestException as e:
+            last_exc = e
+            print(f"{YELLOW}{DIM}Hypixel request error ({attempt}/{max_attempts}). Retrying in {backoff:.1f}s...{RESET}")
+            await asyncio.sleep(backoff)
+            _note_retry(label, backoff)
+            backoff = min(backoff * 1.8, 30.0)
+
+    raise RuntimeError(f"Hypixel request failed after {max_attempts} attempts. Last error: {last_exc}")
+
+async def _fetch_ign_async(uuid: str) -> str:
+    ign = None
+    for _ in range(3):
+        try:
+            await _MOJANG_BUCKET.acquire_async()
+            response = await _async_http_get("mojang", f"{MOJANG_API}/{uuid}", timeout=7)
+            if response.status_code == 200:
+                ign = (_json_body(response) or {}).get("name")
+                if ign:
+                    break
+            elif response.status_code in (204, 404):
+                break
+            elif response.status_code == 429:
+                wait = _retry_after_seconds(response)
+                await asyncio.sleep(wait)
+                _note_retry("mojang:/profile", wait, 429)
+        except Exception:
+            await asyncio.sleep(1)
+            _note_retry("mojang:/profile", 1.0)
+
+    return _store_ign(uuid, ign)
+
+async def uuid_to_ign_async(uuid: str) -> str:
+    uuid = _normalize_uuid(uuid)
+    if not uuid:
+        return "unknown"
+
+    cached = _ign_cached(uuid)
+    if cached is not None:
+        return cached
+
+    return await _PIPELINE.shared_async(("mojang", uuid), lambda: _fetch_ign_async(uuid))
+
+async def resolve_igns_async(uuids: List[str], max_in_flight: int = ASYNC_MAX_IN_FLIGHT) -> Dict[str, str]:
+    sem = asyncio.Semaphore(max(int(max_in_flight), 1))
+
+    async def one(u: str) -> Tuple[str, str]:
+        async with sem:
+            return u, await uuid_to_ign_async(u)
+
+    pairs = await asyncio.gather(*(one(u) for u in uuids if _normalize_uuid(u or "")))
+    return {_normalize_uuid(u): ign for u, ign in pairs}
+
+async def _fetch_req_blob_async(uuid: str, now: int) -> Dict[str, Any]:
+    player_obj: Dict[str, Any] = {}
+    success = False
+    try:
+        data = await _hypixel_get_async("/player", params={"uuid": uuid}, timeout=15, max_attempts=3)
+        if data.get("success"):
+            player_obj = data.get("player") or {}
+            success = True
+    except (RuntimeError, ValueError):
+        success = False  # one unusable response costs this player, not the run
+
+    if success:
+        _RAW_ARCHIVE.put_player(uuid, now, player_obj)
+
+    _METRICS.lookup("player", "ok" if success else "failed")
+    req_blob = _build_req_blob(player_obj, success, now)
+    if success:
+        _store_req_blob(uuid, req_blob)
+    return req_blob
+
+async def get_player_requirements_blob_async(uuid: str) -> Dict[str, Any]:
+    uuid = _normalize_uuid(uuid)
+    if not uuid:
+        return _empty_req_blob()
+
+    now = _now_ts()
+    cached = _cached_req_blob(uuid, now)
+    if cached is not None:
+        _METRICS.lookup("player", "cache_hit")
+        return cached
+    stale = _stale_req_blob(uuid, now)
+    if stale is not None:
+        return stale
+
+    return await _PIPELINE.memo_async(("player", uuid), lambda: _fetch_req_blob_async(uuid, now))
+
+async def _fetch_skyblock_level_async(uuid: str, now: int) -> int:
+    level = 0
+    success = False
+    try:
+        data = await _hypixel_get_async("/skyblock/profiles", params={"uuid": uuid}, timeout=20, max_attempts=3)
+        if data.get("success"):
+            profiles = data.get("profiles") or []
+            level = _skyblock_level_from_profiles(uuid, profiles)
+            _RAW_ARCHIVE.put_skyblock(uuid, now, profiles)
+            success = True
+    except (RuntimeError, ValueError):
+        success = False  # one unusable response costs this player, not the run
+
+    _METRICS.lookup("skyblock", "ok" if success else "failed")
+    if success:
+        _store_skyblock_level(uuid, level, now)
+    return int(level)
+
+async def get_skyblock_level_async(uuid: str) -> int:
+    uuid = _normalize_uuid(uuid)
+    if not uuid or not ENABLE_SKYBLOCK_LEVEL or not ENABLE_REQUIREMENT_CHECKS:
+        return 0
+
+    now = _now_ts()
+    cached = _cached_skyblock_level(uuid, now)
+    if cached is not None:
+        _METRICS.lookup("skyblock", "cache_hit")
+        return cached
+    stale = _stale_skyblock_level(uuid, now)
+    if stale is not None:
+        return stale
+
+    return await _PIPELINE.memo_async(("skyblock", uuid), lambda: _fetch_skyblock_level_async(uuid, now))
+
 # ============================================================
 # TIMEZONE SETUP (EST fixed)
 # ============================================================
@@ -848,6 +3463,165 @@ def format_join_date(joined_ms: Optional[int]) -> str:
         return "??/??/??"
     return datetime.fromtimestamp(joined_ms / 1000, tz=EST).strftime("%d/%m/%y")
 
+# ============================================================
+# MEMBER TABLE
+#   one guild snapshot as struct-of-arrays columns; members are handed out as
+#   MemberRecord views, which read and write the columns in place and still
+#   support m["key"], m.get(...) and {**m} for the older dict-based code
+# ============================================================
+MEMBER_INT_COLUMNS = (
+    "joined_ms", "days_in_guild", "weekly_gexp", "predicted_gexp",
+    "bw_wins", "bw_bonus", "reqs_met_count", "real_reqs_count",
+)
+MEMBER_OBJ_COLUMNS = (
+    "ign", "uuid", "rank", "join_date", "kick_priority", "kick_breakdown",
+    "expHistory", "reqs_met", "pseudo_codes", "stale",
+)
+_MEMBER_INT_SET = frozenset(MEMBER_INT_COLUMNS)
+_MEMBER_OBJ_SET = frozenset(MEMBER_OBJ_COLUMNS)
+_MEMBER_DEFAULTS: Dict[str, Any] = {
+    "ign": "", "uuid": "", "rank": "Unknown", "join_date": "??/??/??", "kick_priority": "",
+    "kick_breakdown": None, "expHistory": None, "reqs_met": "-", "pseudo_codes": None, "stale": False,
+}
+
+class MemberTable:
+    """
+    Columns for one guild snapshot.
+      - numeric fields: array("q") columns (8 bytes a member, no per-value objects)
+      - strings / lists / dicts: plain list columns (expHistory is referenced, not copied)
+      - keys outside the schema land in a per-row overflow dict
+    """
+
+    __slots__ = ("columns", "extra")
+
+    def __init__(self) -> None:
+        self.columns: Dict[str, Any] = {name: array("q") for name in MEMBER_INT_COLUMNS}
+        self.columns.update({name: [] for name in MEMBER_OBJ_COLUMNS})
+        self.extra: List[Optional[Dict[str, Any]]] = []
+
+    def __len__(self) -> int:
+        return len(self.extra)
+
+    def append(self, row: Dict[str, Any]) -> int:
+        i = len(self.extra)
+        for name in MEMBER_INT_COLUMNS:
+            self.columns[name].append(_safe_int(row.get(name, 0), 0))
+        for name in MEMBER_OBJ_COLUMNS:
+            v = row.get(name, _MEMBER_DEFAULTS[name])
+            if v is None and name in ("kick_breakdown", "pseudo_codes"):
+                v = []
+            self.columns[name].append(v)
+        extra = {k: v for k, v in row.items() if k not in _MEMBER_INT_SET and k not in _MEMBER_OBJ_SET}
+        self.extra.append(extra or None)
+        return i
+
+    def record(self, i: int) -> "MemberRecord":
+        return MemberRecord(self, i)
+
+    def records(self) -> List["MemberRecord"]:
+        return [MemberRecord(self, i) for i in range(len(self.extra))]
+
+    @classmethod
+    def from_members(cls, members: List[Any]) -> Tuple["MemberTable", List[int]]:
+        """
+        (table, row indexes) for a member list: the records' own table when they share one,
+        otherwise a new table built from the dicts.
+        """
+        if members and all(type(m) is MemberRecord for m in members):
+            table = members[0]._t
+            if all(m._t is table for m in members):
+                return table, [m._i for m in members]
+        table = cls()
+        return table, [table.append(dict(m)) for m in members]
+
+class MemberRecord:
+    """
+    One row of a MemberTable, with the read/write surface of the old member dict.
+    """
+
+    __slots__ = ("_t", "_i")
+
+    def __init__(self, table: MemberTable, i: int):
+        self._t = table
+        self._i = i
+
+    def __getitem__(self, key: str) -> Any:
+        col = self._t.columns.get(key)
+        if col is not None:
+            return col[self._i]
+        extra = self._t.extra[self._i]
+        if extra is not None and key in extra:
+            return extra[key]
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        if key in _MEMBER_INT_SET:
+            self._t.columns[key][self._i] = _safe_int(value, 0)
+        elif key in _MEMBER_OBJ_SET:
+            self._t.columns[key][self._i] = value
+        else:
+            extra = self._t.extra[self._i]
+            if extra is None:
+                extra = self._t.extra[self._i] = {}
+            extra[key] = value
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __contains__(self, key: str) -> bool:
+        extra = self._t.extra[self._i]
+        return key in self._t.columns or (extra is not None and key in extra)
+
+    def keys(self) -> List[str]:
+        extra = self._t.extra[self._i]
+        return list(MEMBER_INT_COLUMNS) + list(MEMBER_OBJ_COLUMNS) + (list(extra) if extra else [])
+
+    def __iter__(self):
+        return iter(self.keys())
+
+    def __len__(self) -> int:
+        return len(self.keys())
+
+    def items(self) -> List[Tuple[str, Any]]:
+        return [(k, self[k]) for k in self.keys()]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(self.items())
+
+    def __repr__(self) -> str:
+        return f"MemberRecord({self.get('ign')!r}, row={self._i})"
+
+class KickCandidate(MemberRecord):
+    """
+    A member as scored by one recommend_kicks call. Writes (kick_priority, kick_breakdown,
+    bw_wins, bw_bonus, ...) stay on the candidate, like the {**m, ...} copy they replace,
+    so wave 1 and wave 2 never see each other's numbers.
+    """
+
+    __slots__ = ("_own",)
+
+    def __init__(self, table: MemberTable, i: int, own: Dict[str, Any]):
+        super().__init__(table, i)
+        self._own = own
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._own:
+            return self._own[key]
+        return super().__getitem__(key)
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        self._own[key] = value
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._own or super().__contains__(key)
+
+    def keys(self) -> List[str]:
+        base = super().keys()
+        return base + [k for k in self._own if k not in base]
+
 # ============================================================
 # DATA PROCESSING
 # ============================================================
@@ -899,9 +3673,12 @@ def days_until_weekly_hits_zero_if_no_more_gexp(exp_history: Dict[str, Any]) ->
         return 0
     return last_nz + 1
 
-def extract_weekly_gexp(guild: Dict[str, Any]) -> List[Dict[str, Any]]:
+def extract_weekly_gexp(guild: Dict[str, Any]) -> List[MemberRecord]:
     members = guild.get("members", []) or []
-    results: List[Dict[str, Any]] = []
+    table = MemberTable()
+    touch_last_seen([m.get("uuid") or "" for m in members])
+    with _PROFILER.stage("igns"):
+        igns = resolve_igns([m.get("uuid") or "" for m in members])
 
     for member in members:
         exp_history = member.get("expHistory", {}) or {}
@@ -913,8 +3690,8 @@ def extract_weekly_gexp(guild: Dict[str, Any]) -> List[Dict[str, Any]]:
 
         uuid = _normalize_uuid((member.get("uuid") or ""))
 
-        results.append({
-            "ign": uuid_to_ign(uuid),
+        table.append({
+            "ign": igns.get(uuid) or uuid_to_ign(uuid),
             "uuid": uuid,
             "rank": member.get("rank") or "Unknown",
             "joined_ms": joined_ms or 0,
@@ -932,66 +3709,254 @@ def extract_weekly_gexp(guild: Dict[str, Any]) -> List[Dict[str, Any]]:
             "pseudo_codes": [],
         })
 
-    results.sort(key=lambda m: (rank_priority(m["rank"]), -int(m["predicted_gexp"])))
-    return results
+    ranks = table.columns["rank"]
+    predicted = table.columns["predicted_gexp"]
+    order = sorted(range(len(table)), key=lambda i: (rank_priority(ranks[i]), -predicted[i]))
+    return [table.record(i) for i in order]
 
 # ============================================================
 # REQUIREMENTS (real + pseudo)
+#   real requirements are data: (metric, comparator, threshold) conditions
+#   that must all hold. RequirementRules compiles them once into the
+#   per-player check, the vectorized member evaluator, the legend text and
+#   the adaptive-TTL boundaries.
 # ============================================================
-REAL_REQS = [
-    ("AP",   "AP 15,000",                 "15,000 Achievement Points"),
-    ("BW",   "BW 4FKDR + 2,000W",          "Bed Wars: 4 FKDR and 2,000 wins"),
-    ("BB",   "BB 50,000",                 "Build Battle: 50,000 score"),
-    ("DU",   "DU 10,000W + 3.5WLR",        "Duels: 10,000 wins and 3.5 WLR"),
-    ("SW",   "SW 2,000W + 2.0KDR",         "SkyWars: 2,000 wins and 2.0 KDR"),
-    ("TNT",  "TNT 1,500W",                 "TNT Games: 1,500 wins"),
-    ("UHC",  "UHC 460",                    "UHC: 460 score"),
-    ("SB",   "SB 200",                     "SkyBlock: 200 levels"),
+# metric -> (blob: "req" player stats | "sb" SkyBlock, key in that blob, type, never decreases, short unit, long unit)
+REQ_METRICS: Dict[str, Tuple[str, str, type, bool, str, str]] = {
+    "ap":         ("req", "ap",         int,   True,  "",     "Achievement Points"),
+    "bw_wins":    ("req", "bw_wins",    int,   True,  "W",    "wins"),
+    "bw_fkdr":    ("req", "bw_fkdr",    float, False, "FKDR", "FKDR"),
+    "bb_score":   ("req", "bb_score",   int,   True,  "",     "score"),
+    "duels_wins": ("req", "duels_wins", int,   True,  "W",    "wins"),
+    "duels_wlr":  ("req", "duels_wlr",  float, False, "WLR",  "WLR"),
+    "sw_wins":    ("req", "sw_wins",    int,   True,  "W",    "wins"),
+    "sw_kdr":     ("req", "sw_kdr",     float, False, "KDR",  "KDR"),
+    "tnt_wins":   ("req", "tnt_wins",   int,   True,  "W",    "wins"),
+    "uhc_score":  ("req", "uhc_score",  int,   True,  "",     "score"),
+    "sb_level":   ("sb",  "level",      int,   True,  "",     "levels"),
+}
+
+# (code, game, mode-count label, colour, [(metric, comparator, threshold), ...]), in display order.
+# Thresholds print as written (4 -> "4FKDR", 2.0 -> "2.0KDR").
+REQUIREMENTS: List[Tuple[str, str, str, str, List[Tuple[str, str, float]]]] = [
+    ("AP",  "",             "ACH PTS",  GREEN,  [("ap", ">=", 15000)]),
+    ("BW",  "Bed Wars",     "BEDWARS",  RED,    [("bw_fkdr", ">=", 4), ("bw_wins", ">=", 2000)]),
+    ("BB",  "Build Battle", "BUILD B",  CYAN,   [("bb_score", ">=", 50000)]),
+    ("DU",  "Duels",        "DUELS",    ORANGE, [("duels_wins", ">=", 10000), ("duels_wlr", ">=", 3.5)]),
+    ("SW",  "SkyWars",      "SKYWARS",  YELLOW, [("sw_wins", ">=", 2000), ("sw_kdr", ">=", 2.0)]),
+    ("TNT", "TNT Games",    "TNT",      CYAN,   [("tnt_wins", ">=", 1500)]),
+    ("UHC", "UHC",          "UHC",      CYAN,   [("uhc_score", ">=", 460)]),
+    ("SB",  "SkyBlock",     "SKYBLOCK", PURPLE, [("sb_level", ">=", 200)]),
 ]
 
+# minimum thresholds only: the adaptive TTL measures how far a stat sits above / below them
+_REQ_COMPARATORS = {">=": operator.ge, ">": operator.gt}
+
+class RequirementRules:
+    """
+    REQUIREMENTS compiled once.
+      - evaluate(): codes one player meets (req blob + SkyBlock level)
+      - evaluate_many() / count_met(): the same over many players, vectorized with numpy when installed
+      - legend (code, short, desc), modes (label, colour) and TTL boundaries from the same conditions
+    """
+
+    __slots__ = ("codes", "legend", "modes", "metrics", "req_ttl_boundaries", "sb_ttl_boundaries", "_checks")
+
+    def __init__(self, requirements: List[Tuple[str, str, str, str, List[Tuple[str, str, float]]]]):
+        self.codes: List[str] = []
+        self.legend: List[Tuple[str, str, str]] = []
+        self.modes: Dict[str, Tuple[str, str]] = {}
+        self.metrics: List[str] = []
+        self.req_ttl_boundaries: List[Tuple[str, List[Tuple[str, float, bool]]]] = []
+        self.sb_ttl_boundaries: List[Tuple[str, List[Tuple[str, float, bool]]]] = []
+        self._checks: List[Tuple[str, List[Tuple[str, str, Any, Any, float]]]] = []
+
+        for code, game, mode, color, conditions in requirements:
+            if code in self.codes:
+                raise ValueError(f"requirement {code} is defined twice")
+            if not conditions:
+                raise ValueError(f"requirement {code} has no conditions")
+            checks = []
+            shorts, longs = [], []
+            ttl: Dict[str, List[Tuple[str, float, bool]]] = {"req": [], "sb": []}
+            for metric, comparator, threshold in conditions:
+                if metric not in REQ_METRICS:
+                    raise ValueError(f"requirement {code}: unknown metric {metric!r}")
+                if comparator not in _REQ_COMPARATORS:
+                    raise ValueError(f"requirement {code}: comparator must be one of {', '.join(_REQ_COMPARATORS)}")
+                blob, key, kind, counter, unit_short, unit_long = REQ_METRICS[metric]
+                cast = _safe_float if kind is float else _safe_int
+                checks.append((blob, key, cast, _REQ_COMPARATORS[comparator], threshold))
+                shorts.append(f"{threshold:,}{unit_short}")
+                longs.append(f"{threshold:,} {unit_long}")
+                ttl[blob].append((key, threshold, counter))
+                if metric not in self.metrics:
+                    self.metrics.append(metric)
+
+            self.codes.append(code)
+            self._checks.append((code, checks))
+            desc = " and ".join(longs)
+            self.legend.append((code, f"{code} {' + '.join(shorts)}", f"{game}: {desc}" if game else desc))
+            self.modes[code] = (mode, color)
+            # a requirement mixing player and SkyBlock stats is tracked per blob
+            if ttl["req"]:
+                self.req_ttl_boundaries.append((code, ttl["req"]))
+            if ttl["sb"]:
+                self.sb_ttl_boundaries.append((code, ttl["sb"]))
+
+    def evaluate(self, req_blob: Dict[str, Any], sb_level: int) -> List[str]:
+        blobs = {"req": req_blob or {}, "sb": {"level": sb_level}}
+        return [
+            code for code, checks in self._checks
+            if all(op(cast(blobs[blob].get(key, 0), 0), threshold) for blob, key, cast, op, threshold in checks)
+        ]
+
+    def evaluate_many(self, stats: List[Tuple[Dict[str, Any], int]]) -> Dict[str, Any]:
+        """
+        {code: met per player} for (req blob, SkyBlock level) pairs: numpy bool arrays, or lists without numpy.
+        """
+        np = _numpy.value
+        columns: Dict[Tuple[str, str], Any] = {}
+        for _, checks in self._checks:
+            for blob, key, cast, _, _ in checks:
+                if (blob, key) in columns:
+                    continue
+                if blob == "sb":
+                    vals = [cast(level, 0) for _, level in stats]
+                else:
+                    vals = [cast((req or {}).get(key, 0), 0) for req, _ in stats]
+                columns[(blob, key)] = np.array(vals, dtype=np.float64 if cast is _safe_float else np.int64) if np else vals
+
+        out: Dict[str, Any] = {}
+        for code, checks in self._checks:
+            met = None
+            for blob, key, _, op, threshold in checks:
+                col = columns[(blob, key)]
+                if np:
+                    hit = op(col, threshold)
+                    met = hit if met is None else met & hit
+                else:
+                    hit = [op(v, threshold) for v in col]
+                    met = hit if met is None else [a and b for a, b in zip(met, hit)]
+            out[code] = met
+        return out
+
+    def count_met(self, stats: List[Tuple[Dict[str, Any], int]]) -> Dict[str, int]:
+        return {code: int(sum(met)) if isinstance(met, list) else int(met.sum())
+                for code, met in self.evaluate_many(stats).items()}
+
+_REQUIREMENT_RULES: Optional[RequirementRules] = None
+
+def requirement_rules() -> RequirementRules:
+    global _REQUIREMENT_RULES
+    if _REQUIREMENT_RULES is None:
+        _REQUIREMENT_RULES = RequirementRules(REQUIREMENTS)
+    return _REQUIREMENT_RULES
+
+def _real_reqs_from_stats(req_blob: Dict[str, Any], sb_level: int) -> List[str]:
+    return requirement_rules().evaluate(req_blob, sb_level)
+
 def _compute_real_reqs(uuid: str) -> List[str]:
     uuid = _normalize_uuid(uuid)
     if not ENABLE_REQUIREMENT_CHECKS or not uuid:
         return []
 
-    out_codes: List[str] = []
     req_blob = get_player_requirements_blob(uuid)
-
-    ap = _safe_int(req_blob.get("ap", 0), 0)
-    bw_wins = _safe_int(req_blob.get("bw_wins", 0), 0)
-    bw_fkdr = _safe_float(req_blob.get("bw_fkdr", 0.0), 0.0)
-    bb_score = _safe_int(req_blob.get("bb_score", 0), 0)
-    du_wins = _safe_int(req_blob.get("duels_wins", 0), 0)
-    du_wlr = _safe_float(req_blob.get("duels_wlr", 0.0), 0.0)
-    sw_wins = _safe_int(req_blob.get("sw_wins", 0), 0)
-    sw_kdr = _safe_float(req_blob.get("sw_kdr", 0.0), 0.0)
-    tnt_wins = _safe_int(req_blob.get("tnt_wins", 0), 0)
-    uhc_score = _safe_int(req_blob.get("uhc_score", 0), 0)
     sb_level = get_skyblock_level(uuid) if ENABLE_SKYBLOCK_LEVEL else 0
+    return _real_reqs_from_stats(req_blob, sb_level)
+
+async def _compute_real_reqs_async(uuid: str) -> List[str]:
+    uuid = _normalize_uuid(uuid)
+    if not ENABLE_REQUIREMENT_CHECKS or not uuid:
+        return []
 
-    if ap >= 15000:
-        out_codes.append("AP")
-    if bw_wins >= 2000 and bw_fkdr >= 4.0:
-        out_codes.append("BW")
-    if bb_score >= 50000:
-        out_codes.append("BB")
-    if du_wins >= 10000 and du_wlr >= 3.5:
-        out_codes.append("DU")
-    if sw_wins >= 2000 and sw_kdr >= 2.0:
-        out_codes.append("SW")
-    if tnt_wins >= 1500:
-        out_codes.append("TNT")
-    if uhc_score >= 460:
-        out_codes.append("UHC")
-    if sb_level >= 200:
-        out_codes.append("SB")
-
-    return out_codes
+    req_blob = await get_player_requirements_blob_async(uuid)
+    sb_level = (await get_skyblock_level_async(uuid)) if ENABLE_SKYBLOCK_LEVEL else 0
+    return _real_reqs_from_stats(req_blob, sb_level)
 
 def _reqs_to_str(codes: List[str]) -> str:
     return "-" if not codes else ",".join(codes)
 
+def _fetch_member_requirements(uuid: str) -> Tuple[List[str], Dict[str, Any]]:
+    """
+    Same calls, same order as the serial loop used to make for one member.
+    Safe to run from worker threads (each worker owns a distinct UUID).
+    """
+    real = _compute_real_reqs(uuid) if ENABLE_REQUIREMENT_CHECKS else []
+    req_blob = get_player_requirements_blob(uuid) if ENABLE_REQUIREMENT_CHECKS else {}
+    return real, req_blob
+
+def _fetch_requirements_concurrently(uuids: List[str], workers: int = REQ_SCAN_WORKERS) -> Dict[str, Tuple[List[str], Dict[str, Any]]]:
+    """
+    Runs _fetch_member_requirements over unique UUIDs with a bounded pool.
+    All workers share the Hypixel token bucket, so pacing is unchanged.
+    """
+    unique: List[str] = []
+    seen = set()
+    for u in uuids:
+        if u and u not in seen:
+            seen.add(u)
+            unique.append(u)
+
+    results: Dict[str, Tuple[List[str], Dict[str, Any]]] = {}
+    if not unique:
+        return results
+
+    done = 0
+    with ThreadPoolExecutor(max_workers=max(min(int(workers), len(unique)), 1)) as pool:
+        futures = {pool.submit(_fetch_member_requirements, u): u for u in unique}
+        for fut in as_completed(futures):
+            results[futures[fut]] = fut.result()
+            done += 1
+            if done % 25 == 0:
+                print(f"{DIM}{GRAY}... requirements {done}/{len(unique)}{RESET}")
+    return results
+
+async def _fetch_member_requirements_async(uuid: str) -> Tuple[List[str], Dict[str, Any]]:
+    real = (await _compute_real_reqs_async(uuid)) if ENABLE_REQUIREMENT_CHECKS else []
+    req_blob = (await get_player_requirements_blob_async(uuid)) if ENABLE_REQUIREMENT_CHECKS else {}
+    return real, req_blob
+
+async def fetch_requirements_async(uuids: List[str], max_in_flight: int = ASYNC_MAX_IN_FLIGHT) -> Dict[str, Tuple[List[str], Dict[str, Any]]]:
+    """
+    Async counterpart of _fetch_requirements_concurrently: up to `max_in_flight`
+    members are in progress at once, all paced by the shared Hypixel bucket.
+    """
+    unique: List[str] = []
+    seen = set()
+    for u in uuids:
+        if u and u not in seen:
+            seen.add(u)
+            unique.append(u)
+
+    results: Dict[str, Tuple[List[str], Dict[str, Any]]] = {}
+    if not unique:
+        return results
+
+    sem = asyncio.Semaphore(max(int(max_in_flight), 1))
+    done = 0
+
+    async def one(u: str) -> None:
+        nonlocal done
+        async with sem:
+            results[u] = await _fetch_member_requirements_async(u)
+        done += 1
+        if done % 25 == 0:
+            print(f"{DIM}{GRAY}... requirements {done}/{len(unique)}{RESET}")
+
+    await asyncio.gather(*(one(u) for u in unique))
+    return results
+
 def apply_requirements_to_members(members: List[Dict[str, Any]]) -> None:
+    prefetched: Dict[str, Tuple[List[str], Dict[str, Any]]] = {}
+    _REFRESHER.begin_pass()
+    if ENABLE_REQUIREMENT_CHECKS:
+        uuids = [_normalize_uuid(m.get("uuid") or "") for m in members]
+        if _use_async_engine():
+            prefetched = run_async(fetch_requirements_async(uuids))
+        elif REQ_SCAN_WORKERS > 1:
+            prefetched = _fetch_requirements_concurrently(uuids)
+
     for i, m in enumerate(members, start=1):
         uuid = _normalize_uuid(m.get("uuid") or "")
         if not uuid:
@@ -999,12 +3964,16 @@ def apply_requirements_to_members(members: List[Dict[str, Any]]) -> None:
             m["reqs_met_count"] = 0
             m["pseudo_codes"] = []
             m["real_reqs_count"] = 0
+            m["stale"] = False
 
             continue
 
         pseudo = get_member_pseudo_codes(uuid)
         m["pseudo_codes"] = pseudo[:]
-        real = _compute_real_reqs(uuid) if ENABLE_REQUIREMENT_CHECKS else []
+        if uuid in prefetched:
+            real, req_blob = prefetched[uuid]
+        else:
+            real, req_blob = _fetch_member_requirements(uuid)
         m["real_reqs_count"] = len(real)   # ✅ real-only (excluding pseudo)
         combined = list(real)
 
@@ -1013,29 +3982,352 @@ def apply_requirements_to_members(members: List[Dict[str, Any]]) -> None:
                 combined.append(c)
 
         if ENABLE_REQUIREMENT_CHECKS:
-            req_blob = get_player_requirements_blob(uuid)
             m["bw_wins"] = _safe_int(req_blob.get("bw_wins", 0), 0)
 
         m["reqs_met"] = _reqs_to_str(combined)
         m["reqs_met_count"] = len(combined)
+        m["stale"] = _REFRESHER.served_stale(uuid)
 
-        if ENABLE_REQUIREMENT_CHECKS and (i % 25 == 0):
+        if ENABLE_REQUIREMENT_CHECKS and not prefetched and (i % 25 == 0):
             print(f"{DIM}{GRAY}... requirements {i}/{len(members)}{RESET}")
 
+# ============================================================
+# ADAPTIVE CACHE TTL (ADAPTIVE_TTL=1)
+#   a cached blob lives longer the further its stats sit from any boundary
+#   that could change a requirement or the BW wins bonus
+# ============================================================
+def _boundary_distance(blob: Dict[str, Any], parts: List[Tuple[str, float, bool]]) -> float:
+    """
+    Relative distance before one all-of condition could flip.
+      - met: the closest part that can still drop (counters never do)
+      - unmet: the furthest part still short, since all of them have to be crossed
+    """
+    gaps = []
+    for field, threshold, monotonic in parts:
+        value = _safe_float(blob.get(field, 0), 0.0)
+        gaps.append(((value - threshold) / threshold if threshold else 0.0, monotonic))
+
+    if all(g >= 0 for g, _ in gaps):
+        falling = [g for g, monotonic in gaps if not monotonic]
+        return min(falling) if falling else float("inf")
+    return max(-g for g, _ in gaps if g < 0)
+
+def _ttl_jitter(uuid: str, fetched_at: int) -> float:
+    # stable for one fetch, so the expiry doesn't move between lookups
+    h = hashlib.blake2b(f"{uuid}:{fetched_at}".encode("utf-8"), digest_size=4).digest()
+    u = int.from_bytes(h, "big") / 0xFFFFFFFF
+    return 1.0 + ADAPTIVE_TTL_JITTER * (2.0 * u - 1.0)
+
+def _ttl_from_distance(uuid: str, fetched_at: int, distance: float, flat_hours: float) -> int:
+    far = max(ADAPTIVE_TTL_FAR, 1e-9)
+    t = min(max(distance / far, 0.0), 1.0)
+    cap = ADAPTIVE_TTL_MAX_HOURS or flat_hours
+    lo = min(ADAPTIVE_TTL_MIN_HOURS, cap)
+    hours = lo + (cap - lo) * t
+    # jitter spreads expiries but never past the cap
+    return int(min(hours * _ttl_jitter(uuid, fetched_at), cap) * 3600)
+
+def req_ttl_s(uuid: str, req_blob: Dict[str, Any]) -> int:
+    if not ADAPTIVE_TTL:
+        return PLAYER_CACHE_TTL_HOURS * 3600
+    # (code, [(blob field, threshold, never decreases)]) from the compiled requirements + BW wins bonus tiers
+    boundaries = requirement_rules().req_ttl_boundaries + kick_rules().bw_ttl_boundaries
+    distance = min(_boundary_distance(req_blob, parts) for _, parts in boundaries)
+    return _ttl_from_distance(uuid, _safe_int(req_blob.get("fetched_at", 0), 0), distance, PLAYER_CACHE_TTL_HOURS)
+
+def sb_ttl_s(uuid: str, sb_blob: Dict[str, Any]) -> int:
+    if not ADAPTIVE_TTL:
+        return SKYBLOCK_CACHE_TTL_HOURS * 3600
+    parts = requirement_rules().sb_ttl_boundaries
+    distance = min((_boundary_distance(sb_blob, p) for _, p in parts), default=float("inf"))
+    return _ttl_from_distance(uuid, _safe_int(sb_blob.get("fetched_at", 0), 0), distance, SKYBLOCK_CACHE_TTL_HOURS)
+
+# ============================================================
+# KICK SCORING RULES (kick_rules.json)
+#   the policy officers tune: validated and compiled once into sorted
+#   breakpoint tables, re-read when the file changes (KICK_RULES_RELOAD=1)
+# ============================================================
+# Same policy as the shipped kick_rules.json; used when the file is missing.
+DEFAULT_KICK_RULES: Dict[str, Any] = {
+    "rank_points": {
+        "Guild Master": {"points": 10000, "label": "Rank (protected)"},
+        "Master": {"points": 10000, "label": "Rank (protected)"},
+        "Senate": {"points": 10000, "label": "Rank (protected)"},
+        "Elder": {"points": 5, "label": "Rank (Elder)", "detail": ""},
+    },
+    "tenure_days": [
+        {"max": 6, "points": 0, "detail": ""},
+        {"max": 30, "points": -1, "detail": "7–30 days"},
+        {"max": 180, "points": 0, "detail": ""},
+        {"max": 364, "points": 2, "detail": "6 Months to 1 Year"},
+        {"max": None, "points": 0, "detail": "1+ year (no extra tenure bonus)"},
+    ],
+    "predicted_gexp": [
+        {"max": -1, "points": 0, "detail": None},
+        {"max": 0, "points": -15, "detail": "0"},
+        {"max": 7500, "points": -12, "detail": "1–7,500"},
+        {"max": 15000, "points": -9, "detail": "7,501–15,000"},
+        {"max": 25000, "points": -6, "detail": "15,001–25,000"},
+        {"max": 35000, "points": -3, "detail": "25,001–35,000"},
+        {"max": 50000, "points": -1, "detail": "35,001–50,000"},
+        {"max": None, "points": 0, "detail": None},
+    ],
+    "zero_reqs_penalty": -3,
+    "pseudo_bonuses": {"LB": 10},
+    "pseudo_min_bonuses": {"LB": 10},
+    "bw_wins_bonus": [{"min": 8000, "bonus": 1}, {"min": 10000, "bonus": 2}],
+    "candidate_pools": [50000, 100000],
+}
+
+def _is_int(x: Any) -> bool:
+    return isinstance(x, int) and not isinstance(x, bool)
+
+def _compile_bands(data: Any, key: str, errors: List[str]) -> Tuple[List[float], List[Tuple[int, Optional[str]]]]:
+    """
+    [{"max", "points", "detail"}, ...] -> (inclusive upper bounds, (points, detail) per band).
+    """
+    bands = data.get(key)
+    if not isinstance(bands, list) or not bands:
+        errors.append(f"{key}: expected a non-empty list of bands")
+        return [], []
+
+    bounds: List[float] = []
+    entries: List[Tuple[int, Optional[str]]] = []
+    for n, band in enumerate(bands):
+        where = f"{key}[{n}]"
+        if not isinstance(band, dict):
+            errors.append(f"{where}: expected an object")
+            continue
+        top = band.get("max")
+        last = n == len(bands) - 1
+        if last and top is not None:
+            errors.append(f"{where}: the last band needs \"max\": null")
+        elif not last and not _is_int(top):
+            errors.append(f"{where}: \"max\" must be an integer")
+        elif bounds and _is_int(top) and top <= bounds[-1]:
+            errors.append(f"{where}: \"max\" {top} must be above the previous band's {int(bounds[-1])}")
+        if not _is_int(band.get("points")):
+            errors.append(f"{where}: \"points\" must be an integer")
+        detail = band.get("detail")
+        if detail is not None and not isinstance(detail, str):
+            errors.append(f"{where}: \"detail\" must be a string or null")
+        bounds.append(float("inf") if top is None else top)
+        entries.append((band.get("points") if _is_int(band.get("points")) else 0, detail))
+    return bounds, entries
+
+def _compile_code_ints(data: Any, key: str, errors: List[str]) -> Dict[str, int]:
+    raw = data.get(key, {})
+    if not isinstance(raw, dict):
+        errors.append(f"{key}: expected an object of code -> integer")
+        return {}
+    out: Dict[str, int] = {}
+    for code, v in raw.items():
+        if not _is_int(v):
+            errors.append(f"{key}.{code}: must be an integer")
+        elif not _normalize_code(str(code)):
+            errors.append(f"{key}: {code!r} is not a valid pseudo code")
+        else:
+            out[_normalize_code(str(code))] = v
+    return out
+
+class KickRules:
+    """
+    kick_rules.json compiled for lookups.
+      - bands: sorted inclusive upper bounds, read with bisect_left
+      - BW wins tiers: sorted lower bounds, read with bisect_right
+    """
+
+    __slots__ = ("source", "mtime", "rank_points", "tenure_bounds", "tenure", "gexp_bounds", "gexp",
+                 "zero_reqs_penalty", "pseudo_bonuses", "pseudo_min_bonuses", "bw_mins", "bw_bonuses",
+                 "bw_margin", "bw_ttl_boundaries", "pools", "_arrays")
+
+    def __init__(self, data: Any, source: str = "built-in", mtime: float = 0.0):
+        errors: List[str] = []
+        if not isinstance(data, dict):
+            raise ValueError("expected a JSON object at the top level")
+
+        # every policy key must be spelled out: a typo or a deleted key would otherwise quietly score as 0 / empty
+        for key in data:
+            if key != "_doc" and key not in DEFAULT_KICK_RULES:
+                close = difflib.get_close_matches(str(key), list(DEFAULT_KICK_RULES), n=1)
+                errors.append(f"{key}: unknown key" + (f" (did you mean \"{close[0]}\"?)" if close else ""))
+        for key in DEFAULT_KICK_RULES:
+            if key not in data:
+                errors.append(f"{key}: missing")
+
+        self.rank_points: Dict[str, Tuple[str, int, Optional[str]]] = {}
+        ranks = data.get("rank_points", {})
+        if not isinstance(ranks, dict):
+            errors.append("rank_points: expected an object of rank -> {points, label}")
+            ranks = {}
+        for rank, spec in ranks.items():
+            spec = spec if isinstance(spec, dict) else {}
+            label = spec.get("label", "Rank")
+            detail = spec.get("detail")
+            if not _is_int(spec.get("points")):
+                errors.append(f"rank_points.{rank}: \"points\" must be an integer")
+            elif not isinstance(label, str) or not label.startswith("Rank"):
+                errors.append(f"rank_points.{rank}: \"label\" must be a string starting with \"Rank\"")
+            elif detail is not None and not isinstance(detail, str):
+                errors.append(f"rank_points.{rank}: \"detail\" must be a string (omit it to show the rank)")
+            else:
+                self.rank_points[str(rank)] = (label, spec["points"], detail)
+
+        self.tenure_bounds, self.tenure = _compile_bands(data, "tenure_days", errors)
+        self.gexp_bounds, self.gexp = _compile_bands(data, "predicted_gexp", errors)
+
+        self.zero_reqs_penalty = data.get("zero_reqs_penalty", 0)
+        if not _is_int(self.zero_reqs_penalty):
+            errors.append("zero_reqs_penalty: must be an integer")
+
+        self.pseudo_bonuses = _compile_code_ints(data, "pseudo_bonuses", errors)
+        self.pseudo_min_bonuses = _compile_code_ints(data, "pseudo_min_bonuses", errors)
+
+        tiers = data.get("bw_wins_bonus", [])
+        self.bw_mins: List[int] = []
+        self.bw_bonuses: List[int] = []
+        if not isinstance(tiers, list):
+            errors.append("bw_wins_bonus: expected a list of {min, bonus}")
+            tiers = []
+        for n, tier in enumerate(tiers):
+            tier = tier if isinstance(tier, dict) else {}
+            lo, bonus = tier.get("min"), tier.get("bonus")
+            if not _is_int(lo) or lo < 0 or not _is_int(bonus):
+                errors.append(f"bw_wins_bonus[{n}]: needs integer \"min\" (>= 0) and \"bonus\"")
+            elif self.bw_mins and lo <= self.bw_mins[-1]:
+                errors.append(f"bw_wins_bonus[{n}]: \"min\" {lo} must be above the previous tier's {self.bw_mins[-1]}")
+            else:
+                self.bw_mins.append(lo)
+                self.bw_bonuses.append(bonus)
+        # the bonus can move a member by at most this much, which bounds the top-10 window
+        self.bw_margin = max(self.bw_bonuses + [0]) - min(self.bw_bonuses + [0])
+        self.bw_ttl_boundaries: List[Tuple[str, List[Tuple[str, float, bool]]]] = [
+            (f"BW{b:+d}", [("bw_wins", lo, True)]) for lo, b in zip(self.bw_mins, self.bw_bonuses)
+        ]
+
+        pools = data.get("candidate_pools", [])
+        if (not isinstance(pools, list) or not all(_is_int(x) for x in pools)
+                or any(b <= a for a, b in zip(pools, pools[1:]))):
+            errors.append("candidate_pools: expected increasing integers (predicted GEXP limits)")
+            pools = []
+        self.pools: List[int] = list(pools)
+
+        if errors:
+            raise ValueError("; ".join(errors))
+        self.source = source
+        self.mtime = mtime
+        self._arrays: Any = None
+
+    def tenure_band(self, days: int) -> Tuple[int, Optional[str]]:
+        return self.tenure[bisect_left(self.tenure_bounds, days)]
+
+    def gexp_band(self, gexp: int) -> Tuple[int, Optional[str]]:
+        return self.gexp[bisect_left(self.gexp_bounds, gexp)]
+
+    def bw_bonus(self, wins: int) -> int:
+        k = bisect_right(self.bw_mins, wins)
+        return self.bw_bonuses[k - 1] if k else 0
+
+    def pseudo_bonus(self, code: str) -> int:
+        bonus = self.pseudo_bonuses.get(code, 0)
+        if code in self.pseudo_min_bonuses:
+            bonus = max(bonus, self.pseudo_min_bonuses[code])
+        return bonus
+
+    def band_arrays(self, np: Any) -> Tuple[Any, Any, Any, Any]:
+        # (tenure bounds, tenure points, gexp bounds, gexp points) for np.searchsorted; built once
+        if self._arrays is None:
+            self._arrays = (
+                np.array(self.tenure_bounds, dtype=np.float64),
+                np.array([pts for pts, _ in self.tenure], dtype=np.int64),
+                np.array(self.gexp_bounds, dtype=np.float64),
+                np.array([pts for pts, _ in self.gexp], dtype=np.int64),
+            )
+        return self._arrays
+
+def _file_mtime(path: str) -> float:
+    try:
+        return os.stat(path).st_mtime
+    except OSError:
+        return 0.0
+
+def load_kick_rules(path: str) -> KickRules:
+    """
+    Compiled rules from `path` (built-in defaults when it doesn't exist); ValueError when invalid.
+    """
+    mtime = _file_mtime(path)
+    if not mtime:
+        return KickRules(DEFAULT_KICK_RULES, "built-in", 0.0)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        raise ValueError(f"cannot read JSON: {e}")
+    return KickRules(data, os.path.basename(path), mtime)
+
+_KICK_RULES: Optional[KickRules] = None
+_KICK_RULES_CHECKED = 0.0
+_KICK_RULES_LOCK = threading.Lock()
+
+def kick_rules() -> KickRules:
+    """
+    Current rules: compiled on first use, recompiled when KICK_RULES_FILE changes
+    (looked at most once a second). A broken edit keeps the last good rules.
+    """
+    global _KICK_RULES, _KICK_RULES_CHECKED
+    now = time.monotonic()
+    if _KICK_RULES is not None and (not KICK_RULES_RELOAD or now - _KICK_RULES_CHECKED < 1.0):
+        return _KICK_RULES
+    with _KICK_RULES_LOCK:
+        _KICK_RULES_CHECKED = now
+        mtime = _file_mtime(KICK_RULES_FILE)
+        if _KICK_RULES is not None and mtime == _KICK_RULES.mtime:
+            return _KICK_RULES
+        try:
+            rules = load_kick_rules(KICK_RULES_FILE)
+            if _KICK_RULES is not None:
+                print(f"{DIM}{GREEN}Reloaded kick rules from {rules.source}.{RESET}")
+            _KICK_RULES = rules
+        except ValueError as e:
+            keep = "previous rules" if _KICK_RULES is not None else "built-in defaults"
+            print(f"{RED}{os.path.basename(KICK_RULES_FILE)} is invalid ({e}); keeping the {keep}.{RESET}")
+            if _KICK_RULES is None:
+                _KICK_RULES = KickRules(DEFAULT_KICK_RULES, "built-in", 0.0)
+            _KICK_RULES.mtime = mtime  # don't report the same broken file again
+    return _KICK_RULES
+
+def print_kick_rules(rules: KickRules) -> None:
+    section_break(f"KICK RULES ({rules.source})", color=PURPLE)
+
+    def bands(title: str, bounds: List[float], entries: List[Tuple[int, Optional[str]]]) -> None:
+        print(f"{DIM}{WHITE}{title}:{RESET}")
+        lo = "-∞"
+        for top, (pts, detail) in zip(bounds, entries):
+            hi = "∞" if top == float("inf") else f"{int(top):,}"
+            shown = f"{DIM}{detail}{RESET}" if detail else ""
+            print(f"  {GRAY}{lo:>8} … {hi:<8}{RESET} {_delta_str(pts):>6}  {shown}")
+            lo = "∞" if top == float("inf") else f"{int(top) + 1:,}"
+
+    print(f"{DIM}{WHITE}Rank points:{RESET}")
+    for rank, (label, pts, _) in rules.rank_points.items():
+        print(f"  {CYAN}{rank:<14}{RESET} {_delta_str(pts):>6}  {DIM}{label}{RESET}")
+    bands("Tenure (days in guild)", rules.tenure_bounds, rules.tenure)
+    bands("Predicted GEXP", rules.gexp_bounds, rules.gexp)
+    print(f"{DIM}{WHITE}Zero requirements:{RESET} {_delta_str(rules.zero_reqs_penalty)}")
+    codes = sorted(set(rules.pseudo_bonuses) | set(rules.pseudo_min_bonuses))
+    print(f"{DIM}{WHITE}Pseudo bonuses:{RESET} " + (", ".join(f"{c} {_delta_str(rules.pseudo_bonus(c))}" for c in codes) or "-"))
+    print(f"{DIM}{WHITE}BW wins bonus:{RESET} "
+          + (", ".join(f"{lo:,}+ wins {_delta_str(b)}" for lo, b in zip(rules.bw_mins, rules.bw_bonuses)) or "-"))
+    print(f"{DIM}{WHITE}Candidate pools:{RESET} " + (", ".join(f"<{p:,}" for p in rules.pools) + ", everyone"))
+    print()
+
 # ============================================================
 # KICK RECOMMENDATION (with breakdown)
 # ============================================================
-def bedwars_wins_bonus(wins: int) -> int:
-    wins = _safe_int(wins, 0)
-    if wins >= 10000:
-        return 2
-    if 8000 <= wins <= 9999:
-        return 1
-    elif wins >8000:
-        return 0
-    
+def bedwars_wins_bonus(wins: int, rules: Optional["KickRules"] = None) -> int:
+    return (rules or kick_rules()).bw_bonus(_safe_int(wins, 0))
 
-def _apply_bw_bonus(m: Dict[str, Any], breakdown: List[Dict[str, Any]]) -> int:
+def _apply_bw_bonus(m: Dict[str, Any], breakdown: List[Dict[str, Any]], rules: Optional["KickRules"] = None) -> int:
     if not ENABLE_BEDWARS_WINS:
         m["bw_wins"] = 0
         m["bw_bonus"] = 0
@@ -1045,7 +4337,7 @@ def _apply_bw_bonus(m: Dict[str, Any], breakdown: List[Dict[str, Any]]) -> int:
     uuid = _normalize_uuid(m.get("uuid") or "")
     wins = get_bedwars_wins(uuid) if uuid else 0
 
-    bonus = _safe_int(bedwars_wins_bonus(wins), 0)  # ✅ hard guarantee int
+    bonus = _safe_int(bedwars_wins_bonus(wins, rules), 0)  # ✅ hard guarantee int
     m["bw_wins"] = wins
     m["bw_bonus"] = bonus
     breakdown.append({"label": "BW Wins", "delta": bonus, "detail": f"{wins:,} wins"})
@@ -1054,141 +4346,525 @@ def _apply_bw_bonus(m: Dict[str, Any], breakdown: List[Dict[str, Any]]) -> int:
 def _score_entry(label: str, delta: int, detail: str = "") -> Dict[str, Any]:
     return {"label": label, "delta": int(delta), "detail": str(detail)}
 
-def recommend_kicks(members: List[Dict[str, Any]], min_days_in_guild: int = 0) -> List[Dict[str, Any]]:
-    candidates: List[Dict[str, Any]] = []
-    nine_months_days = 30 * 9
-    six_months_days = 30 * 6
-    three_months_days = 30 * 3
+def _row_pseudo_codes(cols: Dict[str, Any], i: int) -> List[str]:
+    codes = cols["pseudo_codes"][i]
+    if not isinstance(codes, list):
+        codes = get_member_pseudo_codes(_normalize_uuid(cols["uuid"][i] or ""))
+    return codes or []
 
-    for m in members:
-        if str(m.get("ign", "")).lower() == "undisplayed":
+def _kick_score(table: MemberTable, i: int, breakdown: Optional[List[Dict[str, Any]]] = None,
+                rules: Optional[KickRules] = None) -> int:
+    """
+    Kick priority of row i before the BW bonus; fills `breakdown` when one is passed.
+    """
+    rules = rules or kick_rules()
+    cols = table.columns
+
+    def note(label: str, delta: int, detail: str) -> None:
+        if breakdown is not None:
+            breakdown.append(_score_entry(label, delta, detail))
+
+    priority = 0
+
+    rank = cols["rank"][i]
+    if rank in rules.rank_points:
+        label, delta, detail = rules.rank_points[rank]
+        priority += delta
+        note(label, delta, rank if detail is None else detail)
+
+    # bands: a null detail leaves a 0-point line off the card; scoring bands always show, so the card adds up
+    delta, detail = rules.tenure_band(int(cols["days_in_guild"][i]))
+    priority += delta
+    if detail is not None or delta:
+        note("Tenure", delta, detail or "")
+
+    delta, detail = rules.gexp_band(int(cols["predicted_gexp"][i]))
+    priority += delta
+    if detail is not None or delta:
+        note("Pred GEXP", delta, detail or "")
+
+    pseudo_codes = _row_pseudo_codes(cols, i)
+    pseudo_bonus = _pseudo_priority_bonus_for_codes(pseudo_codes, rules)
+    priority += pseudo_bonus
+    note("Pseudo bonus", pseudo_bonus, _pseudo_bonus_detail(pseudo_codes, rules) if pseudo_bonus else "")
+
+    req_count = int(cols["reqs_met_count"][i])
+    req_bonus = rules.zero_reqs_penalty if req_count == 0 else 0
+    priority += req_bonus
+    note("Reqs", req_bonus, "no reqs" if req_count == 0 else f"{req_count} met")
+
+    return priority
+
+# ============================================================
+# KICK SCORING ENGINE (KICK_SCORE_ENGINE=auto|numpy|python)
+#   base priorities for many rows at once: numpy looks every band up over
+#   whole columns; the python engine scores row by row with the same tables
+# ============================================================
+def _load_numpy() -> Any:
+    try:
+        import numpy  # optional: vectorized kick scoring
+    except ImportError:
+        if KICK_SCORE_ENGINE == "numpy":
+            print(f"{YELLOW}KICK_SCORE_ENGINE=numpy but numpy is not installed; using the python engine.{RESET}")
+        return None
+    return numpy
+
+_numpy = _Lazy("numpy", _load_numpy)
+
+def kick_score_engine() -> str:
+    if KICK_SCORE_ENGINE == "python":
+        return "python"
+    return "numpy" if _numpy.value is not None else "python"
+
+def _kick_scores_numpy(np: Any, table: MemberTable, rows: List[int], rules: KickRules) -> Any:
+    cols = table.columns
+    idx = np.asarray(rows, dtype=np.int64)
+    days = np.frombuffer(cols["days_in_guild"], dtype=np.int64)[idx]
+    gexp = np.frombuffer(cols["predicted_gexp"], dtype=np.int64)[idx]
+    reqs = np.frombuffer(cols["reqs_met_count"], dtype=np.int64)[idx]
+
+    rank_points = {rank: delta for rank, (_, delta, _) in rules.rank_points.items()}
+    ranks = cols["rank"]
+    priority = np.fromiter((rank_points.get(ranks[i], 0) for i in rows), dtype=np.int64, count=len(rows))
+
+    tenure_bounds, tenure_points, gexp_bounds, gexp_points = rules.band_arrays(np)
+    priority += tenure_points[np.searchsorted(tenure_bounds, days, side="left")]
+    priority += gexp_points[np.searchsorted(gexp_bounds, gexp, side="left")]
+
+    # pseudo codes are rare: only rows that carry any (or aren't filled in yet) go through the lookup
+    codes = cols["pseudo_codes"]
+    for k, i in enumerate(rows):
+        if codes[i] != []:
+            priority[k] += _pseudo_priority_bonus_for_codes(_row_pseudo_codes(cols, i), rules)
+
+    priority += np.where(reqs == 0, rules.zero_reqs_penalty, 0)
+    return priority
+
+def _kick_scores_python(table: MemberTable, rows: List[int], rules: KickRules) -> List[int]:
+    return [_kick_score(table, i, None, rules) for i in rows]
+
+def kick_scores(table: MemberTable, rows: List[int], rules: Optional[KickRules] = None) -> Any:
+    """
+    Base kick priority (no BW bonus) for each row, in order: numpy int64 array or list.
+    """
+    rules = rules or kick_rules()
+    if rows and kick_score_engine() == "numpy":
+        return _kick_scores_numpy(_numpy.value, table, rows, rules)
+    return _kick_scores_python(table, rows, rules)
+
+def _kick_window(base: Any, margin: int, k: int = 10) -> List[int]:
+    """
+    Positions (in order) that can still reach the top k once at most `margin` is added:
+    anything scoring above the k-th lowest base + margin is beaten by those k.
+    """
+    n = len(base)
+    if k <= 0:
+        return []
+    if n <= k:
+        return list(range(n))
+    if kick_score_engine() == "numpy" and not isinstance(base, list):
+        np = _numpy.value
+        kth = int(np.partition(base, k - 1)[k - 1])
+        return np.flatnonzero(base <= kth + margin).tolist()
+    kth = heapq.nsmallest(k, base)[-1]
+    return [p for p, v in enumerate(base) if v <= kth + margin]
+
+KICK_TOP_N = 10           # members per wave
+KICK_WAVE_1_MIN_DAYS = 0
+KICK_WAVE_2_MIN_DAYS = 8  # wave 2: joined > 7 days
+
+def _rank_kicks(table: MemberTable, rows: List[int], min_days_in_guild: int, top_n: int,
+                rules: KickRules, bw_wins: Optional[Callable[[str], int]]) -> List[Tuple[int, int, int]]:
+    """
+    (priority incl. BW bonus, predicted GEXP, row) of the top_n kick candidates, best first.
+    bw_wins(uuid) supplies BW wins; None = BW bonus disabled.
+    """
+    cols = table.columns
+    igns, uuids, days, predicted = cols["ign"], cols["uuid"], cols["days_in_guild"], cols["predicted_gexp"]
+    whitelist = set(KICK_WHITELIST.get("uuids", []) or [])
+
+    candidates: List[int] = []
+    for i in rows:
+        if str(igns[i]).lower() == "undisplayed":
             continue
 
         # ✅ Permanent whitelist: never include in kick candidates
-        if is_whitelisted_member(m):
+        if _normalize_uuid(str(uuids[i] or "")) in whitelist:
             continue
 
-        if int(m.get("days_in_guild", 0)) < int(min_days_in_guild):
+        if int(days[i]) < int(min_days_in_guild):
             continue
 
-        breakdown: List[Dict[str, Any]] = []
-        gexp = int(m.get("predicted_gexp", 0))
-        priority = 0
-
-        if m["rank"] in ["Guild Master", "Master", "Senate"]:
-            priority += 10000
-            breakdown.append(_score_entry("Rank (protected)", +10000, m["rank"]))
-        elif m["rank"] == "Elder":
-            priority += 5
-            breakdown.append(_score_entry("Rank (Elder)", +5, ""))
+        candidates.append(i)
 
-        d = int(m.get("days_in_guild", 0))
+    # ------------------------------------------------------------
+    # Candidate pool selection (candidate_pools, default 50k / 100k):
+    #   Prefer <50k predicted GEXP, but if that yields <top_n members,
+    #   top-up from <100k, then from everyone if still short.
+    # ------------------------------------------------------------
+    limits: List[Optional[int]] = [*rules.pools, None]
+    first = limits[0]
+    selected = [i for i in candidates if first is None or predicted[i] < first]
 
-        if d >= 365:
-            # 1+ year: do NOT also grant the 6m–1y tenure points
-            breakdown.append(_score_entry("Tenure", 0, "1+ year (no extra tenure bonus)"))
-            # priority += 0
+    # If we have too few, add the next pool, then anyone (rare, but safe), not already included
+    for limit in limits[1:]:
+        if len(selected) >= top_n:
+            break
+        have = {_normalize_uuid(str(uuids[i] or "")) for i in selected}
+        for i in candidates:
+            if limit is not None and predicted[i] >= limit:
+                continue
+            u = _normalize_uuid(str(uuids[i] or ""))
+            if u and u not in have:
+                selected.append(i)
+                have.add(u)
+            if len(selected) >= top_n:
+                break
 
-        elif d > six_months_days:
-            # 6 months to < 1 year
-            breakdown.append(_score_entry("Tenure", 2, "6 Months to 1 Year"))
-            priority += 2
+    # Partial sort: BW bonus only for members that can still make the top n, then
+    # (priority incl. bonus, predicted, pool order) decides
+    base = kick_scores(table, selected, rules)
+    margin = rules.bw_margin if bw_wins is not None else 0
+    ranked = []
+    for p in _kick_window(base, margin, top_n):
+        i = selected[p]
+        bonus = 0
+        if bw_wins is not None:
+            u = _normalize_uuid(str(uuids[i] or ""))
+            bonus = rules.bw_bonus(bw_wins(u) if u else 0)
+        ranked.append((int(base[p]) + bonus, int(predicted[i]), p))
+    return [(final, pred, selected[p]) for final, pred, p in heapq.nsmallest(top_n, ranked)]
+
+def recommend_kicks(members: List[Dict[str, Any]], min_days_in_guild: int = 0, top_n: int = KICK_TOP_N,
+                    rules: Optional[KickRules] = None) -> List[Dict[str, Any]]:
+    rules = rules or kick_rules()
+    table, rows = MemberTable.from_members(members)
+    bw_wins = get_bedwars_wins if ENABLE_BEDWARS_WINS else None
+
+    # Breakdown cards only for the ones shown
+    # (BW bonus applied to the shown members only, so priority math matches what you display)
+    recs: List[KickCandidate] = []
+    for _, _, i in _rank_kicks(table, rows, min_days_in_guild, top_n, rules, bw_wins):
+        breakdown: List[Dict[str, Any]] = []
+        priority = _kick_score(table, i, breakdown, rules)
+        m = KickCandidate(table, i, {"kick_priority": priority, "kick_breakdown": breakdown})
+        bonus = _apply_bw_bonus(m, breakdown, rules)
+        m["kick_priority"] = int(priority) + int(bonus)
+        recs.append(m)
+    return recs
 
-        elif 7 <= d <= 30:
-            priority -= 1
-            breakdown.append(_score_entry("Tenure", -1, "7–30 days"))
+# ============================================================
+# KICK POLICY SIMULATOR (--simulate VARIANTS.json)
+#   replays both kick waves for many policy variants over the member snapshot
+#   the last list action saved; never touches the API. Variants file:
+#     {"variants": [{"name": "harsher", "set": {"zero_reqs_penalty": -8, "top_n": 15}}],
+#      "grid": {"predicted_gexp.2.max": [5000, 7500, 10000], "wave2_min_days": [8, 14]}}
+#   keys are top_n / wave1_min_days / wave2_min_days or a kick_rules.json path;
+#   "grid" runs every combination, all on top of the current rules
+# ============================================================
+_SIM_PARAMS = ("top_n", "wave1_min_days", "wave2_min_days")
+_SIM_OPEN_MAPS = ("rank_points", "pseudo_bonuses", "pseudo_min_bonuses")  # variants may add ranks / codes here
+_SIM_RANK_FIELDS = ("points", "label", "detail")
 
+def save_member_snapshot(guild_name: str, members: List[Dict[str, Any]]) -> None:
+    """
+    Scoring inputs per member. BW wins come from the requirement pass or the
+    player cache, so the simulator never has to fetch anything.
+    """
+    if not MEMBER_SNAPSHOT:
+        return
+    rows = []
+    for m in members:
+        uuid = _normalize_uuid(str(m.get("uuid") or ""))
+        wins: Any = 0
+        if ENABLE_REQUIREMENT_CHECKS:
+            wins = m.get("bw_wins", 0)
+        elif uuid:
+            req = (PLAYER_CACHE.get(uuid) or {}).get("req")
+            wins = req.get("bw_wins", 0) if isinstance(req, dict) else 0
+        rows.append({
+            "ign": str(m.get("ign", "")),
+            "uuid": str(m.get("uuid") or ""),
+            "rank": m.get("rank"),
+            "days_in_guild": _safe_int(m.get("days_in_guild", 0), 0),
+            "predicted_gexp": _safe_int(m.get("predicted_gexp", 0), 0),
+            "reqs_met_count": _safe_int(m.get("reqs_met_count", 0), 0),
+            "pseudo_codes": list(m.get("pseudo_codes") or []),
+            "bw_wins": _safe_int(wins, 0) if ENABLE_BEDWARS_WINS else 0,
+        })
+    snap = {"saved_at": int(time.time()), "guild": guild_name, "members": rows}
+    _json_save(MEMBER_SNAPSHOT_FILE, snap, cache_format().name)
+
+def load_member_snapshot(path: str) -> Dict[str, Any]:
+    snap = _json_load(path, None)
+    if not isinstance(snap, dict) or not isinstance(snap.get("members"), list):
+        raise ValueError(f"no member snapshot at {path}; run any list action once to save one")
+    return snap
+
+def _set_rule_path(data: Any, path: str, value: Any) -> None:
+    # "predicted_gexp.2.points" -> data["predicted_gexp"][2]["points"] = value
+    # every segment must already exist (a typo would otherwise be a silent no-op),
+    # except new entries in the open maps and a rank's optional fields
+    parts = path.split(".")
+    node = data
+    for n, part in enumerate(parts):
+        if isinstance(node, list):
+            if not part.lstrip("-").isdigit() or not -len(node) <= int(part) < len(node):
+                raise ValueError(f"{path}: {'.'.join(parts[:n]) or 'rules'} has no item {part}")
+            key: Any = int(part)
+        elif isinstance(node, dict):
+            key = part
+            if key not in node:
+                grows = (n == 1 and parts[0] in _SIM_OPEN_MAPS) or (
+                    n == 2 and parts[0] == "rank_points" and part in _SIM_RANK_FIELDS)
+                if not grows:
+                    raise ValueError(f"{path}: {'.'.join(parts[:n]) or 'rules'} has no key {part!r}")
         else:
-            breakdown.append(_score_entry("Tenure", 0, ""))
-            # priority += 0
-
-
-        if gexp == 0:
-            priority -= 15
-            breakdown.append(_score_entry("Pred GEXP", -15, "0"))
-        elif 0 < gexp <= 7500:
-            priority -= 12
-            breakdown.append(_score_entry("Pred GEXP", -12, "1–7,500"))
-        elif 7500 < gexp <= 15000:
-            priority -= 9
-            breakdown.append(_score_entry("Pred GEXP", -9, "7,501–15,000"))
-        elif 15000 < gexp <= 25000:
-            priority -= 6
-            breakdown.append(_score_entry("Pred GEXP", -6, "15,001–25,000"))
-        elif 25000 < gexp <= 35000:
-            priority -= 3
-            breakdown.append(_score_entry("Pred GEXP", -3, "25,001–35,000"))
-        elif 35000 < gexp <= 50000:
-            priority -= 1
-            breakdown.append(_score_entry("Pred GEXP", -1, "35,001–50,000"))
-
-        pseudo_codes = m.get("pseudo_codes")
-        if not isinstance(pseudo_codes, list):
-            uuid = _normalize_uuid(m.get("uuid") or "")
-            pseudo_codes = get_member_pseudo_codes(uuid)
-
-        pseudo_bonus = _pseudo_priority_bonus_for_codes(pseudo_codes or [])
-        if pseudo_bonus != 0:
-            priority += pseudo_bonus
-            breakdown.append(_score_entry("Pseudo bonus", pseudo_bonus, _pseudo_bonus_detail(pseudo_codes or [])))
+            raise ValueError(f"{path}: {'.'.join(parts[:n])} is not an object or list")
+        if n == len(parts) - 1:
+            node[key] = value
         else:
-            breakdown.append(_score_entry("Pseudo bonus", 0, ""))
+            if isinstance(node, dict) and key not in node:
+                node[key] = {}
+            node = node[key]
 
-        req_count = _safe_int(m.get("reqs_met_count", 0), 0)
+def expand_kick_variants(spec: Dict[str, Any], base_rules: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Baseline (the rules as they are), then each "variants" entry, then each "grid" combination:
+    [{"name", "settings", "rules", "top_n", "wave1_min_days", "wave2_min_days", "error"}, ...]
+    """
+    named: List[Tuple[str, Dict[str, Any]]] = [("baseline", {})]
+    for n, v in enumerate(spec.get("variants") or []):
+        v = v if isinstance(v, dict) else {}
+        named.append((str(v.get("name") or f"variant {n + 1}"), dict(v.get("set") or {})))
+    grid = spec.get("grid") or {}
+    if grid:
+        keys = list(grid)
+        for combo in itertools.product(*(grid[k] if isinstance(grid[k], list) else [grid[k]] for k in keys)):
+            settings = dict(zip(keys, combo))
+            named.append((", ".join(f"{k}={json.dumps(v, ensure_ascii=False)}" for k, v in settings.items()), settings))
 
-        req_bonus = 0
-        if req_count == 0:
-            req_bonus = REQ_ZERO_PENALTY          # -5
+    out = []
+    for name, settings in named:
+        variant: Dict[str, Any] = {
+            "name": name, "settings": settings, "rules": json.loads(json.dumps(base_rules)), "error": "",
+            "top_n": KICK_TOP_N, "wave1_min_days": KICK_WAVE_1_MIN_DAYS, "wave2_min_days": KICK_WAVE_2_MIN_DAYS,
+        }
+        try:
+            for key, value in settings.items():
+                if key in _SIM_PARAMS:
+                    if not _is_int(value) or value < 0:
+                        raise ValueError(f"{key}: must be a non-negative integer")
+                    variant[key] = value
+                else:
+                    _set_rule_path(variant["rules"], key, value)
+        except ValueError as e:
+            variant["error"] = str(e)
+        out.append(variant)
+    return out
 
-        priority += req_bonus
+class _SimColumns:
+    """
+    The snapshot as scoring columns, built once and shared by every variant.
+    """
 
-        label = "Reqs"
-        detail = "no reqs" if req_count == 0 else f"{req_count} met"
-        breakdown.append(_score_entry(label, req_bonus, detail))
+    def __init__(self, snap: Dict[str, Any], np: Any):
+        self.np = np
+        self.table = MemberTable()
+        for m in snap["members"]:
+            self.table.append(m if isinstance(m, dict) else {})
+        cols = self.table.columns
+        n = len(self.table)
+        self.rows = list(range(n))
+        self.uuids = [_normalize_uuid(str(u or "")) for u in cols["uuid"]]
+        self.wins = {u: int(w) for u, w in zip(self.uuids, cols["bw_wins"]) if u}
+        if np is None:
+            return
 
+        whitelist = set(KICK_WHITELIST.get("uuids", []) or [])
+        self.open = np.array([str(ign).lower() != "undisplayed" and u not in whitelist
+                              for ign, u in zip(cols["ign"], self.uuids)], dtype=bool)
+        self.days = np.frombuffer(cols["days_in_guild"], dtype=np.int64) if n else np.zeros(0, np.int64)
+        self.pred = np.frombuffer(cols["predicted_gexp"], dtype=np.int64) if n else np.zeros(0, np.int64)
+        self.reqs = np.frombuffer(cols["reqs_met_count"], dtype=np.int64) if n else np.zeros(0, np.int64)
+        wins = np.frombuffer(cols["bw_wins"], dtype=np.int64) if n else np.zeros(0, np.int64)
+        self.bw_wins = np.where(np.array([bool(u) for u in self.uuids], dtype=bool), wins, 0)
+        self.rank_names = sorted({str(r) for r in cols["rank"]})
+        slot = {r: k for k, r in enumerate(self.rank_names)}
+        self.rank_idx = np.array([slot[str(r)] for r in cols["rank"]], dtype=np.int64)
+        self.pseudo_rows = [(k, codes) for k, codes in enumerate(cols["pseudo_codes"]) if codes]
+        self.band_idx: Dict[Any, Any] = {}  # bounds -> searchsorted result, shared across variants
+
+    def _lookup(self, key: Any, bounds: List[float], values: Any, side: str) -> Any:
+        key = (key, tuple(bounds))
+        if key not in self.band_idx:
+            self.band_idx[key] = self.np.searchsorted(self.np.array(bounds, dtype=self.np.float64), values, side=side)
+        return self.band_idx[key]
+
+    def totals(self, rules: KickRules) -> Any:
+        # priority incl. BW bonus for every member under one variant
+        np = self.np
+        rank_points = np.array([rules.rank_points[r][1] if r in rules.rank_points else 0 for r in self.rank_names],
+                               dtype=np.int64)
+        total = rank_points[self.rank_idx] if len(self.rank_names) else np.zeros(0, np.int64)
+        total = total + np.array([p for p, _ in rules.tenure], dtype=np.int64)[
+            self._lookup("tenure", rules.tenure_bounds, self.days, "left")]
+        total += np.array([p for p, _ in rules.gexp], dtype=np.int64)[
+            self._lookup("gexp", rules.gexp_bounds, self.pred, "left")]
+        total += np.where(self.reqs == 0, rules.zero_reqs_penalty, 0)
+        for k, codes in self.pseudo_rows:
+            total[k] += _pseudo_priority_bonus_for_codes(codes, rules)
+        if ENABLE_BEDWARS_WINS and rules.bw_mins:
+            bonuses = np.array([0] + rules.bw_bonuses, dtype=np.int64)
+            total += bonuses[self._lookup("bw", rules.bw_mins, self.bw_wins, "right")]
+        return total
+
+    def wave(self, rules: KickRules, total: Any, min_days: int, top_n: int) -> List[Tuple[int, int]]:
+        # (row, priority) as _rank_kicks would pick them
+        np = self.np
+        if top_n <= 0:
+            return []
+        eligible = self.open & (self.days >= min_days)
+        limits: List[Optional[int]] = [*rules.pools, None]
+        first = limits[0]
+        sel = np.flatnonzero(eligible if first is None else eligible & (self.pred < first))
+        if len(sel) < top_n and len(limits) > 1:
+            selected = sel.tolist()
+            candidates = np.flatnonzero(eligible).tolist()
+            for limit in limits[1:]:
+                if len(selected) >= top_n:
+                    break
+                have = {self.uuids[i] for i in selected}
+                for i in candidates:
+                    if limit is not None and self.pred[i] >= limit:
+                        continue
+                    u = self.uuids[i]
+                    if u and u not in have:
+                        selected.append(i)
+                        have.add(u)
+                    if len(selected) >= top_n:
+                        break
+            sel = np.array(selected, dtype=np.int64)
+
+        final = total[sel]
+        keep = np.arange(len(sel))
+        if len(sel) > top_n:
+            keep = np.flatnonzero(final <= np.partition(final, top_n - 1)[top_n - 1])
+        order = keep[np.lexsort((keep, self.pred[sel][keep], final[keep]))][:top_n]
+        return [(int(sel[p]), int(final[p])) for p in order]
+
+def _sim_wave_python(cols: _SimColumns, rules: KickRules, min_days: int, top_n: int) -> List[Tuple[int, int]]:
+    bw_wins = (lambda u: cols.wins.get(u, 0)) if ENABLE_BEDWARS_WINS else None
+    return [(i, final) for final, _, i in _rank_kicks(cols.table, cols.rows, min_days, top_n, rules, bw_wins)]
+
+def simulate_kick_policies(snap: Dict[str, Any], variants: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Both waves under every variant, plus who enters / leaves each list compared to the baseline (first variant).
+    """
+    t0 = time.perf_counter()
+    np = _numpy.value if kick_score_engine() == "numpy" else None
+    cols = _SimColumns(snap, np)
+    igns = cols.table.columns["ign"]
 
-        candidates.append({**m, "kick_priority": priority, "kick_breakdown": breakdown})
+    def entry(i: int, priority: int) -> Dict[str, Any]:
+        return {"uuid": cols.uuids[i], "ign": str(igns[i]), "priority": priority}
 
-    # ------------------------------------------------------------
-    # Candidate pool selection:
-    #   Prefer <50k predicted GEXP, but if that yields <10 members,
-    #   top-up from <100k, then from everyone if still short.
-    # ------------------------------------------------------------
-    pool_50k = [m for m in candidates if int(m.get("predicted_gexp", 0)) < 50000]
-    pool_100k = [m for m in candidates if int(m.get("predicted_gexp", 0)) < 100000]
+    for v in variants:
+        if v["error"]:
+            continue
+        try:
+            rules = KickRules(v["rules"], v["name"])
+        except ValueError as e:
+            v["error"] = str(e)
+            continue
+        total = cols.totals(rules) if np is not None else None
+        for wave in ("wave1", "wave2"):
+            min_days = v[f"{wave}_min_days"]
+            if np is not None:
+                picked = cols.wave(rules, total, min_days, v["top_n"])
+            else:
+                picked = _sim_wave_python(cols, rules, min_days, v["top_n"])
+            v[wave] = [entry(i, prio) for i, prio in picked]
 
-    # Start with <50k
-    selected = list(pool_50k)
+    base = variants[0]
+    for v in variants:
+        for wave in ("wave1", "wave2"):
+            if v["error"] or base["error"]:
+                continue
+            before = [e["uuid"] for e in base[wave]]
+            after = [e["uuid"] for e in v[wave]]
+            before_set, after_set = set(before), set(after)
+            v[f"{wave}_in"] = [e for e in v[wave] if e["uuid"] not in before_set]
+            v[f"{wave}_out"] = [e for e in base[wave] if e["uuid"] not in after_set]
+            v[f"{wave}_same"] = before == after
+    return {
+        "guild": snap.get("guild", ""),
+        "saved_at": snap.get("saved_at", 0),
+        "members": len(cols.rows),
+        "engine": "numpy" if np is not None else "python",
+        "elapsed_s": time.perf_counter() - t0,
+        "variants": variants,
+    }
 
-    # If we have fewer than 10, add <100k members not already included
-    if len(selected) < 10:
-        have = {(_normalize_uuid(x.get("uuid") or "")) for x in selected}
-        for m in pool_100k:
-            u = _normalize_uuid(m.get("uuid") or "")
-            if u and u not in have:
-                selected.append(m)
-                have.add(u)
-            if len(selected) >= 10:
-                break
+def print_kick_simulation(result: Dict[str, Any], top: int = 20) -> None:
+    variants = result["variants"]
+    base = variants[0]
+    age_h = (time.time() - _safe_int(result["saved_at"], 0)) / 3600
+    section_break("KICK POLICY SIMULATION", color=PURPLE)
+    print(f"{DIM}{GRAY}{result['guild']} snapshot, {result['members']} members, {age_h:.1f}h old | "
+          f"{len(variants)} variants in {result['elapsed_s'] * 1000:.0f}ms ({result['engine']}) | no API calls{RESET}")
+    if base["error"]:
+        print(f"{RED}Current rules are invalid: {base['error']}{RESET}")
+        return
+    for wave, title in (("wave1", "Wave 1"), ("wave2", "Wave 2")):
+        names = ", ".join(e["ign"] for e in base[wave]) or "-"
+        print(f"{WHITE}{title} now:{RESET} {GRAY}{names}{RESET}")
+    print()
 
-    # If STILL fewer than 10, add from all candidates (rare, but safe)
-    if len(selected) < 10:
-        have = {(_normalize_uuid(x.get("uuid") or "")) for x in selected}
-        for m in candidates:
-            u = _normalize_uuid(m.get("uuid") or "")
-            if u and u not in have:
-                selected.append(m)
-                have.add(u)
-            if len(selected) >= 10:
-                break
+    ok = [v for v in variants[1:] if not v["error"]]
+    changed = [v for v in ok if not (v["wave1_same"] and v["wave2_same"])]
+    changed.sort(key=lambda v: -(len(v["wave1_in"]) + len(v["wave2_in"]) + (not v["wave1_same"]) + (not v["wave2_same"])))
+
+    def diff(v: Dict[str, Any], wave: str) -> str:
+        if v[f"{wave}_same"]:
+            return f"{GRAY}same{RESET}"
+        n_in, n_out = len(v[f"{wave}_in"]), len(v[f"{wave}_out"])
+        return f"{RED}+{n_in}{RESET}/{GREEN}-{n_out}{RESET}" if (n_in or n_out) else f"{YELLOW}reordered{RESET}"
+
+    if changed:
+        print(f"{BOLD}{WHITE}{'#':>4} {'wave 1':<10} {'wave 2':<10} variant  {DIM}→ newly listed{RESET}")
+        for v in changed[:max(top, 0)]:
+            joined = list(dict.fromkeys(e["ign"] for e in v["wave1_in"] + v["wave2_in"]))
+            shown = ", ".join(joined[:6]) + (f" (+{len(joined) - 6})" if len(joined) > 6 else "")
+            print(f"{WHITE}{variants.index(v):>4}{RESET} {_pad(diff(v, 'wave1'), 10)} {_pad(diff(v, 'wave2'), 10)} "
+                  f"{CYAN}{v['name']}{RESET}  {DIM}{GRAY}→ {shown or '-'}{RESET}")
+        if len(changed) > top:
+            print(f"{DIM}{GRAY}... {len(changed) - top} more (--sim-out writes them all){RESET}")
+    print(f"{DIM}{GRAY}{len(ok) - len(changed)} of {len(ok)} variant(s) leave both waves as they are.{RESET}")
+    for v in variants:
+        if v["error"]:
+            print(f"{RED}Skipped {v['name']}: {v['error']}{RESET}")
+    print()
 
-    # Apply BW bonus only to the selected pool (so priority math matches what you display)
-    for m in selected:
-        bonus = _apply_bw_bonus(m, m["kick_breakdown"])
-        m["kick_priority"] = int(m["kick_priority"]) + int(bonus)
+def run_kick_simulation(variants_path: str, snapshot_path: str, out_path: str = "", top: int = 20) -> int:
+    try:
+        snap = load_member_snapshot(snapshot_path)
+        with open(variants_path, "r", encoding="utf-8") as f:
+            spec = json.load(f)
+        if not isinstance(spec, dict):
+            raise ValueError(f"{variants_path}: expected a JSON object with \"variants\" and/or \"grid\"")
+        base_rules = _json_load(KICK_RULES_FILE, None) if os.path.exists(KICK_RULES_FILE) else DEFAULT_KICK_RULES
+    except (OSError, ValueError) as e:
+        print(f"{RED}{e}{RESET}")
+        return 1
 
-    selected.sort(key=lambda m: (int(m.get("kick_priority", 0)), int(m.get("predicted_gexp", 0))))
-    return selected[:10]
+    result = simulate_kick_policies(snap, expand_kick_variants(spec, base_rules))
+    print_kick_simulation(result, top)
+    if out_path:
+        variants = [{k: v for k, v in var.items() if k != "rules"} for var in result["variants"]]
+        _json_save(out_path, {**result, "variants": variants})
+        print(f"Wrote {out_path}")
+    return 0
 
 # ============================================================
 # OUTPUT HELPERS
@@ -1241,8 +4917,6 @@ def print_kick_cards(title: str, recs: List[Dict[str, Any]], columns: int = 2) -
         return
 
     ORDER = [
-        "Rank (protected)",
-        "Rank (Elder)",
         "Tenure",
         "Pred GEXP",
         "Pseudo bonus",
@@ -1275,7 +4949,8 @@ def print_kick_cards(title: str, recs: List[Dict[str, Any]], columns: int = 2) -
         bd_map = normalize_breakdown(m.get("kick_breakdown", []) or [])
 
         lines = []
-        lines.append(f"{BOLD}{CYAN}{idx:>2}. {ign}{RESET} {DIM}({rank}){RESET}")
+        stale_tag = f" {DIM}{YELLOW}stale*{RESET}" if m.get("stale") else ""
+        lines.append(f"{BOLD}{CYAN}{idx:>2}. {ign}{RESET} {DIM}({rank}){RESET}{stale_tag}")
         lines.append(f"{WHITE}Pred:{RESET} {CYAN}{pred:,}{RESET}   {WHITE}Days:{RESET} {WHITE}{days}{RESET}   {WHITE}Join:{RESET} {JOIN_DATE_COLOR}{join}{RESET}")
         lines.append(f"{WHITE}Priority:{RESET} {prio_col}{prio}{RESET}")
         lines.append(f"{DIM}{'─' * 44}{RESET}")
@@ -1287,12 +4962,10 @@ def print_kick_cards(title: str, recs: List[Dict[str, Any]], columns: int = 2) -
                 detail = f"{DIM}{detail}{RESET}"
             return f"{WHITE}{label:<13}{RESET} {_delta_str(delta):>6}  {detail}"
 
-        if rank in ["Guild Master", "Master", "Senate"]:
-            lines.append(row("Rank", bd_map["Rank (protected)"]))
-        elif rank == "Elder":
-            lines.append(row("Rank", bd_map["Rank (Elder)"]))
-        else:
-            lines.append(row("Rank", {"delta": 0, "detail": ""}))
+        # rank labels come from kick_rules.json ("Rank (protected)", "Rank (Elder)", ...)
+        rank_entry = next((e for e in (m.get("kick_breakdown", []) or []) if str(e.get("label", "")).startswith("Rank")),
+                          {"delta": 0, "detail": ""})
+        lines.append(row("Rank", rank_entry))
 
         lines.append(row("Tenure", bd_map["Tenure"]))
         lines.append(row("Pred GEXP", bd_map["Pred GEXP"]))
@@ -1482,9 +5155,7 @@ def _choose_pseudorole_code_from_defs(defs: Dict[str, Any], prompt: str = "Pick
     for i, c in enumerate(codes_sorted, start=1):
         meta = defs.get(c) or {}
         short = str(meta.get("short", "")).strip()
-        bonus = int(PSEUDO_PRIORITY_BONUSES.get(c, 0))
-        if c == "LB":
-            bonus = max(bonus, 10)
+        bonus = kick_rules().pseudo_bonus(c)
         bonus_txt = f"{DIM}{GRAY}(+{bonus}){RESET} " if bonus else ""
         print(f"{WHITE}{i:>2}{RESET} - {CYAN}{c:<12}{RESET} {bonus_txt}{GRAY}{short}{RESET}")
 
@@ -1839,7 +5510,7 @@ def print_leaderboard(guild_name: str, members: List[Dict[str, Any]]) -> None:
             current_rank = m["rank"]
             print(f"{BOLD}{BLUE}--- {m['rank']} ---{RESET}")
 
-        reqs = str(m.get("reqs_met", "-"))
+        reqs = str(m.get("reqs_met", "-")) + ("*" if m.get("stale") else "")
         cnt = _safe_int(m.get("reqs_met_count", 0), 0)
         req_col = GREEN if cnt >= 3 else (YELLOW if cnt == 2 else (ORANGE if cnt == 1 else GRAY))
         
@@ -1863,8 +5534,12 @@ def print_leaderboard(guild_name: str, members: List[Dict[str, Any]]) -> None:
             f"{req_col}{reqs:<16}{RESET}"
         )
 
-def export_to_csv(members: List[Dict[str, Any]]) -> None:
-    csv_path = _p("guild_weekly_gexp.csv")
+    if any(m.get("stale") for m in members):
+        print(f"\n{DIM}{GRAY}* stats past their cache TTL (refreshing in the background){RESET}")
+
+def export_to_csv(members: List[Dict[str, Any]], csv_path: Optional[str] = None) -> None:
+    csv_path = csv_path or _p("guild_weekly_gexp.csv")
+    _ensure_data_dir(csv_path)
     with open(csv_path, "w", newline="", encoding="utf-8") as f:
         writer = csv.writer(f)
         writer.writerow([
@@ -1897,7 +5572,7 @@ def export_to_csv(members: List[Dict[str, Any]]) -> None:
                 m.get("reqs_met", "-"),
             ])
 
-    print(f"\n{GREEN}CSV exported:{RESET} {csv_path}")
+    print(f"\n{GREEN}CSV exported:{RESET} {csv_path}{_scratch_note() if csv_path.startswith(DATA_DIR) else ''}")
 
 # ============================================================
 # 0-GEXP SOON LISTS
@@ -2051,40 +5726,23 @@ def print_requirement_mode_counts(members: List[Dict[str, Any]]) -> None:
     def pct(n: int) -> float:
         return (n / total * 100.0) if total > 0 else 0.0
 
-    # Map requirement code -> display name + colour
-    # (match your overall scheme: BW red, DU orange, SW yellow, AP green, SB purple, etc.)
-    MODE_META: Dict[str, Tuple[str, str]] = {
-        "BW": ("BEDWARS", RED),
-        "DU": ("DUELS", ORANGE),
-        "SW": ("SKYWARS", YELLOW),
-        "AP": ("ACH PTS", GREEN),
-        "BB": ("BUILD B", CYAN),
-        "TNT": ("TNT", CYAN),
-        "UHC": ("UHC", CYAN),
-        "SB": ("SKYBLOCK", PURPLE),
-    }
-
-    # Count real requirements met (ignores pseudo)
-    counts: Dict[str, int] = {k: 0 for k in MODE_META.keys()}
+    rules = requirement_rules()
 
+    # Real requirements met (ignores pseudo), re-evaluated in one pass from the cached blobs
+    stats: List[Tuple[Dict[str, Any], int]] = []
     for m in filtered:
         uuid = _normalize_uuid(m.get("uuid") or "")
-        if not uuid:
+        if not uuid or not ENABLE_REQUIREMENT_CHECKS:
             continue
 
         # We already computed these earlier in _prepare_members_for_outputs()
-        real_cnt = _safe_int(m.get("real_reqs_count", 0), 0)
-        if real_cnt <= 0:
+        if _safe_int(m.get("real_reqs_count", 0), 0) <= 0:
             continue
 
-        # Easiest/cleanest: recompute real req codes using the same logic
-        # (uses cached blobs + throttling already built in)
-        codes = _compute_real_reqs(uuid)
+        sb_level = get_skyblock_level(uuid) if ENABLE_SKYBLOCK_LEVEL else 0
+        stats.append((get_player_requirements_blob(uuid), sb_level))
 
-        # Dedup just in case
-        for c in set(codes):
-            if c in counts:
-                counts[c] += 1
+    counts = rules.count_met(stats)
 
     # Row formatter: "BEDWARS:  30 | (24.1%)"
     def row(label: str, n: int, col: str) -> None:
@@ -2096,10 +5754,9 @@ def print_requirement_mode_counts(members: List[Dict[str, Any]]) -> None:
 
     print(f"{WHITE}Total Members:{RESET} {CYAN}{total}{RESET} {DIM}{GRAY}({total_including}){RESET}\n")
 
-    # Print in the same order as your REAL_REQS list
-    order = ["AP", "BW", "BB", "DU", "SW", "TNT", "UHC", "SB"]
-    for code in order:
-        label, col = MODE_META.get(code, (code, WHITE))
+    # Same order as the legend (REQUIREMENTS)
+    for code in rules.codes:
+        label, col = rules.modes[code]
         row(label + ":", counts.get(code, 0), col)
 
     print()
@@ -2120,6 +5777,8 @@ def show_zero_req_grids(members: List[Dict[str, Any]]) -> None:
     inc_cells = [_format_member_cell(m) for m in zero_inc]
     exc_cells = [_format_member_cell(m) for m in zero_exc]
 
+    checked = ", ".join(short for _, short, _ in requirement_rules().legend)
+    print(f"{DIM}{GRAY}Real requirements: {checked}{RESET}")
     print(f"{DIM}{GRAY}Note: requirement-whitelisted members are excluded from these lists.{RESET}\n")
 
     _grid_print("Meet 0 requirements (INCLUDING pseudo)", inc_cells, cols=5, title_color=ORANGE)
@@ -2129,7 +5788,7 @@ def show_zero_req_grids(members: List[Dict[str, Any]]) -> None:
 def print_requirements_legend() -> None:
     section_break("REQUIREMENTS LEGEND", color=PURPLE)
     print(f"{DIM}{WHITE}Real requirements:{RESET}")
-    for code, short, desc in REAL_REQS:
+    for code, short, desc in requirement_rules().legend:
         print(f"{DIM}{WHITE}- {code:<3}{RESET} {GRAY}{short:<20}{RESET} {DIM}{desc}{RESET}")
 
     defs = PSEUDO_REQS.get("defs", {})
@@ -2139,14 +5798,119 @@ def print_requirements_legend() -> None:
             meta = defs.get(code) or {}
             short = str(meta.get("short", "")).strip()
             desc = str(meta.get("desc", "")).strip()
-            bonus = int(PSEUDO_PRIORITY_BONUSES.get(code, 0))
-            if code == "LB":
-                bonus = max(bonus, 10)
+            bonus = kick_rules().pseudo_bonus(code)
             bonus_txt = f"{GRAY}(+{bonus} prio){RESET} " if bonus else ""
             print(f"{DIM}{WHITE}- {code:<3}{RESET} {bonus_txt}{GRAY}{short:<20}{RESET} {DIM}{desc}{RESET}")
     print()
 
 
+# ============================================================
+# CACHE WARM-UP SCHEDULER (--warm / --warm-once)
+#   small batches of refreshes through the day, so a menu action later on
+#   is (almost) all cache hits
+# ============================================================
+def _cache_expiry(uuid: str) -> Dict[str, Tuple[int, int]]:
+    """
+    (expires_at, ttl_s) per cache kind ("player", "skyblock"); expires_at 0 = missing or never fetched.
+    """
+    row = PLAYER_CACHE.get(uuid) or {}
+    out: Dict[str, Tuple[int, int]] = {}
+    kinds = [("player", "req", req_ttl_s)]
+    if ENABLE_SKYBLOCK_LEVEL:
+        kinds.append(("skyblock", "sb", sb_ttl_s))
+    for kind, field, ttl_fn in kinds:
+        blob = row.get(field)
+        fetched_at = _safe_int(blob.get("fetched_at", 0), 0) if isinstance(blob, dict) else 0
+        if fetched_at > 0:
+            ttl = ttl_fn(uuid, blob)
+            out[kind] = (fetched_at + ttl, ttl)
+        else:
+            out[kind] = (0, 0)
+    return out
+
+def _warm_tier(m: Dict[str, Any]) -> int:
+    # mirrors the recommend_kicks pools: <50k first, then <100k, then everyone else
+    pools = kick_rules().pools
+    if is_whitelisted_member(m):
+        return len(pools) + 1
+    return bisect_right(pools, _safe_int(m.get("predicted_gexp", 0), 0))
+
+def plan_warmup(members: List[Dict[str, Any]], now: int, lookahead_s: float) -> List[Tuple[str, str]]:
+    """
+    (kind, uuid) refreshes due within lookahead_s, in the order they should run:
+      - already expired before not yet expired
+      - then kick-pool members before the rest
+      - then stalest (earliest expiry) first
+    """
+    due: List[Tuple[bool, int, int, str, str]] = []
+    seen = set()
+    for m in members:
+        uuid = _normalize_uuid(m.get("uuid") or "")
+        if not uuid or uuid in seen:
+            continue
+        seen.add(uuid)
+        tier = _warm_tier(m)
+        for kind, (expires_at, ttl) in _cache_expiry(uuid).items():
+            # never look further ahead than half a TTL, or short-TTL entries would be due again at once
+            if expires_at < now + min(lookahead_s, ttl / 2):
+                due.append((expires_at > now, tier, expires_at, kind, uuid))
+    due.sort()
+    return [(kind, uuid) for _, _, _, kind, uuid in due]
+
+def _warm_one(kind: str, uuid: str) -> None:
+    now = _now_ts()
+    if kind == "player":
+        _PIPELINE.memo(("player", uuid), lambda: _fetch_req_blob(uuid, now))
+    else:
+        _PIPELINE.memo(("skyblock", uuid), lambda: _fetch_skyblock_level(uuid, now))
+
+def run_warmup_tick(guild_name: str, budget: int) -> Dict[str, int]:
+    """
+    One scheduler pass: fetch the guild, refresh up to `budget` due entries, save.
+    """
+    with request_run():
+        guild = get_guild_by_name(guild_name)
+        members = extract_weekly_gexp(guild)
+        plan = plan_warmup(members, _now_ts(), WARM_LOOKAHEAD_HOURS * 3600)
+        batch = plan[:max(int(budget), 0)]
+        if batch:
+            workers = max(min(REQ_SCAN_WORKERS, len(batch)), 1)
+            with ThreadPoolExecutor(max_workers=workers) as pool:
+                list(pool.map(lambda job: _warm_one(*job), batch))
+    save_ign_cache(IGN_CACHE)
+    save_player_cache(PLAYER_CACHE)
+    return {"members": len(members), "due": len(plan), "refreshed": len(batch)}
+
+def run_warmup_scheduler(guild_name: str, once: bool = False, budget: Optional[int] = None) -> None:
+    """
+    Spread WARM_DAILY_BUDGET refreshes over the day in WARM_INTERVAL_MIN ticks.
+    The guild fetch each tick is not counted against the budget.
+    """
+    interval_s = WARM_INTERVAL_MIN * 60
+    per_tick = budget if budget is not None else max(int(round(WARM_DAILY_BUDGET * interval_s / 86400)), 1)
+    print(f"{DIM}{GRAY}Warm-up: {per_tick} refresh(es) per tick, every {WARM_INTERVAL_MIN:g} min, "
+          f"lookahead {WARM_LOOKAHEAD_HOURS:g}h{RESET}")
+    try:
+        while True:
+            started = time.time()
+            try:
+                st = run_warmup_tick(guild_name, per_tick)
+                left = st["due"] - st["refreshed"]
+                color = GREEN if left == 0 else YELLOW
+                print(f"{color}[{datetime.now().strftime('%H:%M')}] refreshed {st['refreshed']}/{st['due']} due "
+                      f"({st['members']} members){RESET}")
+            except (RuntimeError, ValueError) as e:  # e.g. guild not found, unreadable body: retry next tick
+                print(f"{RED}Warm-up tick failed: {e}{RESET}")
+            if once:
+                return
+            time.sleep(max(interval_s - (time.time() - started), 0.0))
+    except KeyboardInterrupt:
+        print(f"{DIM}{GRAY}Warm-up stopped.{RESET}")
+    finally:
+        # Ctrl-C mid-tick: keep whatever that tick already refreshed
+        save_ign_cache(IGN_CACHE)
+        save_player_cache(PLAYER_CACHE)
+
 # ============================================================
 # MAIN MENU
 # ============================================================
@@ -2200,26 +5964,36 @@ def _prepare_members_for_outputs(members: List[Dict[str, Any]]) -> None:
     if ENABLE_REQUIREMENT_CHECKS:
         print(f"{DIM}{GRAY}Checking real requirements (cached, throttled)...{RESET}")
     apply_requirements_to_members(members)
+    stale = sum(1 for m in members if m.get("stale"))
+    if stale:
+        print(f"{DIM}{GRAY}{stale} member(s) shown from expired cache (*); {_REFRESHER.pending()} refresh(es) running in the background{RESET}")
+    quota = hypixel_rate_limit_status()
+    if quota.get("remaining") is not None:
+        print(f"{DIM}{GRAY}Hypixel quota: {quota['remaining']}/{quota['limit']} left, resets in {quota['reset_in_s'] or 0:.0f}s{RESET}")
     print()
 
 def run_kick_wave_1(members: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    section_break("KICK RECOMMENDATIONS — WAVE 1", color=CYAN)
-    recs = recommend_kicks(members, min_days_in_guild=0)
-    print_kick_cards(
-        title=f"Top {len(recs)} recommended members to kick (priority breakdown):",
-        recs=recs,
-        columns=2
-    )
+    with _PROFILER.stage("scoring"):
+        recs = recommend_kicks(members, min_days_in_guild=KICK_WAVE_1_MIN_DAYS)
+    with _PROFILER.stage("render"):
+        section_break("KICK RECOMMENDATIONS — WAVE 1", color=CYAN)
+        print_kick_cards(
+            title=f"Top {len(recs)} recommended members to kick (priority breakdown):",
+            recs=recs,
+            columns=2
+        )
     return recs
 
 def run_kick_wave_2(members: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    section_break("KICK RECOMMENDATIONS — WAVE 2 (JOINED > 7 DAYS)", color=ORANGE)
-    recs = recommend_kicks(members, min_days_in_guild=8)
-    print_kick_cards(
-        title=f"Top {len(recs)} recommended members to kick (joined > 7 days):",
-        recs=recs,
-        columns=2
-    )
+    with _PROFILER.stage("scoring"):
+        recs = recommend_kicks(members, min_days_in_guild=KICK_WAVE_2_MIN_DAYS)
+    with _PROFILER.stage("render"):
+        section_break("KICK RECOMMENDATIONS — WAVE 2 (JOINED > 7 DAYS)", color=ORANGE)
+        print_kick_cards(
+            title=f"Top {len(recs)} recommended members to kick (joined > 7 days):",
+            recs=recs,
+            columns=2
+        )
     return recs
 
 def apply_kick_priority_into_members(members: List[Dict[str, Any]], *recs_lists: List[Dict[str, Any]]) -> None:
@@ -2245,21 +6019,155 @@ def apply_kick_priority_into_members(members: List[Dict[str, Any]], *recs_lists:
 
 def run_full_leaderboard(guild: Dict[str, Any], members: List[Dict[str, Any]]) -> None:
     mode = get_display_order_choice()
-    display_members = apply_display_order(members, mode)
-    section_break("LEADERBOARD", color=BLUE)
-    print_leaderboard(guild.get("name", "Lucid"), display_members)
-    export_to_csv(display_members)
+    with _PROFILER.stage("render"):
+        display_members = apply_display_order(members, mode)
+        section_break("LEADERBOARD", color=BLUE)
+        print_leaderboard(guild.get("name", "Lucid"), display_members)
+        export_to_csv(display_members)
+
+def run_list_action(guild_name: str, list_choice: str) -> None:
+    t0 = time.perf_counter()
+    _run_list_action(guild_name, list_choice)
+    _STARTUP.action_done(time.perf_counter() - t0)
+
+def _run_list_action(guild_name: str, list_choice: str) -> None:
+    # fresh again for each list action
+    with _PROFILER.stage("guild"):
+        guild = get_guild_by_name(guild_name)
+    members = extract_weekly_gexp(guild)
+
+    with _PROFILER.stage("reqs"):
+        _prepare_members_for_outputs(members)
+    save_member_snapshot(guild_name, members)
+
+    rec1: List[Dict[str, Any]] = []
+    rec2: List[Dict[str, Any]] = []
+
+    if list_choice == "1":
+        run_full_leaderboard(guild, members)
+
+    elif list_choice == "2":
+        rec1 = run_kick_wave_1(members)
+        apply_kick_priority_into_members(members, rec1)
+
+    elif list_choice == "3":
+        rec2 = run_kick_wave_2(members)
+        apply_kick_priority_into_members(members, rec2)
+
+    elif list_choice == "4":
+        with _PROFILER.stage("render"):
+            print_zero_soon_grouped(members, [0, 1, 2, 3])
+
+    elif list_choice == "5":
+        with _PROFILER.stage("render"):
+            print_requirements_legend()
+
+    elif list_choice == "6":
+        with _PROFILER.stage("render"):
+            print_requirements_summary(members)
+
+        print()
+        input(f"{DIM}{GRAY}Press Enter to show 0-requirement grids...{RESET}")
+        with _PROFILER.stage("render"):
+            show_zero_req_grids(members)
+
+        print()
+        input(f"{DIM}{GRAY}Press Enter to show requirement mode counts...{RESET}")
+        with _PROFILER.stage("render"):
+            print_requirement_mode_counts(members)
+
+    elif list_choice == "7":
+        with _PROFILER.stage("render"):
+            print_members_with_codes(members)
+
+    with _PROFILER.stage("save"):
+        save_ign_cache(IGN_CACHE)
+        save_player_cache(PLAYER_CACHE)
+        save_kick_whitelist(KICK_WHITELIST)
 
 # ============================================================
 # MAIN
 # ============================================================
 def main():
+    ap = argparse.ArgumentParser(description="Hypixel guild GEXP leaderboard + kick recommendations")
+    ap.add_argument("--profile", action="store_true", help="print a per-stage timing breakdown at exit")
+    ap.add_argument("--profile-capture", default="", metavar="STAGE[:MODE]",
+                    help=f"cProfile or tracemalloc one stage ({', '.join(PROFILE_STAGES)}), e.g. reqs:cprofile")
+    ap.add_argument("--metrics-file", default="", metavar="PATH",
+                    help="write API metrics at exit (.prom, .jsonl or .json); overrides GEXP_METRICS_FILE")
+    ap.add_argument("--export-player-cache", default="", metavar="PATH", help="write the player cache as JSON and exit")
+    ap.add_argument("--import-player-cache", default="", metavar="PATH", help="merge a player cache JSON file and exit")
+    ap.add_argument("--reextract", action="store_true",
+                    help=f"rebuild player cache blobs from {os.path.basename(RAW_ARCHIVE_FILE)} (no API calls) and exit")
+    ap.add_argument("--migrate-caches", action="store_true",
+                    help=f"rewrite the IGN, last-seen and JSON player caches as CACHE_FORMAT ({CACHE_FORMAT}) and exit")
+    ap.add_argument("--warm", action="store_true",
+                    help="keep refreshing the player cache ahead of expiry (WARM_DAILY_BUDGET per day); Ctrl+C stops")
+    ap.add_argument("--warm-once", action="store_true", help="run a single warm-up tick and exit (for cron)")
+    ap.add_argument("--warm-budget", type=int, default=None, metavar="N", help="refreshes per warm-up tick")
+    ap.add_argument("--check-kick-rules", action="store_true",
+                    help="validate kick_rules.json (KICK_RULES_FILE), print the compiled tables and exit")
+    ap.add_argument("--simulate", default="", metavar="VARIANTS.json",
+                    help="replay both kick waves for each policy variant on the saved member snapshot (no API calls) and exit")
+    ap.add_argument("--snapshot", default="", metavar="PATH", help="member snapshot for --simulate (default: MEMBER_SNAPSHOT_FILE)")
+    ap.add_argument("--sim-out", default="", metavar="PATH", help="also write every variant's wave lists as JSON")
+    ap.add_argument("--sim-top", type=int, default=20, metavar="N", help="changed variants to print (default 20)")
+    args = ap.parse_args()
+    if args.metrics_file:
+        global METRICS_FILE
+        METRICS_FILE = args.metrics_file
+    if METRICS_FILE:
+        # CLI only, like profiling: importing the module never leaves a metrics file behind
+        atexit.register(_dump_metrics_at_exit)
+    if args.simulate:
+        sys.exit(run_kick_simulation(args.simulate, args.snapshot or MEMBER_SNAPSHOT_FILE, args.sim_out, args.sim_top))
+    if args.check_kick_rules:
+        try:
+            print_kick_rules(load_kick_rules(KICK_RULES_FILE))
+        except ValueError as e:
+            print(f"{RED}{KICK_RULES_FILE} is invalid: {e}{RESET}")
+            sys.exit(1)
+        return
+    if args.migrate_caches:
+        done = migrate_cache_files()
+        print(f"Rewrote {len(done)} cache file(s) as {cache_format().name}: {', '.join(done) or '-'}")
+        return
+    if args.reextract:
+        if not os.path.exists(RAW_ARCHIVE_FILE):
+            print(f"{YELLOW}No raw archive at {RAW_ARCHIVE_FILE}; run once with RAW_ARCHIVE=1 first.{RESET}")
+            return
+        n_req, n_sb = reextract_from_archive()
+        st = _RAW_ARCHIVE.stats()
+        print(f"Re-extracted {n_req} requirement blobs and {n_sb} SkyBlock levels from {os.path.basename(RAW_ARCHIVE_FILE)} "
+              f"{DIM}({st.get('player_snapshots', 0) + st.get('skyblock_snapshots', 0)} snapshots, "
+              f"{(st.get('player_bytes', 0) + st.get('skyblock_bytes', 0)) // 1024} KiB compressed){RESET}")
+        return
+    if args.export_player_cache:
+        n = export_player_cache_json(PLAYER_CACHE, args.export_player_cache)
+        print(f"Exported {n} player cache entries to {args.export_player_cache}")
+        return
+    if args.import_player_cache:
+        n = import_player_cache_json(PLAYER_CACHE, args.import_player_cache)
+        print(f"Imported {n} player cache fields from {args.import_player_cache}")
+        return
+    # only the CLI turns profiling on: importing the module never wraps stdout or registers atexit
+    _PROFILER.configure(
+        os.getenv("GEXP_PROFILE", "0").strip() not in ("", "0"),
+        os.getenv("GEXP_PROFILE_CAPTURE", ""),
+    )
+    if args.profile or args.profile_capture:
+        _PROFILER.configure(True, args.profile_capture)
+
     if not API_KEY or API_KEY.strip() == "":
         print(f"{RED}HYPIXEL_API_KEY is missing. Set it in env to avoid hardcoding.{RESET}")
         return
 
     guild_name = "Lucid"
 
+    if args.warm or args.warm_once:
+        run_warmup_scheduler(guild_name, once=args.warm_once, budget=args.warm_budget)
+        return
+
     while True:
         top_choice = main_menu()
 
@@ -2267,22 +6175,25 @@ def main():
             break
 
         # Fresh fetch before entering either lists or pseudoroles/whitelist
-        guild = get_guild_by_name(guild_name)
+        with _PROFILER.stage("guild"):
+            guild = get_guild_by_name(guild_name)
         members = extract_weekly_gexp(guild)
 
         if top_choice == "2":
             pseudo_reqs_menu(members)
-            save_ign_cache(IGN_CACHE)
-            save_player_cache(PLAYER_CACHE)
+            with _PROFILER.stage("save"):
+                save_ign_cache(IGN_CACHE)
+                save_player_cache(PLAYER_CACHE)
             print(f"{DIM}{GRAY}Returned to main menu.{RESET}\n")
             continue
 
         if top_choice == "3":
             manage_whitelists_menu(members)
-            save_ign_cache(IGN_CACHE)
-            save_player_cache(PLAYER_CACHE)
-            save_kick_whitelist(KICK_WHITELIST)
-            save_req_whitelist(REQ_WHITELIST)
+            with _PROFILER.stage("save"):
+                save_ign_cache(IGN_CACHE)
+                save_player_cache(PLAYER_CACHE)
+                save_kick_whitelist(KICK_WHITELIST)
+                save_req_whitelist(REQ_WHITELIST)
             print(f"{DIM}{GRAY}Returned to main menu.{RESET}\n")
             continue
 
@@ -2294,62 +6205,29 @@ def main():
                 print(f"{DIM}{GRAY}Back to main menu.{RESET}\n")
                 break
 
-            # fresh again for each list action
-            guild = get_guild_by_name(guild_name)
-            members = extract_weekly_gexp(guild)
-
-            _prepare_members_for_outputs(members)
-
-            rec1: List[Dict[str, Any]] = []
-            rec2: List[Dict[str, Any]] = []
-
-            if list_choice == "1":
-                run_full_leaderboard(guild, members)
-
-            elif list_choice == "2":
-                rec1 = run_kick_wave_1(members)
-                apply_kick_priority_into_members(members, rec1)
-
-            elif list_choice == "3":
-                rec2 = run_kick_wave_2(members)
-                apply_kick_priority_into_members(members, rec2)
-
-            elif list_choice == "4":
-                print_zero_soon_grouped(members, [0, 1, 2, 3])
-
-            elif list_choice == "5":
-                print_requirements_legend()
-
-            elif list_choice == "6":
-                print_requirements_summary(members)
-
-                print()
-                input(f"{DIM}{GRAY}Press Enter to show 0-requirement grids...{RESET}")
-                show_zero_req_grids(members)
-
-                print()
-                input(f"{DIM}{GRAY}Press Enter to show requirement mode counts...{RESET}")
-                print_requirement_mode_counts(members)
-
-        
-            elif list_choice == "7":
-                print_members_with_codes(members)
-            
-
-
-            save_ign_cache(IGN_CACHE)
-            save_player_cache(PLAYER_CACHE)
-            save_kick_whitelist(KICK_WHITELIST)
+            # one request run per action: each UUID is fetched at most once per endpoint
+            with request_run():
+                run_list_action(guild_name, list_choice)
 
             print()
             input(f"{DIM}Press Enter to continue...{RESET}")
 
-    save_ign_cache(IGN_CACHE)
-    save_player_cache(PLAYER_CACHE)
-    save_kick_whitelist(KICK_WHITELIST)
-    save_req_whitelist(REQ_WHITELIST)
+    # queued background refreshes are dropped; running ones finish so their results get saved
+    _REFRESHER.stop()
+    with _PROFILER.stage("save"):
+        save_ign_cache(IGN_CACHE)
+        save_player_cache(PLAYER_CACHE)
+        save_kick_whitelist(KICK_WHITELIST)
+        save_req_whitelist(REQ_WHITELIST)
+    if HTTP_MODE in ("record", "replay"):
+        st = _FIXTURES.stats
+        print(f"{DIM}{GRAY}HTTP {HTTP_MODE}: saved {st['saved']} | served {st['served']} | missing {st['missing']} | injected 429s {st['injected_429']} ({HTTP_FIXTURES_DIR}){RESET}")
+        if DATA_DIR != BASE_DIR:
+            print(f"{DIM}{GRAY}Caches and output for this run: {DATA_DIR}{_scratch_note()}{RESET}")
     print(f"{DIM}{GRAY}Exiting.{RESET}")
 
+_STARTUP.import_s = time.perf_counter() - _IMPORT_T0
+
 if __name__ == "__main__":
     main()
 
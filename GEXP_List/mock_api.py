@@ -0,0 +1,429 @@
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+# ============================================================
+# LOCAL MOCK HYPIXEL / MOJANG API
+#   Serves the endpoints gexp_puller.py uses, backed by a synthetic guild:
+#     /v2/guild?name=...            guild with N generated members
+#     /v2/player?uuid=...           player payload (stats padded to a realistic size)
+#     /v2/skyblock/profiles?uuid=   SkyBlock profiles with leveling xp
+#     /session/minecraft/profile/<uuid>   Mojang name lookup
+#
+#   Point the script at it:
+#     HYPIXEL_BASE_URL=http://127.0.0.1:8765/v2 \
+#     MOJANG_API_URL=http://127.0.0.1:8765/session/minecraft/profile \
+#     python gexp_puller.py
+# ============================================================
+
+RANK_SHARES = [
+    ("Guild Master", 0.0),   # always exactly one
+    ("Master", 0.01),
+    ("Senate", 0.02),
+    ("Elder", 0.12),
+    ("Rookie", 0.20),
+    ("Legion", 0.65),
+]
+
+NAME_PARTS_A = ["Frost", "Shadow", "Pixel", "Lucid", "Ember", "Nova", "Void", "Blaze", "Quartz", "Drift",
+                "Echo", "Vex", "Lunar", "Storm", "Cobalt", "Rune", "Ashen", "Zephyr", "Onyx", "Sable"]
+NAME_PARTS_B = ["Fox", "Wolf", "Knight", "Byte", "Hawk", "Mage", "Rider", "Smith", "Golem", "Sprite",
+                "Lord", "Ranger", "Crow", "Viper", "Tiger", "Sage", "Miner", "Bard", "Wisp", "Raven"]
+
+# ============================================================
+# SYNTHETIC DATA
+# ============================================================
+def _rng_for(*parts: Any) -> random.Random:
+    seed = hashlib.sha1(":".join(str(p) for p in parts).encode("utf-8")).hexdigest()
+    return random.Random(int(seed[:16], 16))
+
+def member_uuid(seed: int, index: int) -> str:
+    return hashlib.sha1(f"{seed}:member:{index}".encode("utf-8")).hexdigest()[:32]
+
+def fake_ign(uuid: str) -> str:
+    rng = _rng_for("ign", uuid)
+    name = rng.choice(NAME_PARTS_A) + rng.choice(NAME_PARTS_B)
+    if rng.random() < 0.6:
+        name += str(rng.randint(1, 999))
+    return name[:16]
+
+def _exp_history(rng: random.Random, today: datetime) -> Dict[str, int]:
+    # Mix of inactive, casual and grinding members (daily GEXP)
+    roll = rng.random()
+    out: Dict[str, int] = {}
+    for d in range(7):
+        day = (today - timedelta(days=d)).strftime("%Y-%m-%d")
+        if roll < 0.20:
+            xp = 0
+        elif roll < 0.45:
+            xp = rng.choice([0, 0, rng.randint(200, 4000)])
+        elif roll < 0.85:
+            xp = int(rng.lognormvariate(8.3, 0.9))
+        else:
+            xp = int(rng.lognormvariate(9.8, 0.6))
+        out[day] = int(xp)
+    return out
+
+def build_guild(name: str, members: int, seed: int) -> Dict[str, Any]:
+    rng = _rng_for("guild", seed, name)
+    now = datetime.now(timezone.utc)
+    now_ms = int(now.timestamp() * 1000)
+
+    out_members: List[Dict[str, Any]] = []
+    for i in range(max(int(members), 1)):
+        mrng = _rng_for("member", seed, i)
+        if i == 0:
+            rank = "Guild Master"
+        else:
+            r = mrng.random()
+            acc = 0.0
+            rank = "Legion"
+            for rank_name, share in RANK_SHARES[1:]:
+                acc += share
+                if r < acc:
+                    rank = rank_name
+                    break
+
+        # tenure: a few brand new members, most months to years
+        if mrng.random() < 0.08:
+            days = mrng.randint(0, 7)
+        else:
+            days = int(min(mrng.expovariate(1 / 220.0), 2000))
+        joined = now_ms - days * 86_400_000 - mrng.randint(0, 86_399_999)
+
+        out_members.append({
+            "uuid": member_uuid(seed, i),
+            "rank": rank,
+            "joined": joined,
+            "questParticipation": mrng.randint(0, 400),
+            "expHistory": _exp_history(mrng, now),
+        })
+
+    return {
+        "_id": hashlib.sha1(f"{seed}:{name}".encode("utf-8")).hexdigest()[:24],
+        "name": name,
+        "name_lower": name.lower(),
+        "coins": rng.randint(0, 10_000_000),
+        "created": now_ms - 3 * 365 * 86_400_000,
+        "exp": rng.randint(10_000_000, 200_000_000),
+        "members": out_members,
+        "ranks": [{"name": r, "default": r == "Legion", "priority": p}
+                  for p, (r, _) in enumerate(reversed(RANK_SHARES[1:]), start=1)],
+    }
+
+def _mode_stats(rng: random.Random, key_fmt: str, modes: List[str], fields: List[str], scale: int) -> Dict[str, int]:
+    out: Dict[str, int] = {}
+    for mode in modes:
+        for f in fields:
+            out[key_fmt.format(mode=mode, field=f)] = int(rng.random() * scale)
+    return out
+
+def build_player(uuid: str, payload_kb: int) -> Dict[str, Any]:
+    rng = _rng_for("player", uuid)
+    tier = rng.random()  # some sweaty players, mostly casuals
+    mult = 6.0 if tier > 0.9 else (2.0 if tier > 0.6 else 0.6)
+
+    bw_wins = int(rng.random() * 4000 * mult)
+    bw_fk = int(bw_wins * rng.uniform(1.5, 6.0))
+    bw_fd = max(int(bw_fk / rng.uniform(0.5, 10.0)), 1)
+    bedwars: Dict[str, Any] = {
+        "Experience": bw_wins * 25,
+        "wins_bedwars": bw_wins,
+        "losses_bedwars": int(bw_wins * rng.uniform(0.3, 1.5)),
+        "final_kills_bedwars": bw_fk,
+        "final_deaths_bedwars": bw_fd,
+        "coins": int(rng.random() * 5_000_000),
+    }
+    bedwars.update(_mode_stats(rng, "{mode}_{field}_bedwars", ["eight_one", "eight_two", "four_three", "four_four", "two_four"],
+                               ["wins", "losses", "kills", "deaths", "final_kills", "final_deaths",
+                                "beds_broken", "beds_lost", "games_played", "winstreak"], 2000))
+
+    du_wins = int(rng.random() * 6000 * mult)
+    duels: Dict[str, Any] = {
+        "wins": du_wins,
+        "losses": max(int(du_wins / rng.uniform(0.5, 6.0)), 1),
+        "coins": int(rng.random() * 1_000_000),
+    }
+    for mode in ("uhc_duel", "sw_duel", "classic_duel", "bridge_duel", "sumo_duel", "op_duel", "bow_duel"):
+        duels[f"{mode}_wins"] = int(rng.random() * 1500)
+        duels[f"{mode}_losses"] = int(rng.random() * 900)
+        duels[f"{mode}_rounds_played"] = int(rng.random() * 3000)
+
+    sw_wins = int(rng.random() * 1500 * mult)
+    skywars: Dict[str, Any] = {
+        "wins": sw_wins,
+        "kills": int(sw_wins * rng.uniform(1.0, 8.0)),
+        "deaths": max(int(sw_wins * rng.uniform(1.0, 5.0)), 1),
+        "souls": int(rng.random() * 20000),
+    }
+    skywars.update(_mode_stats(rng, "{field}_{mode}", ["solo_normal", "solo_insane", "team_normal", "team_insane"],
+                               ["wins", "losses", "kills", "deaths"], 800))
+
+    player: Dict[str, Any] = {
+        "uuid": uuid,
+        "displayname": fake_ign(uuid),
+        "achievementPoints": int(rng.random() * 9000 * mult),
+        "networkExp": int(rng.random() * 50_000_000),
+        "karma": int(rng.random() * 10_000_000),
+        "firstLogin": 1_400_000_000_000 + int(rng.random() * 300_000_000_000),
+        "lastLogin": int(time.time() * 1000) - int(rng.random() * 30 * 86_400_000),
+        "stats": {
+            "Bedwars": bedwars,
+            "Duels": duels,
+            "SkyWars": skywars,
+            "BuildBattle": {"score": int(rng.random() * 25000 * mult), "wins": int(rng.random() * 800)},
+            "TNTGames": {"wins": int(rng.random() * 700 * mult), "coins": int(rng.random() * 900_000)},
+            "UHC": {"score": int(rng.random() * 250 * mult), "kills": int(rng.random() * 600)},
+        },
+    }
+
+    # Real /player payloads are dominated by achievement/quest/cosmetic blobs; pad to size
+    target = max(int(payload_kb), 1) * 1024
+    achievements: Dict[str, int] = {}
+    size = len(json.dumps(player))
+    i = 0
+    while size < target:
+        key = f"general_achievement_{i:05d}"
+        val = int(rng.random() * 100000)
+        achievements[key] = val
+        size += len(key) + len(str(val)) + 6
+        i += 1
+    player["achievements"] = achievements
+    return player
+
+def build_skyblock_profiles(uuid: str, payload_kb: int) -> Dict[str, Any]:
+    rng = _rng_for("skyblock", uuid)
+    profiles: List[Dict[str, Any]] = []
+    if rng.random() < 0.25:
+        return {"success": True, "profiles": None}  # never played SkyBlock
+
+    for p in range(rng.randint(1, 3)):
+        xp = int(rng.random() * 15000 * (3.0 if rng.random() > 0.85 else 1.0))
+        collection = {f"ITEM_{j:04d}": int(rng.random() * 1_000_000) for j in range(max(int(payload_kb), 1) * 30)}
+        profiles.append({
+            "profile_id": hashlib.sha1(f"{uuid}:{p}".encode("utf-8")).hexdigest()[:32],
+            "cute_name": rng.choice(["Apple", "Banana", "Cucumber", "Grapes", "Kiwi", "Mango", "Pear"]),
+            "members": {
+                uuid: {
+                    "leveling": {"experience": xp},
+                    "collection": collection,
+                }
+            },
+        })
+    return {"success": True, "profiles": profiles}
+
+# ============================================================
+# RATE LIMIT (fixed window, Hypixel-style headers)
+# ============================================================
+class _FixedWindow:
+    def __init__(self, limit: int, window_s: float):
+        self.limit = int(limit)
+        self.window_s = float(window_s)
+        self._start = time.monotonic()
+        self._used = 0
+        self._lock = threading.Lock()
+
+    def hit(self) -> Tuple[bool, Dict[str, str]]:
+        if self.limit <= 0:
+            return True, {}
+        with self._lock:
+            now = time.monotonic()
+            if now - self._start >= self.window_s:
+                self._start = now
+                self._used = 0
+            self._used += 1
+            reset = max(int(round(self.window_s - (now - self._start))), 0)
+            remaining = max(self.limit - self._used, 0)
+            headers = {
+                "RateLimit-Limit": str(self.limit),
+                "RateLimit-Remaining": str(remaining),
+                "RateLimit-Reset": str(reset),
+            }
+            if self._used > self.limit:
+                headers["Retry-After"] = str(max(reset, 1))
+                return False, headers
+            return True, headers
+
+# ============================================================
+# HTTP SERVER
+# ============================================================
+class MockConfig:
+    def __init__(self, members: int = 125, seed: int = 1, player_kb: int = 40, skyblock_kb: int = 8,
+                 rate_limit: int = 300, window_s: float = 300.0, latency_ms: float = 0.0,
+                 mojang_rate_limit: int = 0, mojang_window_s: float = 600.0):
+        self.members = members
+        self.seed = seed
+        self.player_kb = player_kb
+        self.skyblock_kb = skyblock_kb
+        self.rate_limit = rate_limit
+        self.window_s = window_s
+        self.latency_ms = latency_ms
+        self.mojang_rate_limit = mojang_rate_limit
+        self.mojang_window_s = mojang_window_s
+
+class MockApiServer(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 1024  # the async engine opens hundreds of connections at once
+
+    def __init__(self, addr: Tuple[str, int], config: MockConfig):
+        super().__init__(addr, _Handler)
+        self.config = config
+        self.hypixel_window = _FixedWindow(config.rate_limit, config.window_s)
+        self.mojang_window = _FixedWindow(config.mojang_rate_limit, config.mojang_window_s)
+        self.counts: Dict[str, int] = {}
+        self._guild_bytes: Dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    def count(self, endpoint: str) -> None:
+        with self._lock:
+            self.counts[endpoint] = self.counts.get(endpoint, 0) + 1
+
+    def guild_bytes(self, name: str) -> bytes:
+        key = name.lower()
+        with self._lock:
+            cached = self._guild_bytes.get(key)
+        if cached is None:
+            guild = build_guild(name, self.config.members, self.config.seed)
+            cached = json.dumps({"success": True, "guild": guild}).encode("utf-8")
+            with self._lock:
+                self._guild_bytes[key] = cached
+        return cached
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/v2"
+
+    @property
+    def mojang_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}/session/minecraft/profile"
+
+class _Handler(BaseHTTPRequestHandler):
+    server: MockApiServer
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format: str, *args: Any) -> None:
+        pass
+
+    def _send(self, status: int, body: bytes, headers: Optional[Dict[str, str]] = None) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        for k, v in (headers or {}).items():
+            self.send_header(k, v)
+        self.end_headers()
+        if body:
+            self.wfile.write(body)
+
+    def _json(self, status: int, data: Any, headers: Optional[Dict[str, str]] = None) -> None:
+        self._send(status, json.dumps(data).encode("utf-8"), headers)
+
+    def do_GET(self) -> None:
+        cfg = self.server.config
+        if cfg.latency_ms > 0:
+            time.sleep(cfg.latency_ms / 1000.0)
+
+        url = urlparse(self.path)
+        q = {k: v[0] for k, v in parse_qs(url.query).items() if v}
+        path = url.path.rstrip("/")
+
+        if path.startswith("/session/minecraft/profile/"):
+            self.server.count("mojang")
+            ok, headers = self.server.mojang_window.hit()
+            if not ok:
+                self._json(429, {"error": "TooManyRequestsException"}, headers)
+                return
+            uuid = path.rsplit("/", 1)[-1].replace("-", "").lower()
+            if len(uuid) != 32:
+                self._send(204, b"")
+                return
+            self._json(200, {"id": uuid, "name": fake_ign(uuid), "properties": []}, headers)
+            return
+
+        if not path.startswith("/v2/"):
+            self._json(404, {"success": False, "cause": "Unknown endpoint"})
+            return
+
+        endpoint = path[len("/v2"):]
+        self.server.count(endpoint)
+        ok, headers = self.server.hypixel_window.hit()
+        if not ok:
+            self._json(429, {"success": False, "cause": "Key throttle", "throttle": True}, headers)
+            return
+
+        if endpoint == "/guild":
+            name = q.get("name", "")
+            if not name:
+                self._json(400, {"success": False, "cause": "Missing one or more fields [id, player, name]"}, headers)
+                return
+            self._send(200, self.server.guild_bytes(name), headers)
+            return
+
+        uuid = q.get("uuid", "").replace("-", "").lower()
+        if endpoint in ("/player", "/skyblock/profiles") and len(uuid) != 32:
+            self._json(422, {"success": False, "cause": "Malformed UUID"}, headers)
+            return
+
+        if endpoint == "/player":
+            self._json(200, {"success": True, "player": build_player(uuid, cfg.player_kb)}, headers)
+            return
+
+        if endpoint == "/skyblock/profiles":
+            self._json(200, build_skyblock_profiles(uuid, cfg.skyblock_kb), headers)
+            return
+
+        self._json(404, {"success": False, "cause": "Unknown endpoint"}, headers)
+
+def start_mock_server(config: Optional[MockConfig] = None, host: str = "127.0.0.1", port: int = 0) -> MockApiServer:
+    """
+    Start the mock API on a background thread (port 0 = pick a free one).
+    Call .shutdown() when done.
+    """
+    server = MockApiServer((host, int(port)), config or MockConfig())
+    threading.Thread(target=server.serve_forever, name="mock-api", daemon=True).start()
+    return server
+
+# ============================================================
+# MAIN
+# ============================================================
+def main() -> None:
+    ap = argparse.ArgumentParser(description="Local stand-in for the Hypixel + Mojang endpoints used by gexp_puller.py")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--members", type=int, default=125, help="members in every generated guild (1k-50k for load tests)")
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--player-kb", type=int, default=40, help="approximate /player payload size")
+    ap.add_argument("--skyblock-kb", type=int, default=8, help="approximate per-profile SkyBlock payload size")
+    ap.add_argument("--rate-limit", type=int, default=300, help="Hypixel requests per window (0 = unlimited)")
+    ap.add_argument("--window", type=float, default=300.0, help="Hypixel rate-limit window, seconds")
+    ap.add_argument("--mojang-rate-limit", type=int, default=0, help="Mojang requests per window (0 = unlimited)")
+    ap.add_argument("--mojang-window", type=float, default=600.0)
+    ap.add_argument("--latency-ms", type=float, default=0.0, help="added to every response")
+    args = ap.parse_args()
+
+    config = MockConfig(
+        members=args.members, seed=args.seed, player_kb=args.player_kb, skyblock_kb=args.skyblock_kb,
+        rate_limit=args.rate_limit, window_s=args.window, latency_ms=args.latency_ms,
+        mojang_rate_limit=args.mojang_rate_limit, mojang_window_s=args.mojang_window,
+    )
+    server = MockApiServer((args.host, args.port), config)
+    print(f"Mock API listening: {server.base_url}  ({args.members:,} members/guild)")
+    print(f"  HYPIXEL_BASE_URL={server.base_url}")
+    print(f"  MOJANG_API_URL={server.mojang_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
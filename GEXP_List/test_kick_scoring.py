@@ -0,0 +1,153 @@
+import os
+import random
+import tempfile
+
+# gexp_puller reads its config at import time: keep every file it touches out of GEXP_List/
+_DATA_DIR = tempfile.TemporaryDirectory(prefix="gexp_test_")
+os.environ["GEXP_DATA_DIR"] = _DATA_DIR.name
+os.environ["PLAYER_CACHE_BACKEND"] = "memory"
+os.environ["CACHE_EVICT"] = "0"
+
+import pytest
+
+import gexp_puller as g
+
+# ============================================================
+# KICK SCORING
+#   band boundaries, BW tiers, pseudo floors and whitelist exclusion on the
+#   built-in rules (kick_rules.json edits don't move these), plus numpy vs python
+# ============================================================
+
+RULES = g.KickRules(g.DEFAULT_KICK_RULES)
+
+def _member(n: int, **fields) -> dict:
+    m = {
+        "uuid": "%032x" % (n + 1),
+        "ign": f"player{n}",
+        "rank": "Member",
+        "days_in_guild": 100,
+        "predicted_gexp": 60000,
+        "reqs_met_count": 1,
+        "pseudo_codes": [],
+    }
+    m.update(fields)
+    return m
+
+def _score(rules: g.KickRules = RULES, **fields) -> int:
+    table, rows = g.MemberTable.from_members([_member(0, **fields)])
+    return g._kick_score(table, rows[0], rules=rules)
+
+@pytest.mark.parametrize("days, points", [
+    (6, 0), (7, -1), (30, -1), (31, 0), (180, 0), (181, 2), (364, 2), (365, 0),
+])
+def test_tenure_band_boundaries(days, points):
+    assert RULES.tenure_band(days)[0] == points
+    assert _score(days_in_guild=days) - _score() == points
+
+@pytest.mark.parametrize("gexp, points", [
+    (-1, 0), (0, -15), (7500, -12), (7501, -9), (50000, -1), (50001, 0),
+])
+def test_gexp_band_boundaries(gexp, points):
+    assert RULES.gexp_band(gexp)[0] == points
+    assert _score(predicted_gexp=gexp) - _score() == points
+
+@pytest.mark.parametrize("wins, bonus", [(0, 0), (7999, 0), (8000, 1), (9999, 1), (10000, 2), (25000, 2)])
+def test_bw_wins_tiers(wins, bonus):
+    assert RULES.bw_bonus(wins) == bonus
+
+def test_bw_bonus_reorders_ranking():
+    members = [_member(0, predicted_gexp=1000), _member(1, predicted_gexp=2000)]
+    table, rows = g.MemberTable.from_members(members)
+    wins = {members[0]["uuid"]: 10000, members[1]["uuid"]: 7999}
+    ranked = g._rank_kicks(table, rows, 0, 2, RULES, lambda u: wins.get(u, 0))
+    assert [(prio, table.columns["uuid"][i]) for prio, _, i in ranked] == [
+        (-12, members[1]["uuid"]),
+        (-10, members[0]["uuid"]),
+    ]
+
+@pytest.mark.parametrize("bonus, floor, expected", [(10, 10, 10), (3, 10, 10), (15, 10, 15), (0, 10, 10)])
+def test_lb_pseudo_floor(bonus, floor, expected):
+    data = dict(g.DEFAULT_KICK_RULES, pseudo_bonuses={"LB": bonus}, pseudo_min_bonuses={"LB": floor})
+    rules = g.KickRules(data)
+    assert rules.pseudo_bonus("LB") == expected
+    assert _score(rules, pseudo_codes=["LB"]) - _score(rules) == expected
+
+def test_floor_only_applies_to_listed_codes():
+    assert RULES.pseudo_bonus("EV") == 0
+    assert _score(pseudo_codes=["EV"]) == _score()
+
+def test_breakdown_adds_up_with_hidden_band_details():
+    data = dict(g.DEFAULT_KICK_RULES)
+    data["predicted_gexp"] = [dict(band, detail=None) for band in data["predicted_gexp"]]
+    rules = g.KickRules(data)
+    table, rows = g.MemberTable.from_members([_member(0, predicted_gexp=5000), _member(1)])
+    for i in rows:
+        breakdown = []
+        priority = g._kick_score(table, i, breakdown, rules)
+        assert sum(e["delta"] for e in breakdown) == priority
+    shown = []
+    g._kick_score(table, rows[1], shown, rules)
+    assert "Pred GEXP" not in [e["label"] for e in shown]  # 0-point band with a null detail stays hidden
+
+def test_rules_reject_unknown_and_missing_keys():
+    data = dict(g.DEFAULT_KICK_RULES, _doc="comments are fine")
+    data["zero_req_penalty"] = data.pop("zero_reqs_penalty")
+    del data["candidate_pools"]
+    with pytest.raises(ValueError) as exc:
+        g.KickRules(data)
+    msg = str(exc.value)
+    assert 'zero_req_penalty: unknown key (did you mean "zero_reqs_penalty"?)' in msg
+    assert "zero_reqs_penalty: missing" in msg
+    assert "candidate_pools: missing" in msg
+
+def test_whitelisted_members_are_never_candidates(monkeypatch):
+    members = [_member(n, predicted_gexp=0, reqs_met_count=0) for n in range(12)]
+    protected = members[0]["uuid"]
+    monkeypatch.setattr(g, "KICK_WHITELIST", {"uuids": [protected]})
+    table, rows = g.MemberTable.from_members(members)
+    ranked = g._rank_kicks(table, rows, 0, 20, RULES, None)
+    picked = {table.columns["uuid"][i] for _, _, i in ranked}
+    assert protected not in picked
+    assert len(picked) == len(members) - 1
+
+def _random_members(seed: int, n: int) -> list:
+    rng = random.Random(seed)
+    ranks = ["Guild Master", "Master", "Senate", "Elder", "Member", "Legion"]
+    return [
+        _member(
+            k,
+            rank=rng.choice(ranks),
+            days_in_guild=rng.choice([0, 6, 7, 8, 30, 31, 180, 181, 364, 365, 900]),
+            predicted_gexp=rng.choice([-1, 0, 1, 7500, 7501, 15000, 25001, 50000, 50001, 120000]),
+            reqs_met_count=rng.randint(0, 3),
+            pseudo_codes=["LB"] if rng.random() < 0.1 else [],
+        )
+        for k in range(n)
+    ]
+
+@pytest.mark.parametrize("seed", range(5))
+def test_numpy_engine_matches_python(monkeypatch, seed):
+    np = pytest.importorskip("numpy")
+    table, rows = g.MemberTable.from_members(_random_members(seed, 300))
+    assert g._kick_scores_numpy(np, table, rows, RULES).tolist() == g._kick_scores_python(table, rows, RULES)
+
+    wins = {u: random.Random(u).choice([0, 7999, 8000, 10000]) for u in table.columns["uuid"]}
+    ranked = {}
+    for engine in ("numpy", "python"):
+        monkeypatch.setattr(g, "KICK_SCORE_ENGINE", engine)
+        assert g.kick_score_engine() == engine
+        for min_days in (g.KICK_WAVE_1_MIN_DAYS, g.KICK_WAVE_2_MIN_DAYS):
+            ranked[engine, min_days] = g._rank_kicks(table, rows, min_days, g.KICK_TOP_N, RULES, wins.get)
+    for min_days in (g.KICK_WAVE_1_MIN_DAYS, g.KICK_WAVE_2_MIN_DAYS):
+        assert ranked["numpy", min_days] == ranked["python", min_days]
+
+@pytest.mark.parametrize("path, error", [
+    ("zero_req_penalty", "rules has no key 'zero_req_penalty'"),
+    ("predicted_gexp.2.pts", "predicted_gexp.2 has no key 'pts'"),
+    ("zero_reqs_penalty", ""),
+    ("pseudo_bonuses.EV", ""),
+    ("rank_points.Officer.points", ""),
+])
+def test_simulator_rejects_unknown_rule_paths(path, error):
+    variants = g.expand_kick_variants({"variants": [{"set": {path: -20}}]}, g.DEFAULT_KICK_RULES)
+    assert variants[1]["error"] == (f"{path}: {error}" if error else "")